@@ -1,13 +1,15 @@
+import operator
 import random
 
+from algorithms.base.archive import NonDominatedArchive
 from algorithms.base.driver import Driver
-from evotools.ea_utils import dominates
+from algorithms.base.drivertools import evaluate_vector
 
 
 class Individual:
     def __init__(self, vector, fitnesses):
         self.v = vector
-        self.fit = [f(self.v) for f in fitnesses]
+        self.fit = evaluate_vector(fitnesses, self.v)
 
 
 class BOGO(Driver):
@@ -22,7 +24,9 @@ class BOGO(Driver):
         **kwargs
     ):
         super().__init__(*args, **kwargs)
-        self.archive = []
+        self.archive = NonDominatedArchive(
+            key=operator.attrgetter("fit"), reject_equal=False
+        )
         self.fitnesses = fitnesses
         self.dims = dims
         self.cost = 0
@@ -33,16 +37,7 @@ class BOGO(Driver):
         self.finished = False
 
     def refresh_archive(self, individual):
-        new_archive = []
-        individual_dominated = False
-        for archival in self.archive:
-            if not individual_dominated and dominates(archival.fit, individual.fit):
-                individual_dominated = True
-            elif not dominates(individual.fit, archival.fit):
-                new_archive.append(archival)
-        if not individual_dominated:
-            new_archive.append(individual)
-        self.archive = new_archive
+        self.archive.add(individual)
 
     def finalized_population(self):
         return [x.v for x in self.archive]
@@ -34,6 +34,7 @@ class HGS(ComplexDriver):
         comparison_multipliers=(1.0, 0.1, 0.01),
         population_sizes=(64, 16, 4),
         hgs_type="classic",
+        hypervolume_samples=None,
         *args,
         **kwargs,
     ):
@@ -43,6 +44,7 @@ class HGS(ComplexDriver):
             algorithm = DistributedHGS
         else:
             algorithm = ClassicHGS
+            kwargs["hypervolume_samples"] = hypervolume_samples
 
         self.hgs = algorithm(
             population,
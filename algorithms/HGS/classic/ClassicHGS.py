@@ -2,6 +2,7 @@ import collections
 import math
 import random
 import time
+from functools import partial
 
 import floatextras
 import numpy as np
@@ -12,7 +13,7 @@ from rx.scheduler import NewThreadScheduler
 
 from algorithms.base import drivertools
 from algorithms.base.driver import StepsRun, ComplexDriver
-from algorithms.base.hv import HyperVolume
+from algorithms.base.hv import hypervolume, hypervolume_monte_carlo
 
 EPSILON = np.finfo(float).eps
 
@@ -39,6 +40,7 @@ class ClassicHGS(ComplexDriver):
         sproutiveness=1,
         comparison_multipliers=(1.0, 0.1, 0.01),
         population_sizes=(64, 16, 4),
+        hypervolume_samples=None,
         *args,
         **kwargs
     ):
@@ -63,6 +65,8 @@ class ClassicHGS(ComplexDriver):
         self.max_sprouts_no = max_sprouts_no
         self.sproutiveness = sproutiveness
         self.min_progress_ratio = min_progress_ratio
+        # progress checks estimate the hypervolume by sampling when set
+        self.hypervolume_samples = hypervolume_samples
 
         self.mutation_etas = mutation_etas
         self.mutation_rates = mutation_rates
@@ -75,6 +79,7 @@ class ClassicHGS(ComplexDriver):
 
         # TODO add preconditions checking if message adapter is HGS message adapter
 
+        self.nodes_created = 0
         self.root = ClassicHGS.Node(
             self, 0, random.sample(population, self.population_sizes[0])
         )
@@ -210,25 +215,18 @@ class ClassicHGS(ComplexDriver):
             print("!!!   RESURRECTION")
 
     def blurred_fitnesses(self, level):
-        def blurred(f):
-            def blurred_f(*args, **kwargs):
-                f_val = f(*args, **kwargs)
-                x = math.fabs(
-                    random.gauss(f_val, self.fitness_errors[level] * f_val / 3.0)
-                )
-
-                # print("level: {}, normal: {} blurred: {}, diff: {}".format(level, f_val, x, math.fabs(f_val - x)/f_val))
-                return x
-
-            return blurred_f
-
-        return [blurred(f) for f in self.fitnesses]
+        return [
+            partial(blurred_fitness, f, self.fitness_errors[level])
+            for f in self.fitnesses
+        ]
 
     class Node:
         def __init__(self, owner, level, population):
             self.alive = True
             self.ripe = False
             self.owner = owner
+            self.id = owner.nodes_created
+            owner.nodes_created += 1
             self.level = level
             self.current_cost = 0
             self.driver = owner.driver(
@@ -240,8 +238,8 @@ class ClassicHGS(ComplexDriver):
                 crossover_eta=owner.crossover_etas[self.level],
                 crossover_rate=owner.crossover_rates[self.level],
                 fitness_archive=self.owner.global_fitness_archive[self.level],
-                trim_function=lambda x: trim_vector(
-                    x, self.owner.mantissa_bits[self.level]
+                trim_function=partial(
+                    trim_vector, bits_no=self.owner.mantissa_bits[self.level]
                 ),
                 message_adapter_factory=owner.driver_message_adapter_factory,
             )
@@ -257,6 +255,14 @@ class ClassicHGS(ComplexDriver):
             self.relative_hypervolume = None
             self.old_hypervolume = float("-inf")
             self.hypervolume = float("-inf")
+            # every estimate of this node scales the same unit samples to the
+            # box [ideal point of the front, reference point], so consecutive
+            # metaepochs are compared without the sampling noise only while the
+            # ideal point stays put; seeded by the node id, which leaves the
+            # random streams of the run untouched
+            self.hypervolume_seed = (
+                self.id if owner.hypervolume_samples is not None else None
+            )
 
         def run_metaepoch(self) -> Observable:
             if self.alive:
@@ -287,14 +293,20 @@ class ClassicHGS(ComplexDriver):
             fitness_values = [
                 [f(p) for f in self.owner.fitnesses] for p in self.population
             ]
-            hv = HyperVolume(self.owner.reference_point)
+            if self.owner.hypervolume_samples is None:
+                dominated = hypervolume(fitness_values, self.owner.reference_point)
+            else:
+                dominated = hypervolume_monte_carlo(
+                    fitness_values,
+                    self.owner.reference_point,
+                    samples=self.owner.hypervolume_samples,
+                    seed=self.hypervolume_seed,
+                ).value
 
             if self.relative_hypervolume is None:
-                self.relative_hypervolume = hv.compute(fitness_values)
+                self.relative_hypervolume = dominated
             else:
-                self.hypervolume = (
-                    hv.compute(fitness_values) - self.relative_hypervolume
-                )
+                self.hypervolume = dominated - self.relative_hypervolume
 
         def release_new_sprouts(self):
             if self.ripe:
@@ -350,10 +362,10 @@ class ClassicHGS(ComplexDriver):
 
 
 def population_from_delegate(delegate, size, dims, rate, eta):
-    population = [[x for x in delegate]]
-    for _ in range(size - 1):
-        population.append(drivertools.mutate(delegate, dims, rate, eta))
-    return population
+    mutants = drivertools.mutate_population(
+        [delegate] * max(size - 1, 0), dims, rate, eta
+    )
+    return [[x for x in delegate]] + mutants.tolist()
 
 
 def redundant(pop_a, pop_b, min_dist):
@@ -364,6 +376,11 @@ def redundant(pop_a, pop_b, min_dist):
     return dist < min_dist
 
 
+def blurred_fitness(f, fitness_error, *args, **kwargs):
+    f_val = f(*args, **kwargs)
+    return math.fabs(random.gauss(f_val, fitness_error * f_val / 3.0))
+
+
 def trim_vector(vector, bits_no):
     return [trim_mantissa(x, bits_no) for x in vector]
 
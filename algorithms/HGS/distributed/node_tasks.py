@@ -17,7 +17,7 @@ from algorithms.HGS.distributed.message import (
 )
 from algorithms.HGS.distributed.hgs_tasks import OperationTask
 from algorithms.base.driver import StepsRun
-from algorithms.base.hv import HyperVolume
+from algorithms.base.hv import hypervolume
 
 EPSILON = np.finfo(float).eps
 
@@ -150,14 +150,12 @@ class NewMetaepochNodeTask(NodeOperationTask):
         fitness_values = [
             [f(p) for f in self.node.fitnesses] for p in self.node.population
         ]
-        hv = HyperVolume(self.node.reference_point)
+        dominated = hypervolume(fitness_values, self.node.reference_point)
 
         if self.node.relative_hypervolume is None:
-            self.node.relative_hypervolume = hv.compute(fitness_values)
+            self.node.relative_hypervolume = dominated
         else:
-            self.node.hypervolume = (
-                hv.compute(fitness_values) - self.node.relative_hypervolume
-            )
+            self.node.hypervolume = dominated - self.node.relative_hypervolume
 
 
 class TrimNotProgressingNodeTask(NodeOperationTask):
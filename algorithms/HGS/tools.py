@@ -9,10 +9,10 @@ from algorithms.base import drivertools
 
 
 def population_from_delegate(delegate, size, dims, rate, eta):
-    population = [[x for x in delegate]]
-    for _ in range(size - 1):
-        population.append(drivertools.mutate(delegate, dims, rate, eta))
-    return population
+    mutants = drivertools.mutate_population(
+        [delegate] * max(size - 1, 0), dims, rate, eta
+    )
+    return [[x for x in delegate]] + mutants.tolist()
 
 
 def redundant(pop_a, pop_b, min_dist):
@@ -1,10 +1,17 @@
-import itertools
-import math
 import random
 import sys
 
+import numpy
+
 from algorithms.base.driver import Driver
-from algorithms.base.drivertools import rank, mutate, crossover
+from algorithms.base.drivertools import (
+    rank,
+    crossover_population,
+    evaluate_individuals,
+    evaluate_vector,
+    mutate_population,
+    identity,
+)
 
 
 class IBEA(Driver):
@@ -19,7 +26,7 @@ class IBEA(Driver):
         crossover_eta,
         mutation_rate,
         crossover_rate,
-        trim_function=lambda x: x,
+        trim_function=identity,
         fitness_archive=None,
         *args,
         **kwargs
@@ -38,17 +45,15 @@ class IBEA(Driver):
 
         self.cost = 0
         self.objectives = fitnesses
-        self.indicator = self.EPlusIndicator(self)
         self.generation_counter = 0
         self.k = kappa
         self.mating_size_c = mating_population_size
         self.trim_function = trim_function
         self.population = [self.trim_function(x) for x in population]
+        self.fitness_archive = fitness_archive
 
         self._scale_objectives()
 
-        self.fitness_archive = fitness_archive
-
     def finalized_population(self):
         return self.finish()
 
@@ -74,97 +79,88 @@ class IBEA(Driver):
         self.generation_counter += 1
 
     def _scale_objectives(self):
-        min_max = lambda x: (min(x), max(x))
         for ind in self.individuals:
             if not ind.known_objectives or not (
                 (self.fitness_archive is not None) and (ind.v in self.fitness_archive)
             ):
                 self.cost += 1
             ind.known_objectives = True
-        measured = [
-            (objective, min_max([objective(ind.v) for ind in self.individuals]))
-            for objective in self.objectives
-        ]
-        self.scaled_objectives = [
-            self._scale(objective, min_o, max_o)
-            for objective, (min_o, max_o) in measured
-        ]
-
-    @staticmethod
-    def _scale(fun, min_o, max_o):
-        def scaled(x):
-            return (fun(x) - min_o) / (max_o - min_o + sys.float_info.epsilon)
-
-        return scaled
+        values = self._objective_values()
+        self.objectives_min = values.min(axis=0)
+        self.objectives_max = values.max(axis=0)
+
+    def _objective_values(self):
+        pending = [ind for ind in self.individuals if ind.objectives is None]
+        if pending:
+            results, _ = evaluate_individuals(
+                self.objectives,
+                [ind.v for ind in pending],
+                self.fitness_archive,
+                store=False,
+            )
+            for ind, objectives in zip(pending, results):
+                ind.objectives = objectives
+        return numpy.array(
+            [ind.objectives for ind in self.individuals], dtype=float
+        ).reshape(len(self.individuals), len(self.objectives))
 
     def _calculate_fitness(self):
-        self.indicators = {
-            (x1, x2): self.indicator(x1.v, x2.v)
-            for x1, x2 in itertools.product(self.individuals, self.individuals)
-        }
-        self.c = max([abs(x) for x in self.indicators.values()])
-        self.fitness = {
-            x1: sum(
-                [
-                    (-1)
-                    * math.exp(
-                        (-1)
-                        * (
-                            self.indicators[(x2, x1)]
-                            / abs(self.c * self.k + sys.float_info.epsilon)
-                        )
-                    )
-                    for x2 in self.individuals
-                    if x2 != x1
-                ]
-            )
-            for x1 in self.individuals
-        }
+        scaled = (self._objective_values() - self.objectives_min) / (
+            self.objectives_max - self.objectives_min + sys.float_info.epsilon
+        )
+        self.indicators = eps_plus_indicators(scaled)
+        self.c = numpy.abs(self.indicators).max()
+        # loss[i, j]: how much j's fitness drops because of i; it is given
+        # back to j when i is removed
+        self.loss = numpy.exp(
+            -self.indicators / abs(self.c * self.k + sys.float_info.epsilon)
+        )
+        numpy.fill_diagonal(self.loss, 0.0)
+        self.fitness = -self.loss.sum(axis=0)
 
     def _environmental_selection(self):
-        while len(self.individuals) > self.population_size:
-            self.individuals = sorted(
-                self.individuals, key=lambda y: self.fitness[y], reverse=True
-            )
-            removed = self.individuals.pop()
-            for x in self.individuals:
-                self.fitness[x] += math.exp(
-                    (-1)
-                    * (
-                        self.indicators[(removed, x)]
-                        / abs(self.c * self.k + sys.float_info.epsilon)
-                    )
-                )
+        alive = numpy.ones(len(self.individuals), dtype=bool)
+        ranking = None
+        for _ in range(len(self.individuals) - self.population_size):
+            ranking = self.fitness.copy()
+            candidates = numpy.flatnonzero(alive)
+            removed = candidates[numpy.argmin(self.fitness[candidates])]
+            alive[removed] = False
+            self.fitness += self.loss[removed]
+        if ranking is not None:
+            # best first, ranked as before the last removal
+            kept = numpy.flatnonzero(alive)
+            kept = kept[numpy.argsort(-ranking[kept], kind="stable")]
+            self.individuals = [self.individuals[i] for i in kept]
+            self.fitness = self.fitness[kept]
 
     def _mating_selection(self, p):
-        coin = lambda: random.random() < p
-        better = (
-            lambda x1, x2: self.fitness[x1] < self.fitness[x2] and x1 or x2
-            if coin()
-            else self.fitness[x1] > self.fitness[x2] and x1 or x2
-        )
+        def better(i1, i2):
+            if random.random() < p:
+                return i1 if self.fitness[i1] < self.fitness[i2] else i2
+            return i1 if self.fitness[i1] > self.fitness[i2] else i2
+
+        size = len(self.individuals)
         self.mating_individuals = [
-            better(random.choice(self.individuals), random.choice(self.individuals))
+            self.individuals[better(random.randrange(size), random.randrange(size))]
             for _ in range(2 * self.mating_size)
         ]
 
     def _crossover(self):
-        self.mating_individuals = [
-            crossover(
-                self.mating_individuals[i].v,
-                self.mating_individuals[self.mating_size + i].v,
-                self.dims,
-                self.crossover_rate,
-                self.crossover_eta,
-            )
-            for i in range(self.mating_size)
-        ]
+        parents = [ind.v for ind in self.mating_individuals]
+        self.mating_individuals = crossover_population(
+            parents[: self.mating_size],
+            parents[self.mating_size :],
+            self.dims,
+            self.crossover_rate,
+            self.crossover_eta,
+        )
 
     def _mutation(self):
-        self.mating_individuals = [
-            self.Individual(mutate(x, self.dims, self.mutation_rate, self.mutation_eta))
-            for x in self.mating_individuals
-        ]
+        offspring = mutate_population(
+            self.mating_individuals, self.dims, self.mutation_rate, self.mutation_eta
+        )
+        self.mating_individuals = [self.Individual(x) for x in offspring.tolist()]
         for ind in self.mating_individuals:
             ind.known_objectives = False
 
@@ -181,26 +177,31 @@ class IBEA(Driver):
     def calculate_objectives(self, ind):
         if (self.fitness_archive is not None) and (ind.v in self.fitness_archive):
             return self.fitness_archive[ind.v]
-        if not ind.known_objectives:
-            self.cost += 1
-        return [objective(ind.v) for objective in self.objectives]
-
-    class EPlusIndicator:
-        def __init__(self, population):
-            self.population = population
-
-        def __call__(self, x1, x2):
-            return max(
-                [
-                    objective(x1) - objective(x2)
-                    for objective in self.population.scaled_objectives
-                ]
-            )
+        if ind.objectives is None:
+            if not ind.known_objectives:
+                self.cost += 1
+            ind.objectives = evaluate_vector(self.objectives, ind.v)
+        return ind.objectives
 
     class Individual:
         def __init__(self, vector):
             self.v = vector
             self.known_objectives = False
+            # raw objective vector, evaluated once and reused by the scaling
+            self.objectives = None
+
+
+def eps_plus_indicators(objectives) -> "numpy.ndarray":
+    """
+    :param objectives: Macierz (N, M) przeskalowanych wartości funkcji celu.
+    :return: Macierz I[i, j] addytywnego wskaźnika epsilon: najmniejsze
+        przesunięcie i, po którym i słabo dominuje j.
+    """
+    indicators = numpy.full((len(objectives), len(objectives)), -numpy.inf)
+    for column in numpy.asarray(objectives, dtype=float).T:
+        differences = column[:, numpy.newaxis] - column[numpy.newaxis, :]
+        numpy.maximum(indicators, differences, out=indicators)
+    return indicators
 
 
 if __name__ == "__main__":
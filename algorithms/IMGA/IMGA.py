@@ -8,6 +8,7 @@ from rx.scheduler import NewThreadScheduler
 
 from algorithms.IMGA.topology import TorusTopology, Topology
 from algorithms.base.driver import StepsRun, ComplexDriver
+from algorithms.base.drivertools import evaluate_vector
 from evotools import ea_utils
 from evotools.random_tools import weighted_choice
 
@@ -140,7 +141,7 @@ class IMGA(ComplexDriver):
             logger = logging.getLogger(__name__)
 
             def fitfun_res(ind):
-                return [f(ind) for f in self.outer.fitnesses]
+                return evaluate_vector(self.outer.fitnesses, ind)
 
             current_population = self.driver.population
 
@@ -1,7 +1,10 @@
 import random
 
-import algorithms
+import numpy
+
 from algorithms.NSGAII.NSGAII import NSGAII
+from algorithms.base.population import Population
+from algorithms.base.drivertools import identity
 
 
 class JGBL(NSGAII):
@@ -17,7 +20,7 @@ class JGBL(NSGAII):
         crossover_rate,
         jumping_rate,
         jumping_percentage,
-        trim_function=lambda x: x,
+        trim_function=identity,
         fitness_archive=None,
         *args,
         **kwargs
@@ -40,28 +43,34 @@ class JGBL(NSGAII):
         self.jumping_percentage = jumping_percentage
 
     def step(self):
-        old_pop = list(self.individuals)
+        old_pop = self.individuals
         super().step()
-        new_pop = list(self.individuals)
+        new_pop = self.individuals
 
-        self.individuals = set(old_pop + new_pop)
+        self.individuals = Population.concat(old_pop, new_pop).unique()
 
         self._nd_sort()
         self._crowding()
         self._environmental_selection()
-        nondominanted = self.front[1]
+        nondominanted = self.sorted_individuals[self.front[0]]
 
         if len(nondominanted) > len(self.individuals):
             print("hop")
-            pop_set = set(self.individuals)
-            nondominanted = [n for n in nondominanted if n not in pop_set]
+            nondominanted = nondominanted[
+                ~numpy.isin(nondominanted.ids, self.individuals.ids)
+            ]
             print(len(nondominanted))
 
-            jumping_pop = self.jump_genes(self.individuals, nondominanted)
-            for ind in jumping_pop:
-                ind.v = self.trim_function(ind.v)
+            jumping_pop = self.jump_genes(
+                self.individuals.population, nondominanted.population
+            )
+            jumping_pop = Population.from_vectors(
+                [self.trim_function(x) for x in jumping_pop],
+                len(self.dims),
+                len(self.objectives),
+            )
 
-            self.individuals = set(self.individuals + jumping_pop)
+            self.individuals = Population.concat(self.individuals, jumping_pop)
             self._calculate_objectives()
             self._nd_sort()
             self._crowding()
@@ -71,30 +80,18 @@ class JGBL(NSGAII):
 
     def jump_genes(self, pop, nondominated):
         jumping_pop = []
-        for ind in pop:
+        for x in pop:
             if random.random() < self.jumping_rate:
-                _, cut_self = self.cut_and_paste(ind.v, ind.v)
-                _, copy_self = self.copy_and_paste(ind.v, ind.v)
+                _, cut_self = self.cut_and_paste(x, x)
+                _, copy_self = self.copy_and_paste(x, x)
 
-                cut_ind1, cut_ind2 = self.cut_and_paste(
-                    ind.v, random.choice(nondominated).v
-                )
+                cut_ind1, cut_ind2 = self.cut_and_paste(x, random.choice(nondominated))
                 copy_ind1, copy_ind2 = self.copy_and_paste(
-                    ind.v, random.choice(nondominated).v
+                    x, random.choice(nondominated)
                 )
 
                 jumping_pop.extend(
-                    [
-                        algorithms.NSGAII.NSGAII.Individual(x)
-                        for x in [
-                            cut_self,
-                            copy_self,
-                            cut_ind1,
-                            cut_ind2,
-                            copy_ind1,
-                            copy_ind2,
-                        ]
-                    ]
+                    [cut_self, copy_self, cut_ind1, cut_ind2, copy_ind1, copy_ind2]
                 )
         return jumping_pop
 
@@ -1,12 +1,20 @@
+from algorithms.base.population import Population
 from algorithms.base.driver import Driver
-from algorithms.base.drivertools import mutate, crossover
+from algorithms.base.drivertools import (
+    crossover_population,
+    generator,
+    mutate_population,
+    identity,
+)
+from evotools.crowding import crowding_distance
+from evotools.nondominated import fronts_to_ranks, non_dominated_sort
 
 __author__ = "Prpht"
 
-import collections
-import random
 import sys
 
+import numpy
+
 
 def dominates_weak(x, y):
     return all([a <= b for a, b in zip(x.objectives.values(), y.objectives.values())])
@@ -36,7 +44,7 @@ class NSGAII(Driver):
         crossover_eta,
         mutation_rate,
         crossover_rate,
-        trim_function=lambda x: x,
+        trim_function=identity,
         fitness_archive=None,
         *args,
         **kwargs
@@ -67,14 +75,16 @@ class NSGAII(Driver):
 
     @property
     def population(self):
-        return [x.v for x in self.individuals]
+        return self.individuals.population
 
     def finalized_population(self):
         return self.finish()
 
     @population.setter
     def population(self, pop):
-        self.individuals = [Individual(x) for x in pop]
+        self.individuals = Population.from_vectors(
+            pop, len(self.dims), len(self.objectives)
+        )
         self.population_size = len(self.individuals)
         self.mating_size = int(self.mating_size_c * self.population_size)
 
@@ -83,7 +93,7 @@ class NSGAII(Driver):
         self._nd_sort()
         self._crowding()
         self._environmental_selection()
-        return [x.v for x in self.individuals]
+        return self.individuals.population
 
     def step(self):
         self._nd_sort()
@@ -92,128 +102,68 @@ class NSGAII(Driver):
         self._mating_selection(0.9)
         self._crossover()
         self._mutation()
-        for ind in self.mating_individuals:
-            ind.v = self.trim_function(ind.v)
-        self.individuals += self.mating_individuals
+        self.individuals = Population.concat(self.individuals, self.mating_individuals)
         self._calculate_objectives()
         self.generation_counter += 1
 
     def _calculate_objectives(self):
-        for ind in self.individuals:
-            if ind.objectives is None:
-                if (self.fitness_archive is not None) and (
-                    ind.v in self.fitness_archive
-                ):
-                    fitnesses = self.fitness_archive[ind.v]
-                else:
-                    self.cost += 1
-                    fitnesses = [objective(ind.v) for objective in self.objectives]
-                    if self.fitness_archive is not None:
-                        self.fitness_archive[ind.v] = fitnesses
-                ind.objectives = {
-                    objective: fitness
-                    for objective, fitness in zip(self.objectives, fitnesses)
-                }
+        self.cost += self.individuals.evaluate(self.objectives, self.fitness_archive)
 
     def _nd_sort(self):
-        self.dominated_by = collections.defaultdict(set)
-        self.how_many_dominates = collections.defaultdict(int)
-        self.nsga_rank = collections.defaultdict(int)
-        self.front = collections.defaultdict(list)
-        for x in self.individuals:
-            for y in self.individuals:
-                if dominates(x, y):
-                    self.dominated_by[x].add(y)
-                elif dominates(y, x):
-                    self.how_many_dominates[x] += 1
-            if self.how_many_dominates[x] is 0:
-                self.nsga_rank[x] = 1
-                self.front[1].append(x)
-        front_no = 1
-        while True:
-            if len(self.front[front_no]) is 0:
-                break
-            for x in self.front[front_no]:
-                for y in self.dominated_by[x]:
-                    self.how_many_dominates[y] -= 1
-                    if self.how_many_dominates[y] is 0:
-                        self.nsga_rank[y] = front_no + 1
-                        self.front[front_no + 1].append(y)
-            front_no += 1
+        # fronts index the population as it was sorted, before the selection
+        self.sorted_individuals = self.individuals
+        self.front = non_dominated_sort(self.individuals.objectives)
+        self.individuals.rank = fronts_to_ranks(self.front, len(self.individuals))
 
     def _crowding(self):
-        self.dist = collections.defaultdict(float)
-        for front_no, inds in self.front.items():
-            if len(inds) == 0:
-                break
-            elif len(inds) == 1:
-                self.dist[inds[0]] = 0
-            else:
-                for objective in self.objectives:
-                    inds.sort(key=lambda x: x.objectives[objective])
-                    # self.dist[inds[0]] = self.dist[inds[-1]] = float('inf')
-                    max_r = inds[-1].objectives[objective]
-                    min_r = inds[0].objectives[objective]
-                    self.dist[inds[0]] = float("inf")
-                    self.dist[inds[-1]] += (
-                        2
-                        * (
-                            inds[-1].objectives[objective]
-                            - inds[-2].objectives[objective]
-                        )
-                        / (max_r - min_r + sys.float_info.epsilon)
-                    )
-                    for k in range(1, len(inds) - 1):
-                        self.dist[inds[k]] += (
-                            inds[k + 1].objectives[objective]
-                            - inds[k - 1].objectives[objective]
-                        ) / (max_r - min_r + sys.float_info.epsilon)
+        self.individuals.crowding = crowding_distance(
+            self.individuals.objectives, self.front
+        )
 
     def _environmental_selection(self):
-        fitness = lambda ind: (
-            self.nsga_rank[ind],
-            1 / (self.dist[ind] + sys.float_info.epsilon),
+        self.fitness = (
+            self.individuals.rank,
+            1 / (self.individuals.crowding + sys.float_info.epsilon),
         )
-        self.fitness = {ind: fitness(ind) for ind in self.individuals}
-        self.individuals = sorted(self.individuals, key=lambda ind: self.fitness[ind])[
-            : self.population_size
-        ]
+        order = numpy.lexsort(self.fitness[::-1])[: self.population_size]
+        self.individuals = self.individuals[order]
+        self.fitness = tuple(key[order] for key in self.fitness)
 
     def _mating_selection(self, p):
-        coin = lambda: random.random() < p
-        better = (
-            lambda x1, x2: self.fitness[x1] < self.fitness[x2] and x1 or x2
-            if coin()
-            else self.fitness[x1] > self.fitness[x2] and x1 or x2
+        rng = generator()
+        size = 2 * self.mating_size
+        x1 = rng.integers(len(self.individuals), size=size)
+        x2 = rng.integers(len(self.individuals), size=size)
+        rank, inv_crowding = self.fitness
+        x1_better = (rank[x1] < rank[x2]) | (
+            (rank[x1] == rank[x2]) & (inv_crowding[x1] < inv_crowding[x2])
         )
-        self.mating_individuals = [
-            better(random.choice(self.individuals), random.choice(self.individuals))
-            for _ in range(2 * self.mating_size)
-        ]
+        x1_worse = (rank[x1] > rank[x2]) | (
+            (rank[x1] == rank[x2]) & (inv_crowding[x1] > inv_crowding[x2])
+        )
+        # with probability p the better of the two wins, otherwise the worse
+        x1_wins = numpy.where(rng.random(size) < p, x1_better, x1_worse)
+        self.mating_individuals = self.individuals[numpy.where(x1_wins, x1, x2)]
 
     def _crossover(self):
-        self.mating_individuals = [
-            crossover(
-                self.mating_individuals[i].v,
-                self.mating_individuals[self.mating_size + i].v,
-                self.dims,
-                self.crossover_rate,
-                self.crossover_eta,
-            )
-            for i in range(self.mating_size)
-        ]
+        parents = self.mating_individuals.decisions
+        self.mating_individuals = crossover_population(
+            parents[: self.mating_size],
+            parents[self.mating_size :],
+            self.dims,
+            self.crossover_rate,
+            self.crossover_eta,
+        )
 
     def _mutation(self):
-        self.mating_individuals = [
-            Individual(mutate(x, self.dims, self.mutation_rate, self.mutation_eta))
-            for x in self.mating_individuals
-        ]
-
-
-class Individual:
-    def __init__(self, vector):
-        self.v = vector
-        self.objectives = None
+        offspring = mutate_population(
+            self.mating_individuals, self.dims, self.mutation_rate, self.mutation_eta
+        )
+        self.mating_individuals = Population.from_vectors(
+            [self.trim_function(x) for x in offspring.tolist()],
+            len(self.dims),
+            len(self.objectives),
+        )
 
 
 if __name__ == "__main__":
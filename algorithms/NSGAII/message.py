@@ -1,15 +1,27 @@
-from algorithms.HGS.distributed.message import DefaultHGSMessageAdapter
-from algorithms.IMGA.message import DefaultIMGAMessageAdapter
+from algorithms.HGS.distributed.message import HGSMessageAdapter
+from algorithms.IMGA.message import IMGAMessageAdapter
+from algorithms.base.population import Population
 
 
-def NSGAIIIMGAMessageAdapter(driver):
-    return DefaultIMGAMessageAdapter(driver)
+class NSGAIIIMGAMessageAdapter(IMGAMessageAdapter):
+    def get_population(self):
+        return self.driver.individuals.population
 
+    def immigrate(self, migrants):
+        self.driver.individuals = Population.concat(self.driver.individuals, *migrants)
+
+    def emigrate(self, migrants):
+        self.driver.individuals, emigrants = self.driver.individuals.partition(migrants)
+        return emigrants
+
+
+class NSGAIIHGSMessageAdapter(HGSMessageAdapter):
+    def get_population(self):
+        return self.driver.individuals.population
 
-class NSGAIIHGSMessageAdapter(DefaultHGSMessageAdapter):
     def nominate_delegates(self):
         self.driver.shutdown()
-        return super().nominate_delegates()
+        return self.driver.sorted_individuals[self.driver.front[0]].population
 
 
 NSGAIIDHGSMessageAdapter = NSGAIIHGSMessageAdapter
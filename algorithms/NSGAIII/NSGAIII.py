@@ -1,11 +1,18 @@
+import collections
+import itertools
 import math
 import random
 
-import collections
 import numpy
 import numpy.linalg
 
 from algorithms.base.driver import Driver
+from algorithms.base.drivertools import (
+    crossover_pairs,
+    evaluate_individuals,
+    mutate_population,
+    identity,
+)
 
 EPSILON = numpy.finfo(float).eps
 
@@ -23,7 +30,7 @@ class NSGAIII(Driver):
         mutation_rate="default",
         crossover_rate=0.9,
         theta=5,
-        trim_function=lambda x: x,
+        trim_function=identity,
         fitness_archive=None,
         *args,
         **kwargs
@@ -47,9 +54,7 @@ class NSGAIII(Driver):
 
         self.population_size = len(population)
         self.reference_points = self.generate_reference_points()
-        self.reference_point_lengths = [
-            numpy.linalg.norm(point) for point in self.reference_points
-        ]
+        self.reference_point_lengths = numpy.linalg.norm(self.reference_points, axis=1)
 
         self.individuals = []
         self.trim_function = trim_function
@@ -68,14 +73,14 @@ class NSGAIII(Driver):
         # plt.scatter([self.ideal_point[0]], [self.ideal_point[1]], c='r')
         # plt.show()
 
-        self.clusters = [[] for _ in self.reference_points]
+        self.clusters = numpy.zeros(0, dtype=int)
         self.front = []
 
     def generate_reference_points(self):
-        return [
-            generate_reference_point(self.objective_no)
-            for _ in range(self.population_size)
-        ]
+        return das_dennis_directions(
+            self.objective_no,
+            reference_divisions(self.objective_no, self.population_size),
+        )
 
     @property
     def population(self):
@@ -92,17 +97,13 @@ class NSGAIII(Driver):
         self.population_size = len(self.individuals)
 
     def _calculate_objectives(self, individuals):
-        for ind in individuals:
-            if ind.objectives is None:
-                if (self.fitness_archive is not None) and (
-                    ind.v in self.fitness_archive
-                ):
-                    ind.objectives = self.fitness_archive[ind.v]
-                else:
-                    self.cost += 1
-                    ind.objectives = [objective(ind.v) for objective in self.objectives]
-                    if self.fitness_archive is not None:
-                        self.fitness_archive[ind.v] = ind.objectives
+        pending = [ind for ind in individuals if ind.objectives is None]
+        results, evaluated = evaluate_individuals(
+            self.objectives, [ind.v for ind in pending], self.fitness_archive
+        )
+        self.cost += sum(evaluated)
+        for ind, objectives in zip(pending, results):
+            ind.objectives = objectives
 
     def update_ideal_point(self, individuals):
         self._calculate_objectives(individuals)
@@ -132,7 +133,7 @@ class NSGAIII(Driver):
         # plt.show()
 
         offspring_inds.extend(self.individuals)
-        self.normalize(offspring_inds)
+        normalized = self.normalize(offspring_inds)
 
         # TODO: remove debug
         # plt.scatter([x.normalized_objectives[0] for x in offspring_inds],
@@ -140,7 +141,7 @@ class NSGAIII(Driver):
         # plt.scatter([x[0] for x in self.reference_points], [x[1] for x in self.reference_points], c='k', marker='+')
         # plt.show()
 
-        self.clustering(offspring_inds)
+        projections, rejections = self.clustering(normalized)
 
         # TODO: remove debug
         # for i, cluster in enumerate(self.clusters):
@@ -173,8 +174,12 @@ class NSGAIII(Driver):
         # plt.scatter([x.objectives[0] for x in offspring_inds], [x.objectives[1] for x in offspring_inds],
         #             c='g', s=400)
 
-        self.calculate_theta_fitness()
-        fronts = theta_non_dominated_sort(offspring_inds)
+        theta_fitness = self.calculate_theta_fitness(projections, rejections)
+        fronts = collections.defaultdict(list)
+        for front_no, front in enumerate(
+            theta_non_dominated_sort(self.clusters, theta_fitness), start=1
+        ):
+            fronts[front_no] = [offspring_inds[i] for i in front]
 
         # TODO: remove debug
         # for i in fronts.keys():
@@ -206,78 +211,62 @@ class NSGAIII(Driver):
         self.front = fronts
 
     def make_offspring_individuals(self):
+        pairs = [
+            (random.choice(self.individuals), random.choice(self.individuals))
+            for _ in range(int(self.population_size / 2))
+        ]
+        parents = [parent for pair in pairs for parent in pair]
+        children_a, children_b, crossed = crossover_pairs(
+            [parent_a.v for parent_a, _ in pairs],
+            [parent_b.v for _, parent_b in pairs],
+            self.dims,
+            self.crossover_rate,
+            self.eta_crossover,
+        )
+        # children are interleaved: a0, b0, a1, b1, ...
+        children = numpy.stack([children_a, children_b], axis=1).reshape(
+            -1, self.dims_no
+        )
+        children, mutated = mutate_population(
+            children,
+            self.dims,
+            self.mutation_rate,
+            self.eta_mutation,
+            return_mask=True,
+        )
+
         offspring_inds = []
-        for _ in range(int(self.population_size / 2)):
-            parent_a = random.choice(self.individuals)
-            parent_b = random.choice(self.individuals)
-            child_a, child_b = simulated_binary_crossover(
-                parent_a,
-                parent_b,
-                self.dims,
-                crossover_rate=self.crossover_rate,
-                eta=self.eta_crossover,
-            )
-            polynomial_mutation(
-                child_a,
-                self.dims,
-                mutation_rate=self.mutation_rate,
-                eta=self.eta_mutation,
-            )
-            polynomial_mutation(
-                child_b,
-                self.dims,
-                mutation_rate=self.mutation_rate,
-                eta=self.eta_mutation,
-            )
-            offspring_inds.append(child_a)
-            offspring_inds.append(child_b)
+        changed = numpy.repeat(crossed, 2) | mutated.any(axis=1)
+        for parent, child, child_changed in zip(parents, children.tolist(), changed):
+            child = Individual(child)
+            if not child_changed:
+                # neither crossed nor mutated - objectives of the parent still hold
+                child.objectives = [x for x in parent.objectives]
+            offspring_inds.append(child)
         return offspring_inds
 
     def normalize(self, individuals):
-        defiled_point = [float("-inf") for _ in range(self.objective_no)]
-        for ind in individuals:
-            for i, objective in enumerate(ind.objectives):
-                if defiled_point[i] < objective:
-                    defiled_point[i] = objective
+        """ :return: Macierz (N, M) celów przeskalowanych między ideał a nadir. """
+        objectives = numpy.array([ind.objectives for ind in individuals], dtype=float)
+        ideal_point = numpy.array(self.ideal_point, dtype=float)
+        defiled_point = objectives.max(axis=0)
+        return (objectives - ideal_point) / (defiled_point - ideal_point + EPSILON)
+
+    def clustering(self, normalized):
+        """
+        Przypisuje każdy punkt do kierunku referencyjnego o najmniejszej
+        odległości prostopadłej; wynik trafia do self.clusters.
+        :return: Długości rzutów i odległości prostopadłe do przypisanych kierunków.
+        """
+        projections, rejections = associate(
+            normalized, self.reference_points, self.reference_point_lengths
+        )
+        self.clusters = numpy.argmin(rejections, axis=1)
+        chosen = (numpy.arange(len(normalized)), self.clusters)
+        return projections[chosen], rejections[chosen]
 
-        # TODO: remove debug
-        # plt.scatter([defiled_point[0]], [defiled_point[1]], c='r')
-        # plt.show()
-
-        for ind in individuals:
-            ind.normalized_objectives = numpy.array(
-                [
-                    (obj - self.ideal_point[i])
-                    / (defiled_point[i] - self.ideal_point[i] + EPSILON)
-                    for i, obj in enumerate(ind.objectives)
-                ]
-            )
-
-    def clustering(self, individuals):
-        self.clusters = [[] for _ in self.reference_points]
-        for ind in individuals:
-            min_rejection = float("inf")
-            min_i = -1
-            for i, reference_point in enumerate(self.reference_points):
-                rejection = scalar_rejection(
-                    ind, reference_point, self.reference_point_lengths[i]
-                )
-                if rejection < min_rejection:
-                    min_rejection = rejection
-                    min_i = i
-            self.clusters[min_i].append(ind)
-            ind.cluster = min_i
-            ind.rejection = min_rejection
-
-    def calculate_theta_fitness(self):
-        for i, cluster in enumerate(self.clusters):
-            for ind in cluster:
-                ind.theta_fitness = (
-                    scalar_projection(
-                        ind, self.reference_points[i], self.reference_point_lengths[i]
-                    )
-                    + self.theta * ind.rejection
-                )
+    def calculate_theta_fitness(self, projections, rejections):
+        return projections + self.theta * rejections
 
     def create_final_population(self, fronts):
         new_inds = []
@@ -316,174 +305,98 @@ class Individual:
         self.objectives = None
 
 
-def theta_non_dominated_sort(individuals):
-    dominated_by = collections.defaultdict(set)
-    how_many_dominates = collections.defaultdict(int)
-    nsga_rank = collections.defaultdict(int)
-    front = collections.defaultdict(list)
-
-    for x in individuals:
-        for y in individuals:
-            if dominates(x, y):
-                dominated_by[x].add(y)
-            elif dominates(y, x):
-                how_many_dominates[x] += 1
-        if how_many_dominates[x] == 0:
-            nsga_rank[x] = 1
-            front[1].append(x)
-
-    front_no = 1
-    while not len(front[front_no]) == 0:
-        for x in front[front_no]:
-            for y in dominated_by[x]:
-                how_many_dominates[y] -= 1
-                if how_many_dominates[y] == 0:
-                    nsga_rank[y] = front_no + 1
-                    front[front_no + 1].append(y)
-        front_no += 1
-
-    return front
-
-
-def dominates(x, y):
-    if x.cluster == y.cluster and x.theta_fitness < y.theta_fitness:
-        return True
-    else:
-        return False
-
-
-def generate_reference_point(objective_no):
-    reference_point = []
-    coord_sum = 0.0
-    for i in range(1, objective_no + 1):
-        if i < objective_no:
-            rand = 0.0
-            while rand == 0.0:
-                rand = random.random()
-            coordinate = (1.0 - coord_sum) * (
-                1.0 - math.pow(rand, 1.0 / (objective_no - i))
-            )
-            coord_sum += coordinate
-            reference_point.append(coordinate)
-        else:
-            reference_point.append(1.0 - coord_sum)
-    return numpy.array(reference_point)
-
-
-def scalar_projection(ind, reference_point, reference_point_length):
-    return (
-        numpy.dot(ind.normalized_objectives, reference_point) / reference_point_length
-    )
-
-
-def scalar_rejection(ind, reference_point, reference_point_length):
-    scalar_projection_value = scalar_projection(
-        ind, reference_point, reference_point_length
+def theta_non_dominated_sort(clusters, theta_fitness) -> "[numpy.ndarray]":
+    """
+    Sortowanie według theta-dominacji: x dominuje y <=> oba należą do tego
+    samego klastra i theta(x) < theta(y). Numer frontu to więc pozycja
+    wartości theta wśród różnych wartości w klastrze.
+    :param clusters: (N,) numery klastrów.
+    :param theta_fitness: (N,) wartości theta.
+    :return: Lista frontów - rosnących tablic indeksów, od najlepszego.
+    """
+    clusters = numpy.asarray(clusters)
+    theta_fitness = numpy.asarray(theta_fitness, dtype=float)
+    if len(clusters) == 0:
+        return []
+    order = numpy.lexsort((theta_fitness, clusters))
+    sorted_clusters = clusters[order]
+    sorted_theta = theta_fitness[order]
+
+    cluster_start = numpy.concatenate(
+        [[True], sorted_clusters[1:] != sorted_clusters[:-1]]
     )
-    return numpy.linalg.norm(
-        ind.normalized_objectives
-        - ((scalar_projection_value / reference_point_length) * reference_point)
+    new_value = cluster_start.copy()
+    new_value[1:] |= sorted_theta[1:] != sorted_theta[:-1]
+    distinct_seen = numpy.cumsum(new_value)
+    start_positions = numpy.maximum.accumulate(
+        numpy.where(cluster_start, numpy.arange(len(order)), 0)
     )
+    ranks = numpy.empty(len(order), dtype=int)
+    ranks[order] = distinct_seen - distinct_seen[start_positions]
 
+    by_rank = numpy.argsort(ranks, kind="stable")
+    boundaries = numpy.flatnonzero(numpy.diff(ranks[by_rank])) + 1
+    return numpy.split(by_rank, boundaries)
 
-def simulated_binary_crossover(parent_a, parent_b, dims, crossover_rate=1.0, eta=30.0):
-    child_a = Individual([x for x in parent_a.v])
-    child_b = Individual([x for x in parent_b.v])
 
-    if random.random() > crossover_rate:
-        child_a.objectives = [x for x in parent_a.objectives]
-        child_b.objectives = [x for x in parent_b.objectives]
-        return child_a, child_b
+def reference_divisions(objective_no, population_size) -> int:
+    """ :return: Największa liczba podziałów dająca nie więcej kierunków niż osobników. """
+    if objective_no < 2:
+        # a single objective has one direction for any number of divisions
+        return 1
+    divisions = 1
+    while _directions_count(objective_no, divisions + 1) <= population_size:
+        divisions += 1
+    return divisions
 
-    for i, dim in enumerate(dims):
-        if random.random() > 0.5:
-            continue
-        if math.fabs(parent_a.v[i] - parent_b.v[i]) <= EPSILON:
-            continue
 
-        y1 = min(parent_a.v[i], parent_b.v[i])
-        y2 = max(parent_a.v[i], parent_b.v[i])
-
-        lb, ub = dim
-
-        rand = random.random()
-
-        # child a
-        beta = 1.0 + (2.0 * (y1 - lb) / (y2 - y1 + EPSILON))
-        alpha = 2.0 - pow(beta, -(eta + 1.0))
-        beta_q = get_beta_q(rand, alpha, eta)
-
-        child_a.v[i] = 0.5 * ((y1 + y2) - beta_q * (y2 - y1))
-
-        # child b
-        beta = 1.0 + (2.0 * (ub - y2) / (y2 - y1 + EPSILON))
-        alpha = 2.0 - pow(beta, -(eta + 1.0))
-        beta_q = get_beta_q(rand, alpha, eta)
-
-        child_b.v[i] = 0.5 * ((y1 + y2) + beta_q * (y2 - y1))
-
-        # boundary checking
-        child_a.v[i] = min(ub, max(lb, child_a.v[i]))
-        child_b.v[i] = min(ub, max(lb, child_b.v[i]))
-
-        if random.random() > 0.5:
-            temp = child_a.v[i]
-            child_a.v[i] = child_b.v[i]
-            child_b.v[i] = temp
-
-    return child_a, child_b
-
-
-def get_beta_q(rand, alpha, eta):
-    if rand <= (1.0 / alpha):
-        beta_q = pow((rand * alpha), (1.0 / (eta + 1.0)))
-    else:
-        beta_q = pow((1.0 / (2.0 - rand * alpha)), (1.0 / (eta + 1.0)))
-    return beta_q
-
-
-def polynomial_mutation(ind, dims, mutation_rate=0.0, eta=20.0):
-    for i, dim in enumerate(dims):
-        if random.random() > mutation_rate:
-            continue
-
-        y = ind.v[i]
-        lb, ub = dim
-
-        delta1 = (y - lb) / (ub - lb + EPSILON)
-        delta2 = (ub - y) / (ub - lb + EPSILON)
-
-        mut_pow = 1.0 / (eta + 1.0)
-
-        rnd = random.random()
-
-        if rnd <= 0.5:
-            xy = 1.0 - delta1
-            val = 2.0 * rnd + (1.0 - 2.0 * rnd) * (pow(xy, (eta + 1.0)))
-            delta_q = pow(val, mut_pow) - 1.0
-        else:
-            xy = 1.0 - delta2
-            val = 2.0 * (1.0 - rnd) + 2.0 * (rnd - 0.5) * (pow(xy, (eta + 1.0)))
-            delta_q = 1.0 - (pow(val, mut_pow))
+def _directions_count(objective_no, divisions):
+    return math.factorial(divisions + objective_no - 1) // (
+        math.factorial(divisions) * math.factorial(objective_no - 1)
+    )
 
-        y += delta_q * (ub - lb)
-        y = min(ub, max(lb, y))
 
-        ind.v[i] = y
-        ind.objectives = None
+def das_dennis_directions(objective_no, divisions) -> "numpy.ndarray":
+    """
+    Kierunki referencyjne Dasa i Dennisa: wszystkie punkty sympleksu
+    o współrzędnych będących wielokrotnościami 1 / divisions.
+    :return: Macierz (C(divisions + M - 1, M - 1), M).
+    """
+    # stars and bars: M - 1 bars placed among divisions + M - 1 slots
+    slots = divisions + objective_no - 1
+    combinations = list(itertools.combinations(range(slots), objective_no - 1))
+    bars = numpy.array(combinations, dtype=int).reshape(
+        len(combinations), objective_no - 1
+    )
+    edges = numpy.hstack(
+        [
+            numpy.full((len(bars), 1), -1),
+            bars,
+            numpy.full((len(bars), 1), slots),
+        ]
+    )
+    return (numpy.diff(edges, axis=1) - 1) / divisions
+
+
+def associate(normalized, reference_points, reference_point_lengths):
+    """
+    Rzuty punktów na wszystkie kierunki referencyjne naraz.
+    :return: Macierze (N, K) długości rzutów i odległości prostopadłych.
+    """
+    directions = reference_points / reference_point_lengths[:, numpy.newaxis]
+    projections = normalized @ directions.T
+    squared_norms = numpy.einsum("ij,ij->i", normalized, normalized)
+    rejections = numpy.sqrt(
+        numpy.maximum(squared_norms[:, numpy.newaxis] - projections ** 2, 0.0)
+    )
+    return projections, rejections
 
 
 if __name__ == "__main__":
     sample_dims = [(-100.0, 100.0), (-100.0, 100.0)]
 
-    mutatedX = []
-    mutatedY = []
-    for _ in range(100):
-        to_mut = Individual([0.0, 0.0])
-        polynomial_mutation(to_mut, sample_dims, 0.9, 300.0)
-        mutatedX.append(to_mut.v[0])
-        mutatedY.append(to_mut.v[1])
-    plt.scatter(mutatedX, mutatedY)
+    mutated = mutate_population([[0.0, 0.0]] * 100, sample_dims, 0.9, 300.0)
+    plt.scatter(mutated[:, 0], mutated[:, 1])
     plt.xlim(-100.0, 100.0)
     plt.ylim(-100.0, 100.0)
 
@@ -494,7 +407,7 @@ if __name__ == "__main__":
     # for _ in range(10000):
     # to_crossA = Individual([-10.0, -10.0])
     #     to_crossB = Individual([10.0, 10.0])
-    #     newA, newB = simulated_binary_crossover(to_crossA, to_crossB, dims, 1.0, eta=150.0)
+    #     newA, newB, _ = crossover_pairs(to_crossA.v, to_crossB.v, dims, 1.0, eta=150.0)
     #     crossX.append(newA.v[0])
     #     crossY.append(newA.v[1])
     #     crossX.append(newB.v[0])
@@ -5,6 +5,8 @@ from scipy.spatial import distance
 
 from algorithms.NSGAII import NSGAII
 from algorithms.base.driver import Driver
+from algorithms.base.drivertools import evaluate_individuals, identity
+from evotools.nondominated import non_dominated_sort
 
 
 class NSLS(Driver):
@@ -17,7 +19,7 @@ class NSLS(Driver):
         crossover_eta,
         mutation_rate,
         crossover_rate,
-        trim_function=lambda x: x,
+        trim_function=identity,
         fitness_archive=None,
         local_search_mu=0.5,
         local_search_sigma=0.5,
@@ -41,8 +43,6 @@ class NSLS(Driver):
         self.population_size = len(population)
         self.population = [self.trim_function(x) for x in population]
 
-        self.dominated_by = None
-        self.how_many_dominates = None
         self.nsga_rank = None
         self.front = None
 
@@ -61,21 +61,16 @@ class NSLS(Driver):
         return [x.v for x in self.individuals]
 
     def calculate_objectives(self, individuals):
-        for ind in individuals:
-            if ind.objectives is None:
-                if (self.fitness_archive is not None) and (
-                    ind.v in self.fitness_archive
-                ):
-                    fitnesses = self.fitness_archive[ind.v]
-                else:
-                    self.cost += 1
-                    fitnesses = [objective(ind.v) for objective in self.objectives]
-                    if self.fitness_archive is not None:
-                        self.fitness_archive[ind.v] = fitnesses
-                ind.objectives = {
-                    objective: fitness
-                    for objective, fitness in zip(self.objectives, fitnesses)
-                }
+        pending = [ind for ind in individuals if ind.objectives is None]
+        results, evaluated = evaluate_individuals(
+            self.objectives, [ind.v for ind in pending], self.fitness_archive
+        )
+        self.cost += sum(evaluated)
+        for ind, fitnesses in zip(pending, results):
+            ind.objectives = {
+                objective: fitness
+                for objective, fitness in zip(self.objectives, fitnesses)
+            }
 
     def step(self):
         self.calculate_objectives(self.individuals)
@@ -132,32 +127,15 @@ class NSLS(Driver):
                 self.individuals.append(ind)
 
     def nd_sort(self):
-        self.dominated_by = collections.defaultdict(set)
-        self.how_many_dominates = collections.defaultdict(int)
+        fronts = non_dominated_sort(
+            [list(ind.objectives.values()) for ind in self.individuals]
+        )
         self.nsga_rank = collections.defaultdict(int)
         self.front = collections.defaultdict(list)
-
-        for x in self.individuals:
-            for y in self.individuals:
-                if NSGAII.dominates(x, y):
-                    self.dominated_by[x].add(y)
-                elif NSGAII.dominates(y, x):
-                    self.how_many_dominates[x] += 1
-            if self.how_many_dominates[x] is 0:
-                self.nsga_rank[x] = 1
-                self.front[1].append(x)
-
-        front_no = 1
-        while True:
-            if len(self.front[front_no]) is 0:
-                break
-            for x in self.front[front_no]:
-                for y in self.dominated_by[x]:
-                    self.how_many_dominates[y] -= 1
-                    if self.how_many_dominates[y] is 0:
-                        self.nsga_rank[y] = front_no + 1
-                        self.front[front_no + 1].append(y)
-            front_no += 1
+        for front_no, front in enumerate(fronts, start=1):
+            for i in front:
+                self.nsga_rank[self.individuals[i]] = front_no
+                self.front[front_no].append(self.individuals[i])
 
     def next_generation(self):
         next_gen_individuals = []
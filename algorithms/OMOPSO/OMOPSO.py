@@ -1,8 +1,12 @@
-import copy
 import logging
 import random
 
+import numpy
+
+from algorithms.base.archive import CrowdingArchive, NonDominatedArchive
 from algorithms.base.driver import Driver
+from algorithms.base.drivertools import evaluate_individuals, identity
+from algorithms.base.population import Swarm
 
 
 class OMOPSO(Driver):
@@ -19,7 +23,7 @@ class OMOPSO(Driver):
         crossover_rate,
         mutation_perturbation=0.5,
         mutation_probability=0.05,
-        trim_function=lambda x: x,
+        trim_function=identity,
         fitness_archive=None,
         *args,
         **kwargs
@@ -27,7 +31,7 @@ class OMOPSO(Driver):
         super().__init__(*args, **kwargs)
         self.fitnesses = fitnesses
         self.dims = dims
-        self.individuals = [Individual(trim_function(x)) for x in population]
+        self.population = [trim_function(x) for x in population]
         self.mutation_probability = mutation_probability
 
         self.leaders_size = len(population)  # parameter?
@@ -36,23 +40,23 @@ class OMOPSO(Driver):
 
         self.trim_function = trim_function
 
-        self.archive = Archive(self.ETA)
-        self.leader_archive = LeaderArchive(self.leaders_size)
+        self.archive = NonDominatedArchive(self.ETA)
+        self.leader_archive = CrowdingArchive(self.leaders_size)
         self.fitness_archive = fitness_archive
 
         self.init()
 
     @property
     def population(self):
-        return [x.value for x in self.individuals]
+        return self.individuals.population
 
     @population.setter
     def population(self, pop):
-        self.individuals = [Individual(x) for x in pop]
+        self.individuals = Swarm.from_vectors(pop, len(self.dims), len(self.fitnesses))
 
     def init_personal_best(self):
-        for p in self.individuals:
-            p.best_val = copy.deepcopy(p)
+        self.individuals.best_decisions = self.individuals.decisions
+        self.individuals.best_objectives = self.individuals.objectives
 
     def init(self):
         self.logger = logging.getLogger(__name__)
@@ -64,9 +68,7 @@ class OMOPSO(Driver):
         self.leader_archive.crowding()
 
     def init_leaders(self):
-        for p in self.individuals:
-            if self.leader_archive.add(copy.deepcopy(p)):
-                self.archive.add(copy.deepcopy(p))
+        self.update_leaders()
 
     def finalized_population(self):
         return [x.value for x in self.archive]
@@ -82,8 +84,9 @@ class OMOPSO(Driver):
         progress = min(1.0, self.cost / self.max_budget) if self.max_budget else None
         self.mopso_mutation(progress)
 
-        for x in self.individuals:
-            x.value = self.trim_function(x.value)
+        self.individuals.decisions = [
+            self.trim_function(x) for x in self.individuals.population
+        ]
 
         self.cost += self.calculate_objectives()
 
@@ -100,47 +103,50 @@ class OMOPSO(Driver):
         self.gen_no += 1
 
     def update_personal_best(self):
-        for p in self.individuals:
-            # print("new: {}, best: {}".format(p.objectives, p.best_val.objectives))
-            if p.dominates(p.best_val):
-                # print("new best: {}".format(p.objectives))
-                p.best_val = copy.deepcopy(p)
+        particles = self.individuals
+        objectives, best = particles.objectives, particles.best_objectives
+        improved = (objectives <= best).all(axis=1) & (objectives < best).any(axis=1)
+        improved = particles[improved]
+        improved.best_decisions = improved.decisions
+        improved.best_objectives = improved.objectives
 
     def update_leaders(self):
-        for p in self.individuals:
-            new_ind = copy.deepcopy(p)
-            if self.leader_archive.add(new_ind):
-                self.archive.add(copy.deepcopy(p))
+        for leader in self.individuals.leaders():
+            # both archives only read the leader, it may be shared
+            if self.leader_archive.add(leader):
+                self.archive.add(leader)
 
     def calculate_objectives(self):
-        objectives_cost = 0
-        for p in self.individuals:
-            if (self.fitness_archive is not None) and (p.value in self.fitness_archive):
-                p.objectives = self.fitness_archive[p.value]
-                objectives_cost = 0
-            else:
-                p.objectives = [o(p.value) for o in self.fitnesses]
-                objectives_cost = len(self.individuals)
-        return objectives_cost
+        results, evaluated = evaluate_individuals(
+            self.fitnesses,
+            self.individuals.population,
+            self.fitness_archive,
+            store=False,
+        )
+        self.individuals.objectives = results
+        return len(self.individuals) if evaluated and evaluated[-1] else 0
 
     def move(self):
-        for p in self.individuals:
-            for i in range(len(self.dims)):
-                new_x = p.value[i] + p.speed[i]
-                bounded_x = max(new_x, self.dims[i][0])
-                bounded_x = min(bounded_x, self.dims[i][1])
-
-                if bounded_x != new_x:
-                    p.speed[i] *= -1
-
-                p.value[i] = bounded_x
+        particles = self.individuals
+        lower, upper = numpy.array(self.dims, dtype=float).T
+        moved = particles.decisions + particles.speed
+        bounded = numpy.minimum(numpy.maximum(moved, lower), upper)
+        particles.speed = numpy.where(
+            bounded != moved, -particles.speed, particles.speed
+        )
+        particles.decisions = bounded
 
     def compute_speed(self):
-        for p in self.individuals:
-            best_global = (
-                self.crowding_selector(self.leader_archive)
+        particles = self.individuals
+        # leaders and coefficients are drawn particle by particle, in the same
+        # order as before; the speeds are then updated for the whole swarm
+        best_global = []
+        coefficients = []
+        for _ in range(len(particles)):
+            best_global.append(
+                self.crowding_selector(self.leader_archive).value
                 if len(self.leader_archive.archive) > 1
-                else self.leader_archive.archive[0]
+                else self.leader_archive.archive[0].value
             )
 
             r1 = random.random()
@@ -148,13 +154,17 @@ class OMOPSO(Driver):
             C1 = random.uniform(1.5, 2.0)
             C2 = random.uniform(1.5, 2.0)
             W = random.uniform(0.1, 0.5)
+            coefficients.append((W, C1 * r1, C2 * r2))
 
-            for j in range(len(self.dims)):
-                p.speed[j] = (
-                    W * p.speed[j]
-                    + C1 * r1 * (p.best_val.value[j] - p.value[j])
-                    + C2 * r2 * (best_global.value[j] - p.value[j])
-                )
+        W, C1_r1, C2_r2 = (
+            numpy.array(coefficients).reshape(-1, 3).T[:, :, numpy.newaxis]
+        )
+        x = particles.decisions
+        particles.speed = (
+            W * particles.speed
+            + C1_r1 * (particles.best_decisions - x)
+            + C2_r2 * (numpy.array(best_global).reshape(x.shape) - x)
+        )
 
     def mopso_mutation(self, evolution_progress):
         pop_len = len(self.individuals)
@@ -162,7 +172,7 @@ class OMOPSO(Driver):
         uniform_mutation = UniformMutation(
             self.mutation_probability, self.mutation_perturbation, self.dims
         )
-        map(uniform_mutation, self.individuals[0:pop_part])
+        map(uniform_mutation, self.individuals.decisions[0:pop_part])
 
         if evolution_progress:
             non_uniform_mutation = NonUniformMutation(
@@ -171,7 +181,10 @@ class OMOPSO(Driver):
                 self.mutation_perturbation,
                 self.dims,
             )
-            map(non_uniform_mutation, self.individuals[pop_part : 2 * pop_part])
+            map(
+                non_uniform_mutation,
+                self.individuals.decisions[pop_part : 2 * pop_part],
+            )
 
 
 class Mutation(object):
@@ -180,24 +193,24 @@ class Mutation(object):
         self.mutation_perturbation = mutation_perturbation
         self.mutation_probability = mutation_probability
 
-    def do_mutation(self, p, index):
+    def do_mutation(self, x, index):
         return 0
 
-    def __call__(self, p):
+    def __call__(self, x):
         for i in range(len(self.dims)):
             if random.random() < self.mutation_probability:
-                mutation = self.do_mutation(p, i)
+                mutation = self.do_mutation(x, i)
 
-                p.value[i] += mutation
-                p.value[i] = max(p.value[i], self.dims[i][0])
-                p.value[i] = min(p.value[i], self.dims[i][1])
+                x[i] += mutation
+                x[i] = max(x[i], self.dims[i][0])
+                x[i] = min(x[i], self.dims[i][1])
 
 
 class UniformMutation(Mutation):
     def __init__(self, mutation_probability, mutation_perturbation, dims):
         super().__init__(mutation_probability, mutation_perturbation, dims)
 
-    def do_mutation(self, p, index):
+    def do_mutation(self, x, index):
         return (random.random() - 0.5) * self.mutation_perturbation
 
 
@@ -208,11 +221,11 @@ class NonUniformMutation(Mutation):
         super().__init__(mutation_probability, mutation_perturbation, dims)
         self.evolution_progress = evolution_progress
 
-    def do_mutation(self, p, index):
+    def do_mutation(self, x, index):
         return (
-            self.delta(self.dims[index][1] - p.value[index])
+            self.delta(self.dims[index][1] - x[index])
             if random.random() < 0.5
-            else self.delta(self.dims[index][0] - p.value[index])
+            else self.delta(self.dims[index][0] - x[index])
         )
 
     def delta(self, y):
@@ -229,104 +242,3 @@ class CrowdingTournament:
     def __call__(self, pool):
         sub_pool = random.sample(pool.archive, self.tournament_size)
         return min(sub_pool, key=lambda x: x.crowd_val)
-
-
-class Individual:
-    def __init__(self, value):
-        self.value = value
-        self.best_val = None
-        self.crowd_val = 0
-        self.objectives = []
-        self.reset_speed()
-
-    def __deepcopy__(self, memo):
-        dup = Individual(copy.deepcopy(self.value, memo))
-        dup.best_val = copy.deepcopy(self.best_val, memo)
-        dup.speed = copy.deepcopy(self.speed, memo)
-        dup.crowd_val = self.crowd_val
-        dup.objectives = copy.deepcopy(self.objectives, memo)
-        return dup
-
-    def dominates(self, p2, eta=0):
-        at_least_one = False
-        for i in range(len(self.objectives)):
-            if p2.objectives[i] < self.objectives[i] / (1 + eta):
-                return False
-            elif p2.objectives[i] > self.objectives[i] / (1 + eta):
-                at_least_one = True
-
-        return at_least_one
-
-    def reset_speed(self):
-        self.speed = [0] * len(self.value)
-
-    def equal_obj(self, p):
-        for i in range(len(self.objectives)):
-            if self.objectives[i] != p.objectives[i]:
-                return False
-        return True
-
-
-class Archive(object):
-    def __init__(self, eta=0.0):
-        self.archive = []
-        self.eta = eta
-
-    def __iter__(self):
-        return self.archive.__iter__()
-
-    def add(self, p):
-
-        for l in self.archive:
-            if l.dominates(p, self.eta):
-                return False
-            elif p.dominates(l, self.eta):
-                self.archive.remove(l)
-            elif l.equal_obj(p):
-                return False
-
-        self.archive.append(p)
-        return True
-
-
-class LeaderArchive(Archive):
-    def __init__(self, size):
-        super().__init__()
-        self.size = size
-
-    def add(self, p):
-        added = super().add(p)
-        if added and len(self.archive) > self.size:
-            self.prune()
-        return added
-
-    def prune(self):
-        self.crowding()
-        worst_res = max(self.archive, key=lambda x: x.crowd_val)
-        self.archive.remove(worst_res)
-
-    def crowding(self):
-        for p in self.archive:
-            p.crowd_val = 0
-
-        obj_n = len(self.archive[0].objectives)
-
-        archive_len = len(self.archive)
-        for i in range(obj_n):
-            self.archive.sort(key=lambda x: x.objectives[i])
-            obj_min = self.archive[0].objectives[i]
-            obj_max = self.archive[archive_len - 1].objectives[i]
-
-            self.archive[0].crowd_val = float("inf")
-            self.archive[archive_len - 1].crowd_val = float("inf")
-
-            for j in range(1, archive_len - 1):
-                if obj_max - obj_min > 0:
-                    dist = (
-                        self.archive[j].objectives[i]
-                        - self.archive[j - 1].objectives[i]
-                    )
-                    dist /= obj_max - obj_min
-                    self.archive[j].crowd_val += dist
-                else:
-                    self.archive[j].crowd_val = float("inf")
@@ -1,29 +1,21 @@
 from algorithms.HGS.distributed.message import HGSMessageAdapter
 from algorithms.IMGA.message import IMGAMessageAdapter
 from algorithms.base.model import SubPopulation
+from algorithms.base.population import Swarm
 
 
 class OMOPSOIMGAMessageAdapter(IMGAMessageAdapter):
     def get_population(self):
-        return [x.value for x in self.driver.individuals]
+        return self.driver.population
 
     def immigrate(self, migrants):
-        for migrant in migrants:
-            migrant.reset_speed()
-            self.driver.individuals.append(migrant)
+        settled = len(self.driver.individuals)
+        self.driver.individuals = Swarm.concat(self.driver.individuals, *migrants)
+        self.driver.individuals[settled:].speed = 0.0
 
     def emigrate(self, migrants: SubPopulation):
-        immigrants_cp = list(migrants)
-        to_remove = []
-
-        for p in self.driver.individuals:
-            if p.value in immigrants_cp:
-                to_remove.append(p)
-                immigrants_cp.remove(p.value)
-
-        for p in to_remove:
-            self.driver.individuals.remove(p)
-        return to_remove
+        self.driver.individuals, emigrants = self.driver.individuals.partition(migrants)
+        return emigrants
 
 
 class OMOPSOHGSMessageAdapter(HGSMessageAdapter):
@@ -1,12 +1,15 @@
 import logging
 import random
 
-import collections
-
 from algorithms.base.driver import Driver
-from algorithms.base.drivertools import crossover, mutate
-from algorithms.base.hv import HyperVolume
-from evotools import ea_utils
+from algorithms.base.drivertools import (
+    crossover_population,
+    evaluate_individuals,
+    mutate_population,
+    identity,
+)
+from algorithms.base.hv import exclusive_contributions
+from evotools.nondominated import non_dominated_sort
 
 
 class SMSEMOA(Driver):
@@ -21,7 +24,7 @@ class SMSEMOA(Driver):
         crossover_rate,
         reference_point,
         epoch_length_multiplier=0.5,
-        trim_function=lambda x: x,
+        trim_function=identity,
         fitness_archive=None,
         *args,
         **kwargs
@@ -62,32 +65,28 @@ class SMSEMOA(Driver):
             self.individuals = self.reduce_population(self.individuals + [new_indiv])
 
     def calculate_objectives(self, pop):
-        objectives_cost = 0
-        for p in pop:
-            if (self.fitness_archive is not None) and (p.value in self.fitness_archive):
-                p.objectives = self.fitness_archive[p.value]
-                objectives_cost = 0
-            else:
-                p.objectives = [o(p.value) for o in self.fitnesses]
-                objectives_cost = len(self.population)
-        return objectives_cost
+        results, evaluated = evaluate_individuals(
+            self.fitnesses, [p.value for p in pop], self.fitness_archive, store=False
+        )
+        for p, objectives in zip(pop, results):
+            p.objectives = objectives
+        return len(self.population) if evaluated and evaluated[-1] else 0
 
     def generate(self, pop):
         selected_parents = [x.value for x in random.sample(pop, 2)]
-        child = crossover(
+        child = crossover_population(
             selected_parents[0],
             selected_parents[1],
             self.dims,
             self.crossover_rate,
             self.crossover_eta,
         )
-
-        return Individual(
-            self.trim_function(
-                mutate(child, self.dims, self.mutation_rate, self.mutation_eta)
-            )
+        child = mutate_population(
+            child, self.dims, self.mutation_rate, self.mutation_eta
         )
 
+        return Individual(self.trim_function(child[0].tolist()))
+
     def reduce_population(self, pop):
         sorted_pop = nd_sort(pop)
         worst_front = max(sorted_pop.items(), key=lambda x: x[0])[1]
@@ -99,42 +98,18 @@ class SMSEMOA(Driver):
         return pop
 
     def calculate_hypervolume_contribution(self, pop):
-        hv = HyperVolume(self.reference_point)
-        results = [x.objectives for x in pop]
-
-        hv_global = hv.compute(results)
-
-        return [
-            (pop[i], hv_global - hv.compute(results[:i] + results[i + 1 :]))
-            for i in range(len(results))
-        ]
+        contributions = exclusive_contributions(
+            [x.objectives for x in pop], self.reference_point
+        )
+        return list(zip(pop, contributions))
 
 
 def nd_sort(pop):
-    dominated_by = collections.defaultdict(set)
-    how_many_dominates = collections.defaultdict(int)
-    front = collections.defaultdict(list)
-
-    for x in pop:
-        for y in pop:
-            if ea_utils.dominates(x.objectives, y.objectives):
-                dominated_by[x].add(y)
-            elif ea_utils.dominates(y.objectives, x.objectives):
-                how_many_dominates[x] += 1
-        if how_many_dominates[x] is 0:
-            front[1].append(x)
-    front_no = 1
-    while True:
-        if len(front[front_no]) is 0:
-            break
-        for x in front[front_no]:
-            for y in dominated_by[x]:
-                how_many_dominates[y] -= 1
-                if how_many_dominates[y] is 0:
-                    front[front_no + 1].append(y)
-        front_no += 1
-    del front[front_no]
-    return front
+    fronts = non_dominated_sort([x.objectives for x in pop])
+    return {
+        front_no: [pop[i] for i in front]
+        for front_no, front in enumerate(fronts, start=1)
+    }
 
 
 class Individual:
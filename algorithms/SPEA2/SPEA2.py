@@ -7,10 +7,17 @@
 import math
 import random
 
+import numpy
+
 from algorithms.base.driver import Driver
-from algorithms.base.drivertools import crossover, mutate
-from evotools import ea_utils
-from metrics.metrics_utils import euclid_distance
+from algorithms.base.drivertools import (
+    crossover_population,
+    evaluate_individuals,
+    mutate_population,
+    identity,
+)
+from algorithms.base.population import Population
+from evotools.nondominated import dominance_matrix
 
 
 class SPEA2(Driver):
@@ -18,9 +25,10 @@ class SPEA2(Driver):
         def __init__(self):
             self.tournament_size = 2
 
-        def __call__(self, pool):
-            sub_pool = random.sample(pool, self.tournament_size)
-            return min(sub_pool, key=lambda x: x["fitness"])["value"]
+        def __call__(self, fitness):
+            """ :return: Indeks zwycięzcy turnieju wśród przystosowań `fitness`. """
+            sub_pool = random.sample(range(len(fitness)), self.tournament_size)
+            return min(sub_pool, key=fitness.__getitem__)
 
     def __init__(
         self,
@@ -31,7 +39,7 @@ class SPEA2(Driver):
         mutation_rate,
         crossover_eta,
         crossover_rate,
-        trim_function=lambda x: x,
+        trim_function=identity,
         fitness_archive=None,
         *args,
         **kwargs
@@ -48,156 +56,171 @@ class SPEA2(Driver):
         self.population = [self.trim_function(x) for x in population]
 
         self.__archive_size = len(population)
-        self.archive = []
+        self.archive = Population.from_vectors([], len(dims), len(fitnesses))
         self.select = SPEA2.Tournament()
 
         self.fitness_archive = fitness_archive
 
     @property
     def population(self):
-        return [x["value"] for x in self.individuals]
+        return self.individuals.population
 
     @population.setter
     def population(self, pop):
-        self.individuals = [{"value": x} for x in pop]
+        self.individuals = Population.from_vectors(
+            pop, len(self.dims), len(self.fitnesses)
+        )
 
     def finalized_population(self):
-        return [x["value"] for x in self.archive]
+        return self.archive.population
 
     def finish(self):
-        return [x["value"] for x in self.archive]
+        return self.archive.population
 
     def step(self):
         self.cost += self.calculate_fitnesses(self.individuals, self.archive)
         self.archive = self.environmental_selection(self.individuals, self.archive)
 
-        self.population = [
-            self.trim_function(
-                mutate(
-                    crossover(
-                        self.select(self.archive),
-                        self.select(self.archive),
-                        self.dims,
-                        self.crossover_rate,
-                        self.crossover_eta,
-                    ),
-                    self.dims,
-                    self.mutation_rate,
-                    self.mutation_eta,
-                )
-            )
-            for _ in self.individuals
-        ]
+        fitness = self.archive.fitness
+        parents = numpy.array(
+            [
+                (self.select(fitness), self.select(fitness))
+                for _ in range(len(self.individuals))
+            ]
+        ).reshape(-1, 2)
+        decisions = self.archive.decisions
+        offspring = mutate_population(
+            crossover_population(
+                decisions[parents[:, 0]],
+                decisions[parents[:, 1]],
+                self.dims,
+                self.crossover_rate,
+                self.crossover_eta,
+            ),
+            self.dims,
+            self.mutation_rate,
+            self.mutation_eta,
+        )
+        self.population = [self.trim_function(x) for x in offspring.tolist()]
 
     def calculate_fitnesses(self, population, archive):
         objectives_cost = self.calculate_objectives(population)
-        union = archive + population
-        self.calculate_dominated(union)
-
-        for p in union:
-            raw_fitness = self.calculate_raw_fitness(p, union)
-            density = self.calculate_density(p, union)
-            p["fitness"] = raw_fitness + density
+        objectives = numpy.concatenate([archive.objectives, population.objectives])
+        fitness, self._distances = strength_fitness(objectives)
+        self._distances_objectives = objectives
+        archive.fitness = fitness[: len(archive)]
+        population.fitness = fitness[len(archive) :]
         return objectives_cost
 
-    def calculate_raw_fitness(self, p1, pop):
-        return 0.0 + sum(y["dominates"] for y in pop if self.dominates(y, p1))
-
-    def calculate_density(self, p1, pop):
-        distances = sorted(
-            [self.euclidean_distance(p1["objectives"], p2["objectives"]) for p2 in pop]
-        )
-        k = int(math.sqrt(len(pop)))
-        return 1.0 / (distances[k] + 2.0)
-
     def calculate_objectives(self, pop):
-        objectives_cost = 0
-        for p in pop:
-            if (self.fitness_archive is not None) and (
-                p["value"] in self.fitness_archive
-            ):
-                p["objectives"] = self.fitness_archive[p["value"]]
-                objectives_cost = 0
-            else:
-                p["objectives"] = [o(p["value"]) for o in self.fitnesses]
-                objectives_cost = len(self.population)
-        return objectives_cost
-
-    def calculate_dominated(self, pop):
-        for p in pop:
-            p["dominates"] = len(
-                [x for x in pop if id(p) != id(x) and self.dominates(p, x)]
-            )
-
-    @staticmethod
-    def dominates(p1, p2):
-        return ea_utils.dominates(p1["objectives"], p2["objectives"])
-
-    @staticmethod
-    def euclidean_distance(c1, c2):
-        return euclid_distance(c1, c2)
+        results, evaluated = evaluate_individuals(
+            self.fitnesses, pop.population, self.fitness_archive, store=False
+        )
+        pop.objectives = results
+        return len(self.individuals) if evaluated and evaluated[-1] else 0
 
     def environmental_selection(self, pop, archive):
-        union = archive + pop
-        sorted_union = sorted(union, key=lambda x: x["fitness"])
-        index = self.get_domination_index(sorted_union)
-        environment = sorted_union[:index]
+        union = Population.concat(archive, pop)
+        order = numpy.argsort(union.fitness, kind="stable")
+        index = self.get_domination_index(union.fitness[order])
+        environment = order[:index]
 
         if len(environment) < self.__archive_size:
-            diff_size = self.__archive_size - len(environment)
-            environment += sorted_union[index : index + diff_size]
+            environment = order[: self.__archive_size]
 
         elif len(environment) > self.__archive_size:
-            while len(environment) > self.__archive_size:
-                to_truncate = self.choose_to_truncate(environment)
-                environment.remove(to_truncate)
-
-        return environment
-
-    @staticmethod
-    def get_domination_index(sorted_pop):
-        for i, p in enumerate(sorted_pop):
-            if p["fitness"] > 1:
-                return i
-
-        return len(sorted_pop)
-
-    def choose_to_truncate(self, pop):
-        distances = []
-        for p in pop:
-            distances.append(
-                (
-                    p,
-                    sorted(
-                        [
-                            (
-                                p2,
-                                self.euclidean_distance(
-                                    p["objectives"], p2["objectives"]
-                                ),
-                            )
-                            for p2 in pop
-                        ],
-                        key=lambda x: x[1],
-                    ),
-                )
+            distances = self._union_distances(union)
+            kept = truncate(
+                distances[numpy.ix_(environment, environment)], self.__archive_size
             )
+            environment = environment[kept]
 
-        return self.get_min(distances, 0)[0]
-
-    def get_min(self, distances, level):
-        if level >= len(distances):
-            return distances[0]
+        return union[environment]
 
-        sorted_distances = sorted(distances, key=lambda dist: dist[1][level][1])
-        result = [sorted_distances[0]]
-        for d in sorted_distances[1:]:
-            if d[1][level][1] == result[0][1][level][1]:
-                result.append(d)
-            else:
-                break
+    def _union_distances(self, union):
+        """ :return: Macierz z calculate_fitnesses, o ile policzono ją dla `union`. """
+        cached = getattr(self, "_distances_objectives", None)
+        if cached is not None and numpy.array_equal(cached, union.objectives):
+            return self._distances
+        return distance_matrix(union.objectives)
 
-        if len(result) > 1:
-            return self.get_min(result, level + 1)
-
-        return result[0]
+    @staticmethod
+    def get_domination_index(sorted_fitness):
+        """ :return: Liczba początkowych osobników o przystosowaniu <= 1. """
+        dominated = numpy.flatnonzero(numpy.asarray(sorted_fitness) > 1)
+        return int(dominated[0]) if len(dominated) else len(sorted_fitness)
+
+
+def distance_matrix(objectives) -> "numpy.ndarray":
+    """
+    :return: Macierz odległości euklidesowych między wierszami, co do bitu równa
+        metrics_utils.euclid_distance (kwadraty różnic sumowane po kolei).
+    """
+    objectives = numpy.asarray(objectives, dtype=float)
+    squares = numpy.zeros((len(objectives), len(objectives)))
+    for column in objectives.T:
+        squares += (column[:, numpy.newaxis] - column[numpy.newaxis, :]) ** 2
+    return numpy.sqrt(squares)
+
+
+def strength_fitness(objectives):
+    """
+    Przystosowanie SPEA2: surowe (suma sił dominujących) plus gęstość
+    1 / (d_k + 2), gdzie d_k to odległość do k-tego najbliższego sąsiada
+    (k = floor(sqrt(N)), licząc samego osobnika jako zerowego).
+    :return: Para (przystosowanie, macierz odległości).
+    """
+    dominates = dominance_matrix(objectives)
+    strength = dominates.sum(axis=1)
+    raw = (dominates * strength[:, numpy.newaxis]).sum(axis=0)
+
+    distances = distance_matrix(objectives)
+    k = int(math.sqrt(len(distances)))
+    kth_distance = numpy.partition(distances, k, axis=1)[:, k]
+    return raw + 1.0 / (kth_distance + 2.0), distances
+
+
+def truncate(distances, size) -> "numpy.ndarray":
+    """
+    Obcina zbiór do `size` punktów, usuwając kolejno punkt o leksykograficznie
+    najmniejszym wektorze posortowanych odległości do pozostałych.
+    Najbliższy sąsiad każdego punktu jest pamiętany i liczony od nowa tylko
+    wtedy, gdy właśnie go usunięto; dalsze poziomy porównania liczone są
+    wyłącznie dla punktów remisujących.
+    :param distances: Kwadratowa macierz odległości.
+    :return: Rosnące indeksy pozostawionych punktów.
+    """
+    others = numpy.array(distances, dtype=float)
+    numpy.fill_diagonal(others, numpy.inf)
+    alive = numpy.ones(len(others), dtype=bool)
+    nearest = others.argmin(axis=1)
+    nearest_distance = others[numpy.arange(len(others)), nearest]
+
+    for _ in range(len(others) - size):
+        victim = _most_crowded(others, numpy.flatnonzero(alive), nearest_distance)
+        alive[victim] = False
+        others[:, victim] = numpy.inf
+        stale = numpy.flatnonzero(alive & (nearest == victim))
+        nearest[stale] = others[stale].argmin(axis=1)
+        nearest_distance[stale] = others[stale, nearest[stale]]
+    return numpy.flatnonzero(alive)
+
+
+def _most_crowded(others, candidates, nearest_distance):
+    # Level 0 of every sorted distance list is the distance to itself, so
+    # all candidates tie there. Like the original recursive comparison, the
+    # search stops at the first tied candidate once the level reaches the
+    # number of tied candidates.
+    level = 1
+    while level < len(candidates):
+        if level == 1:
+            values = nearest_distance[candidates]
+        else:
+            values = numpy.partition(others[candidates], level - 1, axis=1)[
+                :, level - 1
+            ]
+        candidates = candidates[values == values.min()]
+        if len(candidates) == 1:
+            break
+        level += 1
+    return candidates[0]
@@ -1,6 +1,7 @@
 from algorithms.HGS.distributed.message import HGSMessageAdapter
 from algorithms.IMGA.message import IMGAMessageAdapter
 from algorithms.base.model import SubPopulation
+from algorithms.base.population import Population
 
 
 class SPEA2IMGAMessageAdapter(IMGAMessageAdapter):
@@ -8,20 +9,11 @@ class SPEA2IMGAMessageAdapter(IMGAMessageAdapter):
         return self.driver.population
 
     def immigrate(self, migrants):
-        self.driver.individuals.extend(migrants)
+        self.driver.individuals = Population.concat(self.driver.individuals, *migrants)
 
     def emigrate(self, migrants: SubPopulation):
-        immigrants_cp = list(migrants)
-        to_remove = []
-
-        for p in self.driver.individuals:
-            if p["value"] in immigrants_cp:
-                to_remove.append(p)
-                immigrants_cp.remove(p["value"])
-
-        for p in to_remove:
-            self.driver.individuals.remove(p)
-        return to_remove
+        self.driver.individuals, emigrants = self.driver.individuals.partition(migrants)
+        return emigrants
 
 
 class SPEA2HGSMessageAdapter(HGSMessageAdapter):
@@ -29,6 +21,6 @@ class SPEA2HGSMessageAdapter(HGSMessageAdapter):
         return self.driver.population
 
     def nominate_delegates(self):
-        return [x["value"] for x in self.driver.archive]
+        return self.driver.archive.population
 
 SPEA2DHGSMessageAdapter = SPEA2HGSMessageAdapter
\ No newline at end of file
@@ -0,0 +1,350 @@
+import bisect
+import operator
+
+import numpy
+
+from evotools.crowding import crowding_gaps
+
+
+class NonDominatedArchive:
+    """
+    Archive of mutually non-dominated solutions kept in an ND-Tree:
+    A. Jaszkiewicz, T. Lust. ND-Tree-based update: a fast algorithm for the
+    dynamic nondominance problem. IEEE Transactions on Evolutionary
+    Computation 22(5), pages 778-791, 2018.
+
+    Every node of the tree knows the ideal and nadir point of the solutions
+    stored below it, so most subtrees are skipped (or accepted as a whole)
+    after a single comparison and an insertion touches only a few leaves.
+
+    For `eta` > 0 the epsilon-dominance of OMOPSO is used: `a` dominates `b`
+    when `b >= a / (1 + eta)` on every objective and `>` on at least one.
+    With `reject_equal` a solution equal to an archived one is not added.
+    """
+
+    class Node:
+        __slots__ = ("parent", "children", "items", "ideal", "nadir")
+
+        def __init__(self, parent=None):
+            self.parent = parent
+            self.children = []
+            self.items = []
+            self.ideal = None
+            self.nadir = None
+
+        def is_leaf(self):
+            return not self.children
+
+    def __init__(
+        self,
+        eta=0.0,
+        key=operator.attrgetter("objectives"),
+        reject_equal=True,
+        max_leaf_size=20,
+        branching=6,
+    ):
+        self.eta = eta
+        self.key = key
+        self.reject_equal = reject_equal
+        self.max_leaf_size = max_leaf_size
+        self.branching = branching
+
+        self.root = None
+        self._leaves = {}
+        self._items = {}
+        self._items_list = None
+
+    # dictionaries keyed by id() of the archived solutions; ids change when
+    # the archive is pickled (e.g. in a driver snapshot), so they are stored
+    # keyed by position in _items and keyed again on unpickling
+    _by_id = ("_items", "_leaves")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        positions = {key: i for i, key in enumerate(self._items)}
+        for name in self._by_id:
+            state[name] = [
+                (positions[key], value) for key, value in state[name].items()
+            ]
+        state["_items"] = [p for _, p in state["_items"]]
+        state["_items_list"] = None
+        return state
+
+    def __setstate__(self, state):
+        items = state["_items"]
+        for name in self._by_id:
+            if name != "_items":
+                state[name] = {id(items[i]): value for i, value in state[name]}
+        state["_items"] = {id(p): p for p in items}
+        self.__dict__.update(state)
+
+    def __iter__(self):
+        return self.archive.__iter__()
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def archive(self):
+        if self._items_list is None:
+            self._items_list = list(self._items.values())
+        return self._items_list
+
+    def add(self, p):
+        point = tuple(self.key(p))
+        if self.root is not None:
+            if self._is_rejected(self.root, point):
+                return False
+            if self._remove_dominated(self.root, point):
+                self.root = None
+        self._insert(point, p)
+        return True
+
+    def remove(self, p):
+        leaf = self._leaves.pop(id(p))
+        leaf.items = [(point, item) for point, item in leaf.items if item is not p]
+        self._forget(p)
+        node = leaf
+        while node is not None:
+            parent = node.parent
+            if node.children or node.items:
+                self._update_box(node)
+            elif parent is None:
+                self.root = None
+            else:
+                parent.children.remove(node)
+            node = parent
+
+    def _dominates(self, a, b):
+        at_least_one = False
+        for a_i, b_i in zip(a, b):
+            if b_i < a_i / (1 + self.eta):
+                return False
+            elif b_i > a_i / (1 + self.eta):
+                at_least_one = True
+        return at_least_one
+
+    def _is_rejected(self, node, point):
+        eta_scale = 1 + self.eta
+        for ideal_i, p_i in zip(node.ideal, point):
+            if min(ideal_i, ideal_i / eta_scale) > p_i:
+                return False
+        scaled_nadir = [x / eta_scale for x in node.nadir]
+        if all(n <= p for n, p in zip(scaled_nadir, point)) and any(
+            n < p for n, p in zip(scaled_nadir, point)
+        ):
+            return True
+        if node.is_leaf():
+            return any(
+                self._dominates(other, point)
+                or (self.reject_equal and other == point)
+                for other, _ in node.items
+            )
+        return any(self._is_rejected(child, point) for child in node.children)
+
+    def _remove_dominated(self, node, point):
+        """ :return: True when the whole node has been emptied. """
+        scaled = [x / (1 + self.eta) for x in point]
+        if any(s > n for s, n in zip(scaled, node.nadir)):
+            return False
+        if all(s <= i for s, i in zip(scaled, node.ideal)) and any(
+            s < i for s, i in zip(scaled, node.ideal)
+        ):
+            self._forget_subtree(node)
+            return True
+
+        if node.is_leaf():
+            kept = []
+            for other, item in node.items:
+                if self._dominates(point, other):
+                    del self._leaves[id(item)]
+                    self._forget(item)
+                else:
+                    kept.append((other, item))
+            if len(kept) == len(node.items):
+                return False
+            node.items = kept
+        else:
+            node.children = [
+                child
+                for child in node.children
+                if not self._remove_dominated(child, point)
+            ]
+            if len(node.children) == 1:
+                self._collapse(node)
+
+        if not node.items and not node.children:
+            return True
+        self._update_box(node)
+        return False
+
+    def _insert(self, point, p):
+        self._items[id(p)] = p
+        self._items_list = None
+        if self.root is None:
+            self.root = NonDominatedArchive.Node()
+        node = self.root
+        while True:
+            self._extend_box(node, point)
+            if node.is_leaf():
+                break
+            node = min(node.children, key=lambda child: _midpoint_distance(child, point))
+        node.items.append((point, p))
+        self._leaves[id(p)] = node
+        if len(node.items) > self.max_leaf_size:
+            self._split(node)
+
+    def _split(self, leaf):
+        points = [point for point, _ in leaf.items]
+        seeds = [max(points, key=lambda point: _sqr_distance(point, leaf.ideal))]
+        while len(seeds) < self.branching:
+            seed = max(
+                points, key=lambda point: min(_sqr_distance(point, s) for s in seeds)
+            )
+            if seed in seeds:
+                break
+            seeds.append(seed)
+        if len(seeds) < 2:
+            # only duplicates left, nothing to separate
+            return
+
+        leaf.children = [NonDominatedArchive.Node(leaf) for _ in seeds]
+        for point, item in leaf.items:
+            child = min(
+                range(len(seeds)), key=lambda i: _sqr_distance(point, seeds[i])
+            )
+            leaf.children[child].items.append((point, item))
+            self._leaves[id(item)] = leaf.children[child]
+        leaf.items = []
+        leaf.children = [child for child in leaf.children if child.items]
+        for child in leaf.children:
+            self._update_box(child)
+
+    def _collapse(self, node):
+        child = node.children[0]
+        node.children = child.children
+        node.items = child.items
+        for grandchild in node.children:
+            grandchild.parent = node
+        for _, item in node.items:
+            self._leaves[id(item)] = node
+
+    def _forget(self, p):
+        del self._items[id(p)]
+        self._items_list = None
+
+    def _forget_subtree(self, node):
+        if node.is_leaf():
+            for _, item in node.items:
+                del self._leaves[id(item)]
+                self._forget(item)
+        else:
+            for child in node.children:
+                self._forget_subtree(child)
+
+    @staticmethod
+    def _extend_box(node, point):
+        if node.ideal is None:
+            node.ideal = list(point)
+            node.nadir = list(point)
+        else:
+            node.ideal = [min(a, b) for a, b in zip(node.ideal, point)]
+            node.nadir = [max(a, b) for a, b in zip(node.nadir, point)]
+
+    @staticmethod
+    def _update_box(node):
+        if node.is_leaf():
+            points = [point for point, _ in node.items]
+        else:
+            points = [child.ideal for child in node.children] + [
+                child.nadir for child in node.children
+            ]
+        node.ideal = [min(column) for column in zip(*points)]
+        node.nadir = [max(column) for column in zip(*points)]
+
+
+class CrowdingArchive(NonDominatedArchive):
+    """
+    Non-dominated archive bounded to `size` solutions. On overflow the most
+    crowded solution (the smallest crowding distance) is dropped.
+
+    Every objective keeps the archived solutions sorted by its value, updated
+    by bisection on each insertion and removal, so the crowding distances
+    are read off the sorted sequences without sorting the archive again.
+    """
+
+    def __init__(self, size, **kwargs):
+        super().__init__(**kwargs)
+        self.size = size
+        self._slots = {}
+        self._free_slots = []
+        self._slot_items = []
+        self._sorted_values = None
+        self._sorted_slots = None
+
+    _by_id = NonDominatedArchive._by_id + ("_slots",)
+
+    def add(self, p):
+        added = super().add(p)
+        if added and len(self) > self.size:
+            self.prune()
+        return added
+
+    def prune(self):
+        slots, distances = self._crowding_distances()
+        self.remove(self._slot_items[slots[numpy.argmin(distances)]])
+
+    def crowding(self):
+        """ Stores the crowding distance of every solution in its crowd_val. """
+        slots, distances = self._crowding_distances()
+        for slot, distance in zip(slots, distances.tolist()):
+            self._slot_items[slot].crowd_val = distance
+
+    def _crowding_distances(self):
+        """ :return: Live slots (in insertion order) and their distances. """
+        if not len(self):
+            return [], numpy.zeros(0)
+        distances = numpy.zeros(len(self._slot_items))
+        for values, slots in zip(self._sorted_values, self._sorted_slots):
+            distances[slots] += crowding_gaps(values)
+        slots = [self._slots[id(p)][0] for p in self.archive]
+        return slots, distances[slots]
+
+    def _insert(self, point, p):
+        super()._insert(point, p)
+        if self._sorted_values is None:
+            self._sorted_values = [[] for _ in point]
+            self._sorted_slots = [[] for _ in point]
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._slot_items[slot] = p
+        else:
+            slot = len(self._slot_items)
+            self._slot_items.append(p)
+        self._slots[id(p)] = slot, point
+        for values, slots, value in zip(self._sorted_values, self._sorted_slots, point):
+            i = bisect.bisect_right(values, value)
+            values.insert(i, value)
+            slots.insert(i, slot)
+
+    def _forget(self, p):
+        super()._forget(p)
+        slot, point = self._slots.pop(id(p))
+        self._slot_items[slot] = None
+        self._free_slots.append(slot)
+        for values, slots, value in zip(self._sorted_values, self._sorted_slots, point):
+            i = bisect.bisect_left(values, value)
+            while slots[i] != slot:
+                i += 1
+            del values[i]
+            del slots[i]
+
+
+def _sqr_distance(xs, ys):
+    return sum((x - y) ** 2 for x, y in zip(xs, ys))
+
+
+def _midpoint_distance(node, point):
+    return sum(
+        ((i + n) / 2 - p) ** 2 for i, n, p in zip(node.ideal, node.nadir, point)
+    )
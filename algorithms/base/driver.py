@@ -1,3 +1,5 @@
+import io
+import pickle
 import threading
 import time
 
@@ -47,6 +49,34 @@ class Driver(object, metaclass=StepCountingDriver):
     def step(self):
         raise NotImplementedError
 
+    def snapshot(self) -> bytes:
+        """
+        :return: Zapisany stan drivera - wszystkie jego atrybuty, razem z
+            pod-driverami (wyspy IMGA, drzewo węzłów HGS), populacjami
+            i archiwami. Driver, którego stanu nie da się zapisać (np. DHGS,
+            trzymający adresy aktorów), zgłasza pickle.PicklingError lub
+            TypeError.
+        """
+        buffer = io.BytesIO()
+        pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+        # odwołania do samego drivera (np. z message_adaptera) zapisywane są
+        # jako referencja, by po restore() wskazywały na ten sam obiekt
+        pickler.persistent_id = lambda obj: SELF_REFERENCE if obj is self else None
+        pickler.dump(self.__dict__)
+        return buffer.getvalue()
+
+    def restore(self, snapshot: bytes):
+        """
+        Przywraca stan zapisany przez snapshot(), również w innym procesie.
+        Driver powinien być utworzony z tą samą konfiguracją co zapisany.
+        """
+        unpickler = pickle.Unpickler(io.BytesIO(snapshot))
+        unpickler.persistent_load = lambda pid: self
+        self.__dict__.update(unpickler.load())
+
+
+SELF_REFERENCE = "driver"
+
 
 class ComplexDriver(Driver):
     def __init__(self, driver_message_adapter_factory, *args, **kwargs):
@@ -81,31 +111,42 @@ class StepsRun(DriverRun):
 
 
 class TimeRun(DriverRun):
-    def __init__(self, step: int, timeout: int):
+    def __init__(self, step: int, timeout: int, on_step=None):
+        """
+        :param on_step: Wywoływana po każdym kroku drivera z tym obiektem,
+            np. do zapisu punktu kontrolnego.
+        """
         self.timeout = timeout
         self.step = step
         self.step_no = 0
         self.time_elapsed = 0
+        self.previous_result = None
+        self.on_step = on_step
 
     def create_job(self, driver: Driver) -> Observable:
         return rx.create(lambda observer, scheduler=None: self._start(driver, observer))
 
     def _start(self, driver: Driver, observer: Observer):
-        previous_result = None
+        # the progress is kept in attributes, so that a run restored from a
+        # checkpoint continues where it was saved
         while self.time_elapsed < self.timeout:
             step_start_time = time.time()
             result = driver.next_step()
             self.time_elapsed += time.time() - step_start_time
             time_elapsed_since_last_emission = self.time_elapsed - (self.step * self.step_no)
-            if previous_result:
+            if self.previous_result:
                 for _ in range(0, int(time_elapsed_since_last_emission // self.step)):
                     self.step_no += 1
                     emission_time = self.step_no * self.step
                     if emission_time <= self.timeout:
                         observer.on_next(
-                            TimeProgressMessage(self.step_no * self.step, previous_result)
+                            TimeProgressMessage(
+                                self.step_no * self.step, self.previous_result
+                            )
                         )
-            previous_result = result
+            self.previous_result = result
+            if self.on_step:
+                self.on_step(self)
 
         observer.on_completed()
 
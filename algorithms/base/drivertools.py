@@ -116,6 +116,145 @@ def get_beta_q(rand, alpha, eta):
     return beta_q
 
 
+def seed_generator(seed=None):
+    """ Ustawia ziarno generatora NumPy używanego przez operatory populacyjne. """
+    global _generator
+    _generator = numpy.random.default_rng(seed)
+
+
+def generator() -> "numpy.random.Generator":
+    """
+    :return: Wspólny generator NumPy operatorów populacyjnych. Jeżeli nie był
+        jawnie zainicjalizowany, ziarno pobierane jest z modułu random, więc
+        random.seed określa również jego strumień liczb.
+    """
+    if _generator is None:
+        seed_generator(random.getrandbits(128))
+    return _generator
+
+
+_generator = None
+
+
+def random_state():
+    """ :return: Stan modułu random i generatora NumPy, np. do punktu kontrolnego. """
+    numpy_state = generator().bit_generator.state
+    return random.getstate(), numpy_state
+
+
+def set_random_state(state):
+    """ Przywraca stan zapisany przez random_state(). """
+    python_state, numpy_state = state
+    random.setstate(python_state)
+    generator().bit_generator.state = numpy_state
+
+
+def identity(x):
+    """
+    Domyślna trim_function: zwraca osobnika bez zmian. W odróżnieniu od
+    lambdy daje się zapisać w punkcie kontrolnym drivera.
+    """
+    return x
+
+
+def _bounds(dims):
+    bounds = numpy.asarray(dims, dtype=float).reshape(-1, 2)
+    return bounds[:, 0], bounds[:, 1]
+
+
+def mutate_population(xs, dims, mutation_rate, eta, rng=None, return_mask=False):
+    """
+    Mutacja wielomianowa całej populacji naraz, z tym samym rozkładem co mutate.
+    :param xs: Macierz (N, D) osobników.
+    :param dims: Ograniczenia [(lb, ub)] każdej ze współrzędnych.
+    :param rng: numpy.random.Generator; domyślnie wspólny generator().
+    :param return_mask: Czy zwrócić również macierz (N, D) zmutowanych genów.
+    :return: Macierz (N, D) potomków.
+    """
+    rng = generator() if rng is None else rng
+    lb, ub = _bounds(dims)
+    xs = numpy.asarray(xs, dtype=float).reshape(-1, len(lb))
+    span = ub - lb
+
+    mask = rng.random(xs.shape) <= mutation_rate
+    rnd = rng.random(xs.shape)
+
+    mut_pow = 1.0 / (eta + 1.0)
+    delta1 = numpy.clip((xs - lb) / (span + EPSILON), 0.0, 1.0)
+    delta2 = numpy.clip((ub - xs) / (span + EPSILON), 0.0, 1.0)
+    lower = rnd <= 0.5
+    val = numpy.where(
+        lower,
+        2.0 * rnd + (1.0 - 2.0 * rnd) * (1.0 - delta1) ** (eta + 1.0),
+        2.0 * (1.0 - rnd) + 2.0 * (rnd - 0.5) * (1.0 - delta2) ** (eta + 1.0),
+    )
+    delta_q = numpy.where(lower, val ** mut_pow - 1.0, 1.0 - val ** mut_pow)
+
+    mutated = numpy.clip(xs + delta_q * span, lb, ub)
+    result = numpy.where(mask, mutated, xs)
+    if return_mask:
+        return result, mask
+    return result
+
+
+def crossover_pairs(xs, ys, dims, crossover_rate, eta, rng=None):
+    """
+    SBX dla par rodziców (xs[i], ys[i]), z tym samym rozkładem co crossover.
+    :param xs, ys: Macierze (N, D) rodziców.
+    :param rng: numpy.random.Generator; domyślnie wspólny generator().
+    :return: (potomkowie A, potomkowie B, wektor (N,): czy para się krzyżowała).
+        Para, która się nie krzyżowała, zwraca kopie rodziców.
+    """
+    rng = generator() if rng is None else rng
+    lb, ub = _bounds(dims)
+    xs = numpy.asarray(xs, dtype=float).reshape(-1, len(lb))
+    ys = numpy.asarray(ys, dtype=float).reshape(-1, len(lb))
+
+    crossed = rng.random(len(xs)) <= crossover_rate
+    genes = rng.random(xs.shape) <= 0.5
+    rand = rng.random(xs.shape)
+    swap = rng.random(xs.shape) > 0.5
+    genes &= crossed[:, numpy.newaxis] & (numpy.abs(xs - ys) > EPSILON)
+
+    y1 = numpy.minimum(xs, ys)
+    y2 = numpy.maximum(xs, ys)
+    distance = y2 - y1 + EPSILON
+    beta_q_a = _beta_q(rand, 1.0 + 2.0 * (y1 - lb) / distance, eta)
+    beta_q_b = _beta_q(rand, 1.0 + 2.0 * (ub - y2) / distance, eta)
+    child_a = numpy.clip(0.5 * ((y1 + y2) - beta_q_a * (y2 - y1)), lb, ub)
+    child_b = numpy.clip(0.5 * ((y1 + y2) + beta_q_b * (y2 - y1)), lb, ub)
+    child_a, child_b = (
+        numpy.where(swap, child_b, child_a),
+        numpy.where(swap, child_a, child_b),
+    )
+
+    return numpy.where(genes, child_a, xs), numpy.where(genes, child_b, ys), crossed
+
+
+def crossover_population(xs, ys, dims, crossover_rate, eta, rng=None):
+    """
+    :return: Macierz (N, D): dla każdej pary rodziców losowo jeden z dwóch
+        potomków crossover_pairs, tak jak w crossover.
+    """
+    rng = generator() if rng is None else rng
+    children_a, children_b, _ = crossover_pairs(xs, ys, dims, crossover_rate, eta, rng)
+    pick_a = rng.random(len(children_a)) < 0.5
+    return numpy.where(pick_a[:, numpy.newaxis], children_a, children_b)
+
+
+def _beta_q(rand, beta, eta):
+    alpha = 2.0 - beta ** -(eta + 1.0)
+    exponent = 1.0 / (eta + 1.0)
+    inner = rand <= 1.0 / alpha
+    # both branches are evaluated, only one of them is valid for each gene
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        return numpy.where(
+            inner,
+            (rand * alpha) ** exponent,
+            (1.0 / (2.0 - rand * alpha)) ** exponent,
+        )
+
+
 def old_crossover(xs, ys):
     return [random.uniform(x, y) for x, y in zip(xs, ys)]
 
@@ -160,6 +299,80 @@ def get_indivs_inorder(self, fitnesses, population):
     """ :return: Iterator: bieżąca populacja posortowana od najlepszych do najgorszych. """
 
     def calc_objective(ind):
-        return [f(ind) for f in fitnesses]
+        return evaluate_vector(fitnesses, ind)
 
     return rank(population, calc_objective)
+
+
+class ProblemFitnesses(list):
+    """
+    Lista funkcji celu problemu, niosąca dodatkowo opcjonalne:
+    - evaluate(x) -> tuple: wszystkie kryteria jednego osobnika w jednym
+      przebiegu, ze współdzielonymi obliczeniami pośrednimi,
+    - evaluate_batch(X: ndarray[N, D]) -> ndarray[N, M]: wektorową ewaluację
+      całej populacji.
+    """
+
+    def __init__(self, fitnesses, evaluate_batch=None, evaluate=None):
+        super().__init__(fitnesses)
+        self.evaluate_batch = evaluate_batch
+        self.evaluate = evaluate
+
+
+def evaluate_vector(fitnesses, x) -> "[float]":
+    """ :return: Wektor wyników osobnika, liczony przez evaluate(x), gdy jest. """
+    evaluate = getattr(fitnesses, "evaluate", None)
+    if evaluate is not None:
+        return list(evaluate(x))
+    return [f(x) for f in fitnesses]
+
+
+def evaluate_population(fitnesses, vectors) -> "[[float]]":
+    """
+    :param fitnesses: Lista funkcji celu, np. ProblemFitnesses.
+    :param vectors: Osobniki do oceny.
+    :return: Wektory wyników kolejnych osobników. Jeżeli lista funkcji celu ma
+        evaluate_batch, populacja liczona jest jedną operacją tablicową;
+        pojedynczy osobnik - przez evaluate_vector.
+    """
+    vectors = list(vectors)
+    evaluate_batch = getattr(fitnesses, "evaluate_batch", None)
+    if evaluate_batch is not None and len(vectors) > 1:
+        return evaluate_batch(numpy.asarray(vectors, dtype=float)).tolist()
+    return [evaluate_vector(fitnesses, x) for x in vectors]
+
+
+def evaluate_individuals(fitnesses, vectors, fitness_archive=None, store=True):
+    """
+    Ocena populacji z pominięciem osobników obecnych w archiwum wyników.
+    :param store: Czy nowe wyniki dopisywać do archiwum; wtedy powtórzone
+        osobniki liczone są tylko raz.
+    :return: (wektory wyników, flagi: czy wynik został policzony na nowo).
+    """
+    vectors = list(vectors)
+    results = [None] * len(vectors)
+    evaluated = [False] * len(vectors)
+    pending = []
+    duplicates = {}
+    for i, vector in enumerate(vectors):
+        if fitness_archive is not None:
+            if vector in fitness_archive:
+                results[i] = fitness_archive[vector]
+                continue
+            if store:
+                key = tuple(vector)
+                if key in duplicates:
+                    duplicates[key].append(i)
+                    continue
+                duplicates[key] = []
+        pending.append(i)
+
+    new_results = evaluate_population(fitnesses, [vectors[i] for i in pending])
+    for i, result in zip(pending, new_results):
+        results[i] = result
+        evaluated[i] = True
+        if fitness_archive is not None and store:
+            fitness_archive[vectors[i]] = result
+            for j in duplicates[tuple(vectors[i])]:
+                results[j] = result
+    return results, evaluated
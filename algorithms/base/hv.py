@@ -15,8 +15,23 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import bisect
+import collections
+
+import numpy
+from scipy.stats import norm
+
+from evotools.nondominated import non_dominated_filter
+
 __author__ = "Simon Wessing"
 
+HypervolumeEstimate = collections.namedtuple(
+    "HypervolumeEstimate", ["value", "lower", "upper", "confidence", "samples"]
+)
+
+# number of sample x point x objective comparisons done at once
+MONTE_CARLO_CHUNK_ELEMENTS = 2 ** 22
+
 # TODO Use global hv after evil branch merge!
 class HyperVolume:
     """
@@ -282,6 +297,282 @@ class MultiList:
                 bounds[i] = node.cargo[i]
 
 
+def hypervolume(front, referencePoint):
+    """Returns the hypervolume dominated by the front (minimization).
+
+    Points that do not weakly dominate the reference point are ignored, as in
+    HyperVolume.compute, and the front does not have to be non-dominated.
+    Two and three objectives are computed by O(n log n) sweeps over the
+    points sorted with NumPy, more objectives by HyperVolume.
+
+    """
+    points = numpy.asarray(front, dtype=float)
+    reference = numpy.asarray(referencePoint, dtype=float)
+    if len(points) == 0:
+        return 0.0
+    points = points[numpy.all(points <= reference, axis=1)]
+    if len(points) == 0:
+        return 0.0
+    dimensions = len(reference)
+    if dimensions == 1:
+        return float(reference[0] - points[:, 0].min())
+    elif dimensions == 2:
+        return _hypervolume2d(points, reference)
+    elif dimensions == 3:
+        return _hypervolume3d(points, reference)
+    return HyperVolume(reference.tolist()).compute(points.tolist())
+
+
+def _hypervolume2d(points, referencePoint):
+    """Every strip between two consecutive values of the first objective is
+    dominated up to the best second objective seen so far.
+
+    """
+    order = numpy.lexsort((points[:, 1], points[:, 0]))
+    xs = points[order, 0]
+    bestY = numpy.minimum.accumulate(points[order, 1])
+    widths = numpy.append(xs[1:], referencePoint[0]) - xs
+    return float(numpy.dot(widths, referencePoint[1] - bestY))
+
+
+def _hypervolume3d(points, referencePoint):
+    """Dimension sweep of Beume et al. (HV3D): slices along the third
+    objective, with the dominated area of the 2-D staircase updated on every
+    insertion by the area the new point adds.
+
+    """
+    order = numpy.lexsort((points[:, 1], points[:, 0], points[:, 2]))
+    refX, refY, refZ = referencePoint.tolist()
+    xs = []
+    ys = []
+    area = 0.0
+    volume = 0.0
+    lastZ = None
+    for x, y, z in points[order].tolist():
+        if lastZ is not None:
+            volume += area * (z - lastZ)
+        lastZ = z
+        pos = bisect.bisect_right(xs, x)
+        if pos > 0 and ys[pos - 1] <= y:
+            continue
+        start = pos - 1 if pos > 0 and xs[pos - 1] == x else pos
+        end = pos
+        while end < len(xs) and ys[end] >= y:
+            end += 1
+        nextX = xs[end] if end < len(xs) else refX
+        previousY = ys[start - 1] if start > 0 else refY
+        covered = 0.0
+        for i in range(start, end):
+            right = xs[i + 1] if i + 1 < end else nextX
+            covered += (right - xs[i]) * (previousY - ys[i])
+        area += (nextX - x) * (previousY - y) - covered
+        xs[start:end] = [x]
+        ys[start:end] = [y]
+    return volume + area * (refZ - lastZ)
+
+
+def hypervolume_monte_carlo(
+    front, referencePoint, samples=100000, confidence=0.95, seed=None, batchSize=65536
+):
+    """Estimates the hypervolume by uniform sampling of the box spanned by the
+    ideal point of the front and the reference point.
+
+    Meant for many objectives, where the exact computation is too slow. Samples
+    are drawn and tested against the non-dominated points in batches; a sample
+    leaves the test as soon as some point dominates it, and the points that
+    dominate the largest boxes are tried first. Returns a HypervolumeEstimate
+    with the estimate and the Wilson score interval for the given confidence.
+    Using the same seed makes estimates of similar fronts directly comparable.
+
+    """
+    points = numpy.asarray(front, dtype=float)
+    reference = numpy.asarray(referencePoint, dtype=float)
+    if len(points) > 0:
+        points = points[numpy.all(points <= reference, axis=1)]
+    if len(points) == 0:
+        return HypervolumeEstimate(0.0, 0.0, 0.0, confidence, 0)
+    points = numpy.unique(points[non_dominated_filter(points)], axis=0)
+    lower = points.min(axis=0)
+    box = reference - lower
+    boxVolume = float(numpy.prod(box))
+    if boxVolume == 0.0:
+        return HypervolumeEstimate(0.0, 0.0, 0.0, confidence, 0)
+    points = points[numpy.argsort(-numpy.prod(reference - points, axis=1))]
+
+    random = numpy.random.RandomState(seed)
+    hits = 0
+    drawn = 0
+    while drawn < samples:
+        batch = min(batchSize, samples - drawn)
+        remaining = lower + random.random_sample((batch, len(reference))) * box
+        start = 0
+        while start < len(points) and len(remaining) > 0:
+            chunk = max(
+                1, MONTE_CARLO_CHUNK_ELEMENTS // (len(remaining) * len(reference))
+            )
+            candidates = points[start : start + chunk]
+            dominated = numpy.any(
+                numpy.all(
+                    candidates[numpy.newaxis, :, :] <= remaining[:, numpy.newaxis, :],
+                    axis=2,
+                ),
+                axis=1,
+            )
+            remaining = remaining[~dominated]
+            start += chunk
+        hits += batch - len(remaining)
+        drawn += batch
+
+    ratio = hits / drawn
+    z = norm.ppf(0.5 + confidence / 2.0)
+    denominator = 1.0 + z * z / drawn
+    center = (ratio + z * z / (2.0 * drawn)) / denominator
+    halfWidth = (
+        z
+        * numpy.sqrt(ratio * (1.0 - ratio) / drawn + z * z / (4.0 * drawn * drawn))
+        / denominator
+    )
+    return HypervolumeEstimate(
+        boxVolume * ratio,
+        boxVolume * max(center - halfWidth, 0.0),
+        boxVolume * min(center + halfWidth, 1.0),
+        confidence,
+        drawn,
+    )
+
+
+def exclusive_contributions(front, referencePoint):
+    """Returns the exclusive hypervolume contribution of every point.
+
+    The contribution of a point is the volume dominated by it and by no other
+    point of the front, i.e. HV(front) - HV(front without the point). Points
+    that do not dominate the reference point and duplicated points contribute
+    nothing. The front is assumed to be mutually non-dominated (apart from
+    duplicates), as is the case for a single front of a non-dominated sort.
+
+    Two objectives are handled by a single sweep in O(n log n), three by the
+    incremental dimension-sweep of HV3D+ / IHSO (contributions of the points
+    on the 2-D staircase are accumulated slice by slice while the points are
+    inserted in the order of the third objective). For more objectives the
+    contributions are obtained from n + 1 hypervolume computations.
+
+    """
+    contributions = numpy.zeros(len(front))
+    if len(front) == 0:
+        return contributions.tolist()
+    points = numpy.asarray(front, dtype=float)
+    reference = numpy.asarray(referencePoint, dtype=float)
+    relevant = numpy.flatnonzero(numpy.all(points <= reference, axis=1))
+    if len(relevant) == 0:
+        return contributions.tolist()
+
+    # duplicates cover each other's volume, so only unique points are swept
+    unique, inverse, counts = numpy.unique(
+        points[relevant], axis=0, return_inverse=True, return_counts=True
+    )
+    dimensions = len(reference)
+    if dimensions == 2:
+        unique_contributions = _contributions2d(unique, reference)
+    elif dimensions == 3:
+        unique_contributions = _contributions3d(unique, reference)
+    else:
+        unique_contributions = _contributionsLeaveOneOut(unique, reference)
+    unique_contributions[counts > 1] = 0.0
+    contributions[relevant] = unique_contributions[inverse.ravel()]
+    return contributions.tolist()
+
+
+def _contributions2d(points, referencePoint):
+    """Points sorted lexicographically form a staircase (the second objective
+    decreases), so the exclusive box of a point is bounded by its neighbours.
+
+    """
+    nextFirst = numpy.append(points[1:, 0], referencePoint[0])
+    previousSecond = numpy.insert(points[:-1, 1], 0, referencePoint[1])
+    return (nextFirst - points[:, 0]) * (previousSecond - points[:, 1])
+
+
+def _contributions3d(points, referencePoint):
+    """Sweeps the points in the order of the third objective.
+
+    The 2-D staircase of the points inserted so far is kept sorted by the first
+    objective. Between two consecutive values of the third objective the
+    exclusive area of every staircase point is constant: it is the box spanned
+    by the point and its neighbours minus the part covered by the points the
+    point has pushed off the staircase (they would reappear without it). An
+    insertion changes only the new point and its two neighbours, so each
+    slice is accounted for in time proportional to the points it touches.
+
+    """
+    order = numpy.lexsort((points[:, 1], points[:, 0], points[:, 2]))
+    contributions = numpy.zeros(len(points))
+    refX, refY, refZ = referencePoint.tolist()
+
+    xs = []
+    ys = []
+    owners = []
+    hidden = {}
+    areas = {}
+    since = {}
+
+    def close(owner, z):
+        contributions[owner] += areas[owner] * (z - since[owner])
+        since[owner] = z
+
+    def setArea(pos):
+        owner = owners[pos]
+        nextX = xs[pos + 1] if pos + 1 < len(xs) else refX
+        previousY = ys[pos - 1] if pos > 0 else refY
+        # the box only shrinks, so points falling out of it can be dropped
+        below = [(x, y) for x, y in hidden[owner] if x < nextX and y < previousY]
+        hidden[owner] = below
+        covered = 0.0
+        for i, (x, y) in enumerate(below):
+            right = below[i + 1][0] if i + 1 < len(below) else nextX
+            covered += (right - x) * (previousY - y)
+        areas[owner] = (nextX - xs[pos]) * (previousY - ys[pos]) - covered
+
+    for idx in order.tolist():
+        x, y, z = points[idx].tolist()
+        pos = bisect.bisect_right(xs, x)
+        if pos > 0 and ys[pos - 1] <= y:
+            # weakly dominated by a point that is already swept
+            continue
+        start = pos - 1 if pos > 0 and xs[pos - 1] == x else pos
+        end = pos
+        while end < len(xs) and ys[end] >= y:
+            end += 1
+        for owner in owners[start:end]:
+            close(owner, z)
+            del areas[owner], hidden[owner]
+        if start > 0:
+            close(owners[start - 1], z)
+        if end < len(xs):
+            close(owners[end], z)
+
+        hidden[idx] = list(zip(xs[start:end], ys[start:end]))
+        xs[start:end] = [x]
+        ys[start:end] = [y]
+        owners[start:end] = [idx]
+        since[idx] = z
+        for neighbour in range(max(start - 1, 0), min(start + 2, len(xs))):
+            setArea(neighbour)
+
+    for owner in owners:
+        close(owner, refZ)
+    return contributions
+
+
+def _contributionsLeaveOneOut(points, referencePoint):
+    total = hypervolume(points, referencePoint)
+    return numpy.array(
+        [
+            total - hypervolume(numpy.delete(points, i, axis=0), referencePoint)
+            for i in range(len(points))
+        ]
+    )
+
+
 if __name__ == "__main__":
 
     # Example:
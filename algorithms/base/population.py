@@ -0,0 +1,226 @@
+import itertools
+
+import numpy
+
+from algorithms.base.drivertools import evaluate_individuals
+
+
+class _Column:
+    """
+    Kolumna populacji. Odczyt zwraca wiersze widoku ze wspólnej tablicy,
+    zapis (pop.rank = ...) trafia do wspólnej tablicy.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, population, owner=None):
+        if population is None:
+            return self
+        return population._storage[self.name][population._index]
+
+    def __set__(self, population, values):
+        population._storage[self.name][population._index] = values
+
+
+class Population:
+    """
+    Populacja przechowywana kolumnowo (struct-of-arrays): zamiast listy
+    obiektów osobników trzyma ciągłe tablice
+    - decisions: (N, D) rozwiązania,
+    - objectives: (N, M) wartości funkcji celu; NaN oznacza osobnika jeszcze
+      nieocenionego,
+    - rank: (N,) numer frontu (od 1; 0 - nieznany),
+    - crowding: (N,) odległość zatłoczenia,
+    - fitness: (N,) przystosowanie (SPEA2),
+    - ids: (N,) identyfikatory osobników, zachowywane przy wybieraniu
+      i łączeniu populacji.
+    Wybranie podzbioru (wycinkiem, tablicą indeksów lub maską) nie kopiuje
+    danych: powstaje widok na te same tablice. Dla wycinków kolumny są
+    widokami numpy; dla tablic indeksów odczyt kolumny daje kopię, więc
+    zmieniać je trzeba przypisaniem całej kolumny (pop.rank = ...).
+    Nową pamięć tworzą dopiero concat, copy i from_vectors.
+    """
+
+    COLUMNS = ("decisions", "objectives", "rank", "crowding", "fitness", "ids")
+
+    decisions = _Column()
+    objectives = _Column()
+    rank = _Column()
+    crowding = _Column()
+    fitness = _Column()
+    ids = _Column()
+
+    _ids = itertools.count()
+
+    def __init__(self, decisions, objectives, **columns):
+        storage = {
+            "decisions": numpy.asarray(decisions, dtype=float),
+            "objectives": numpy.asarray(objectives, dtype=float),
+        }
+        for name in self.COLUMNS[2:]:
+            values = columns.pop(name, None)
+            storage[name] = (
+                self._default(name, storage["decisions"], storage["objectives"])
+                if values is None
+                else numpy.asarray(values)
+            )
+        if columns:
+            raise TypeError("Unknown population columns: {}".format(sorted(columns)))
+        self._storage = storage
+        self._index = slice(None)
+
+    def _default(self, name, decisions, objectives):
+        """ :return: Początkowa zawartość kolumny `name`, gdy jej nie podano. """
+        size = len(decisions)
+        if name == "rank":
+            return numpy.zeros(size, dtype=int)
+        if name == "ids":
+            return self._new_ids(size)
+        return numpy.zeros(size)
+
+    @classmethod
+    def from_vectors(cls, vectors, dims_no, objectives_no) -> "Population":
+        """ :return: Populacja nieocenionych osobników o podanych rozwiązaniach. """
+        decisions = numpy.array(vectors, dtype=float).reshape(-1, dims_no)
+        return cls(decisions, numpy.full((len(decisions), objectives_no), numpy.nan))
+
+    @classmethod
+    def concat(cls, *populations) -> "Population":
+        return cls(
+            **{
+                name: numpy.concatenate([getattr(p, name) for p in populations])
+                for name in cls.COLUMNS
+            }
+        )
+
+    @staticmethod
+    def _new_ids(size):
+        return numpy.fromiter(
+            itertools.islice(Population._ids, size), dtype=int, count=size
+        )
+
+    def _view(self, index) -> "Population":
+        view = object.__new__(type(self))
+        view._storage = self._storage
+        view._index = index
+        return view
+
+    def _rows(self):
+        """ :return: Numery wierszy wspólnych tablic należących do widoku. """
+        if isinstance(self._index, slice):
+            return numpy.arange(len(self._storage["ids"]))[self._index]
+        return self._index
+
+    def __len__(self):
+        if isinstance(self._index, slice):
+            return len(range(len(self._storage["ids"]))[self._index])
+        return len(self._index)
+
+    def __getitem__(self, indices) -> "Population":
+        """ :param indices: Tablica indeksów, maska lub wycinek. """
+        if isinstance(indices, slice) and isinstance(self._index, slice):
+            rows = range(len(self._storage["ids"]))[self._index][indices]
+            stop = rows.stop if rows.stop >= 0 else None
+            return self._view(slice(rows.start, stop, rows.step))
+        if not isinstance(indices, slice):
+            indices = numpy.asarray(indices)
+            if indices.dtype == bool:
+                indices = numpy.flatnonzero(indices)
+            elif not len(indices):
+                indices = indices.astype(int)
+        return self._view(self._rows()[indices])
+
+    def copy(self) -> "Population":
+        """ :return: Ci sami osobnicy (z tymi samymi ids) we własnej pamięci. """
+        return type(self)(
+            **{name: numpy.array(getattr(self, name)) for name in self.COLUMNS}
+        )
+
+    @property
+    def population(self):
+        """ :return: Rozwiązania jako lista list, tak jak Driver.population. """
+        return self.decisions.tolist()
+
+    @property
+    def evaluated(self):
+        """ :return: Maska osobników o znanych wartościach funkcji celu. """
+        return ~numpy.isnan(self.objectives).any(axis=1)
+
+    def evaluate(self, fitnesses, fitness_archive=None) -> int:
+        """
+        Ocenia osobników o nieznanych wartościach funkcji celu.
+        :return: Liczba faktycznie wykonanych ewaluacji (bez trafień w archiwum).
+        """
+        pending = self[~self.evaluated]
+        if len(pending) == 0:
+            return 0
+        results, evaluated = evaluate_individuals(
+            fitnesses, pending.population, fitness_archive
+        )
+        pending.objectives = results
+        return sum(evaluated)
+
+    def unique(self) -> "Population":
+        """ :return: Populacja bez powtórzeń tych samych osobników (po ids). """
+        _, first = numpy.unique(self.ids, return_index=True)
+        return self[numpy.sort(first)]
+
+    def partition(self, vectors):
+        """
+        Wyjmuje z populacji osobników o podanych rozwiązaniach, po jednym na
+        każde wystąpienie rozwiązania w `vectors`.
+        :return: (pozostali osobnicy, lista jednoosobowych widoków wyjętych).
+        """
+        wanted = list(vectors)
+        taken = []
+        for i, vector in enumerate(self.population):
+            if vector in wanted:
+                taken.append(i)
+                wanted.remove(vector)
+
+        keep = numpy.ones(len(self), dtype=bool)
+        keep[taken] = False
+        return self[keep], [self[[i]] for i in taken]
+
+
+class Swarm(Population):
+    """
+    Populacja cząstek roju (OMOPSO, SMPSO). Poza kolumnami Population:
+    - speed: (N, D) prędkości,
+    - best_decisions, best_objectives: najlepsze dotąd położenie cząstki
+      i jego wartości funkcji celu (NaN - jeszcze nieznane).
+    """
+
+    COLUMNS = Population.COLUMNS + ("speed", "best_decisions", "best_objectives")
+
+    speed = _Column()
+    best_decisions = _Column()
+    best_objectives = _Column()
+
+    def _default(self, name, decisions, objectives):
+        if name == "speed":
+            return numpy.zeros(decisions.shape)
+        if name == "best_decisions":
+            return numpy.full(decisions.shape, numpy.nan)
+        if name == "best_objectives":
+            return numpy.full(objectives.shape, numpy.nan)
+        return super()._default(name, decisions, objectives)
+
+    def leaders(self):
+        """ :return: Kandydaci do archiwów liderów, po jednym na cząstkę. """
+        return [
+            Leader(value, objectives)
+            for value, objectives in zip(self.population, self.objectives.tolist())
+        ]
+
+
+class Leader:
+    """ Kopia położenia cząstki przechowywana w archiwach OMOPSO i SMPSO. """
+
+    __slots__ = ("value", "objectives", "crowd_val")
+
+    def __init__(self, value, objectives, crowd_val=0):
+        self.value = value
+        self.objectives = objectives
+        self.crowd_val = crowd_val
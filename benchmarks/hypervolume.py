@@ -0,0 +1,49 @@
+"""
+Porównanie czasu liczenia hiperobjętości: HyperVolume (lista wielokierunkowa)
+i hv.hypervolume (sortowanie NumPy + zamiatanie) dla frontów 2D i 3D.
+
+    python -m benchmarks.hypervolume
+"""
+import timeit
+
+import numpy
+
+from algorithms.base.hv import HyperVolume, hypervolume
+
+SIZES = [10, 50, 100, 500, 1000, 5000]
+REPEATS = 3
+
+
+def spherical_front(size, dims, rng):
+    points = numpy.abs(rng.normal(size=(size, dims)))
+    return (points / numpy.linalg.norm(points, axis=1, keepdims=True)).tolist()
+
+
+def best_time(fun):
+    timer = timeit.Timer(fun)
+    number, _ = timer.autorange()
+    return min(timer.repeat(REPEATS, number)) / number
+
+
+def main():
+    rng = numpy.random.default_rng(0)
+    print(
+        "{:>4} {:>6} {:>14} {:>14} {:>9}".format(
+            "M", "N", "HyperVolume", "hypervolume", "speedup"
+        )
+    )
+    for dims in [2, 3]:
+        reference_point = [1.1] * dims
+        for size in SIZES:
+            front = spherical_front(size, dims, rng)
+            old = best_time(lambda: HyperVolume(reference_point).compute(front))
+            new = best_time(lambda: hypervolume(front, reference_point))
+            print(
+                "{:>4} {:>6} {:>13.6f}s {:>13.6f}s {:>8.1f}x".format(
+                    dims, size, old, new, old / new
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
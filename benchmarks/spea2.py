@@ -0,0 +1,153 @@
+"""
+Porównanie czasu selekcji środowiskowej SPEA2 (przystosowanie + obcinanie
+archiwum): dotychczasowe listy odległości sortowane przy każdym usunięciu
+i macierz odległości z przyrostowym najbliższym sąsiadem. Suma archiwum
+i populacji to 2N punktów wzajemnie niezdominowanych, obcinanych do N.
+
+    python -m benchmarks.spea2
+"""
+
+import math
+import time
+
+import numpy
+
+from algorithms.SPEA2.SPEA2 import SPEA2
+from algorithms.base.population import Population
+from evotools import ea_utils
+from metrics.metrics_utils import euclid_distance
+
+SIZES = [64, 128, 256, 512, 1024]
+# the list-based truncation is O(N^3 log N), larger sizes take minutes
+LEGACY_MAX_SIZE = 128
+
+
+class LegacySelection:
+    """ Reference: the list-based SPEA2 fitness assignment and truncation. """
+
+    def __init__(self, archive_size):
+        self.archive_size = archive_size
+
+    def calculate_fitnesses(self, union):
+        for p in union:
+            p["dominates"] = len(
+                [x for x in union if id(p) != id(x) and self.dominates(p, x)]
+            )
+        for p in union:
+            raw_fitness = 0.0 + sum(
+                y["dominates"] for y in union if self.dominates(y, p)
+            )
+            distances = sorted(
+                euclid_distance(p["objectives"], p2["objectives"]) for p2 in union
+            )
+            k = int(math.sqrt(len(union)))
+            p["fitness"] = raw_fitness + 1.0 / (distances[k] + 2.0)
+
+    @staticmethod
+    def dominates(p1, p2):
+        return ea_utils.dominates(p1["objectives"], p2["objectives"])
+
+    def environmental_selection(self, union):
+        sorted_union = sorted(union, key=lambda x: x["fitness"])
+        index = SPEA2.get_domination_index([p["fitness"] for p in sorted_union])
+        environment = sorted_union[:index]
+        if len(environment) < self.archive_size:
+            diff_size = self.archive_size - len(environment)
+            environment += sorted_union[index : index + diff_size]
+        while len(environment) > self.archive_size:
+            environment.remove(self.choose_to_truncate(environment))
+        return environment
+
+    def choose_to_truncate(self, pop):
+        distances = [
+            (
+                p,
+                sorted(
+                    [
+                        (p2, euclid_distance(p["objectives"], p2["objectives"]))
+                        for p2 in pop
+                    ],
+                    key=lambda x: x[1],
+                ),
+            )
+            for p in pop
+        ]
+        return self.get_min(distances, 0)[0]
+
+    def get_min(self, distances, level):
+        if level >= len(distances):
+            return distances[0]
+        sorted_distances = sorted(distances, key=lambda dist: dist[1][level][1])
+        result = [
+            d
+            for d in sorted_distances
+            if d[1][level][1] == sorted_distances[0][1][level][1]
+        ]
+        if len(result) > 1:
+            return self.get_min(result, level + 1)
+        return result[0]
+
+
+def spherical_front(size, dims, rng):
+    points = numpy.abs(rng.normal(size=(size, dims)))
+    return (points / numpy.linalg.norm(points, axis=1, keepdims=True)).tolist()
+
+
+def seconds(fun):
+    start = time.perf_counter()
+    result = fun()
+    return time.perf_counter() - start, result
+
+
+def legacy_selection(size, union):
+    legacy = LegacySelection(size)
+    legacy.calculate_fitnesses(union)
+    return legacy.environmental_selection(union)
+
+
+def matrix_selection(size, union):
+    driver = SPEA2(
+        [[0.0]] * size,
+        [],
+        [(0, 1)],
+        mutation_eta=20,
+        mutation_rate=0.1,
+        crossover_eta=15,
+        crossover_rate=0.9,
+    )
+    driver.calculate_objectives = lambda pop: 0
+    union = Population(union, union)
+    driver.calculate_fitnesses(union[size:], union[:size])
+    return driver.environmental_selection(union[size:], union[:size])
+
+
+def main():
+    rng = numpy.random.default_rng(0)
+    print(
+        "{:>4} {:>6} {:>11} {:>11} {:>9}".format(
+            "M", "N", "legacy", "matrix", "speedup"
+        )
+    )
+    for dims in [2, 3]:
+        for size in SIZES:
+            front = spherical_front(2 * size, dims, rng)
+            new, selected = seconds(lambda: matrix_selection(size, front))
+            if size > LEGACY_MAX_SIZE:
+                print(
+                    "{:>4} {:>6} {:>11} {:>10.4f}s {:>9}".format(
+                        dims, size, "-", new, "-"
+                    )
+                )
+                continue
+            legacy_union = [{"value": x, "objectives": x} for x in front]
+            old, expected = seconds(lambda: legacy_selection(size, legacy_union))
+            assert selected.population == [p["value"] for p in expected]
+            print(
+                "{:>4} {:>6} {:>10.4f}s {:>10.4f}s {:>8.1f}x".format(
+                    dims, size, old, new, old / new
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
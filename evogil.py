@@ -15,6 +15,7 @@ Usage:
   evogil.py pictures_summary [options]
   evogil.py best_fronts [options]
   evogil.py violin [options]
+  evogil.py catalog [options]
 
 Commands:
   run
@@ -33,6 +34,9 @@ Commands:
     Some pictures?
   violin
     Plots violin plots?
+  catalog
+    Rebuilds the catalog of results stored in the results directory. Needed
+    for results written by older versions or copied in by hand.
 
 Options:
   -a <algo_name>, --algo <algo_name>       
@@ -73,6 +77,23 @@ Options:
         Directory where simulation results will be stored. If not specified, serialization.RESULTS_DIR is set.
   -o <plots_dir>
         Directory where generated plots will be stored. If not specified, pictures.PLOTS_DIR is set.
+  --checkpoint-interval <seconds>
+        Save the state of each running simulation after every stored result
+        and every <seconds> seconds, so that it can be resumed after a crash.
+        With 0 the state is saved only after stored results.
+        [default: 300]
+  --checkpoint-steps <steps>
+        Save the state of each running simulation every <steps> driver steps.
+  --keep-checkpoints
+        Only for "run budget". Keep the checkpoint of each run after its last
+        budget is stored, so that --resume continues it with larger budgets
+        instead of starting a new run.
+  --resume
+        Only for "run budget". Continue the runs already stored in the results
+        directory instead of starting -N new ones: only missing budgets are
+        computed, from the checkpoint of each run. A run with missing budgets
+        and no checkpoint is left as it is and a new run takes its place (see
+        --keep-checkpoints). Runs with all budgets stored are skipped.
   
 Pictures Summary Options:
   --selected <algo_name>
@@ -92,7 +113,7 @@ import statistic.ranking
 import statistic.stats
 import statistic.summary
 from plots import pictures
-from simulation import run_config, log_helper, factory, serialization
+from simulation import run_config, log_helper, factory, serialization, results_catalog
 from simulation.timing import system_time, log_time
 
 
@@ -126,6 +147,7 @@ def main_worker():
         "violin": plots.violin.violin,
         "summary": statistic.summary.analyse_results,
         "list": all_algos_problems,
+        "catalog": results_catalog.rebuild_catalog,
     }
     set_default_options(argv)
 
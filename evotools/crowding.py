@@ -0,0 +1,58 @@
+import numpy
+
+
+def crowding_distance(objectives, fronts=None) -> "numpy.ndarray":
+    """
+    Odległość zatłoczenia (Deb i in., 2002) liczona osobno w każdym froncie.
+    :param objectives: Macierz (N, M) wartości funkcji celu.
+    :param fronts: Lista tablic indeksów wierszy, np. wynik non_dominated_sort;
+        domyślnie wszystkie wiersze tworzą jeden front.
+    :return: Tablica (N,) odległości. Punkty skrajne frontu w którymkolwiek
+        kryterium mają inf; kryterium o zerowym rozrzucie nic nie wnosi.
+    """
+    objectives = numpy.asarray(objectives, dtype=float)
+    if fronts is None:
+        fronts = [numpy.arange(len(objectives))]
+    fronts = [numpy.asarray(front, dtype=int) for front in fronts if len(front)]
+    distances = numpy.zeros(len(objectives))
+    if not fronts:
+        return distances
+
+    rows = numpy.concatenate(fronts)
+    front_ids = numpy.repeat(numpy.arange(len(fronts)), [len(f) for f in fronts])
+    values = objectives[rows]
+    accumulated = numpy.zeros(len(rows))
+    for m in range(values.shape[1]):
+        # all fronts at once: sorted by the front first, then by the objective
+        order = numpy.lexsort((values[:, m], front_ids))
+        accumulated[order] += crowding_gaps(values[order, m], front_ids[order])
+    distances[rows] = accumulated
+    return distances
+
+
+def crowding_gaps(sorted_values, front_ids=None) -> "numpy.ndarray":
+    """
+    Wkład jednego kryterium do odległości zatłoczenia.
+    :param sorted_values: Wartości kryterium, rosnąco w obrębie każdego frontu.
+    :param front_ids: Numery frontów kolejnych wartości (fronty nie mogą się
+        przeplatać); domyślnie jeden front.
+    :return: Dla punktów skrajnych inf, dla pozostałych odległość sąsiadów
+        podzielona przez rozrzut kryterium w ich froncie.
+    """
+    sorted_values = numpy.asarray(sorted_values, dtype=float)
+    size = len(sorted_values)
+    if front_ids is None:
+        front_ids = numpy.zeros(size, dtype=int)
+    boundary = front_ids[1:] != front_ids[:-1]
+    first = numpy.concatenate([[True], boundary])
+    last = numpy.concatenate([boundary, [True]])
+
+    starts = numpy.flatnonzero(first)
+    spans = sorted_values[last] - sorted_values[first]
+    span = numpy.repeat(spans, numpy.diff(numpy.append(starts, size)))
+
+    gaps = numpy.zeros(size)
+    gaps[1:-1] = sorted_values[2:] - sorted_values[:-2]
+    gaps = numpy.divide(gaps, span, out=numpy.zeros(size), where=span > 0)
+    gaps[first | last] = numpy.inf
+    return gaps
@@ -1,7 +1,8 @@
 # coding=utf-8
 import logging
 import random
-import itertools
+
+from evotools.nondominated import non_dominated_sort
 
 
 def gen_population(count: "Int", dims: "Int") -> "[[Float]]":
@@ -44,43 +45,17 @@ def paretofront_layers(lst, fitfun_res) -> "[[Individual]]":
     """
 
     try:
-        lst_f_doms = [[indiv, fitfun_res(indiv), 0] for indiv in lst]
+        lst_f = [(indiv, fitfun_res(indiv)) for indiv in lst]
     except TypeError:
         # workaround:
         logger = logging.getLogger(__name__)
         logger.error(
             "Wow, this is a bug. Please pass a function, not a list!", stack_info=True
         )
-        lst_f_doms = [[indiv, [f(indiv) for f in fitfun_res], 0] for indiv in lst]
-
-    while len(lst_f_doms) > 0:
-        for i, j in itertools.permutations(lst_f_doms, 2):
-            if dominates(i[1], j[1]):
-                j[2] += 1
-        yield [ind for ind, f_ind, domtd in lst_f_doms if domtd == 0]
-        lst_f_doms = [[ind, f_ind, 0] for ind, f_ind, domtd in lst_f_doms if domtd > 0]
-
-        # No dobra, ten algo jest słaby: jego czas działania to O(k d n^2) dla k-ilości "warstw", n-ilości indywiduów.
-        # Da się lepiej, ale ten margines jest zbyt mały, by... AW FCUK IT!
-        #
-        # Dla d=1 (jednowymiarowego przypadku): po prostu minimum.
-        # Czas: O(n)
-        # Dla d=2:
-        # 1. A_1, ..., A_n posortuj w kolejności leksykograficznej (tj. [1,2] < [1,3] < [2,0] < [2,2] )
-        #   2. i=1
-        #   3. A_i należy do frontu Pareto
-        #   4. znajdź j>i takie, że A_j[2] < A_i[2] (tj. pierwszy następny, którego wartość na indeksie 2 jest lepsza)
-        #   5. jeśli j istnieje: i=j, GOTO 3
-        #   Czas: O(n log n)
-        # Dla d=3,4,5...
-        #   1. A_1, ..., A_n posortuj w kolejności leksykograficznej
-        #   2. Wybierz wszystkie wierzchołki, których pierwsza współrzędna jest najmniejsza
-        #   3. Rekurencyjnie wywołaj się dla tych wierzchołków (przypadek d-1)
-        #   4. Wynik dodaj do frontu pareto.
-        #   5. Dodaj informację o dominacji do d-wymiarowego drzewa przedziałowego   <-- koszt budowy drzewa: O(n (log n)^d)
-        #   6. Znajdź następny, niezdominowany wierzchołek (niezdominowane wierzchołki), GOTO 3
-        #   Czas: O(n (log n)^d) przy założeniu, że k <= (log n)^(d-1) o ile krok 5, tj. jest (d n / log n)
-        #     czyli DUŻO ale nie na tyle, by mi się chciało to pisać.
+        lst_f = [(indiv, [f(indiv) for f in fitfun_res]) for indiv in lst]
+
+    for front in non_dominated_sort([f_ind for _, f_ind in lst_f]):
+        yield [lst_f[i][0] for i in front]
 
 
 def split_front(pareto_front, epsilon):
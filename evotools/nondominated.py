@@ -0,0 +1,216 @@
+import bisect
+
+import numpy
+
+# For three or more objectives the vectorized N x N dominance matrix is the
+# fastest option below this population size; above it its memory footprint
+# grows quadratically and the sorting-based algorithm wins.
+PAIRWISE_SORT_LIMIT = 512
+
+# Leaf size of the divide-and-conquer maxima filter and the number of
+# candidate x dominator pairs compared at once while merging its halves.
+FILTER_BLOCK_SIZE = 256
+FILTER_CHUNK_ELEMENTS = 2 ** 22
+
+
+def non_dominated_sort(objectives) -> "[numpy.ndarray]":
+    """
+    :param objectives: Macierz (N, M) wartości funkcji celu (minimalizacja).
+    :return: Lista frontów [F1, F2, ...]; każdy front to posortowana tablica
+        indeksów wierszy. Punkty równe sobie trafiają do tego samego frontu,
+        tak jak w ea_utils.dominates.
+    """
+    objectives = numpy.asarray(objectives, dtype=float)
+    if objectives.ndim != 2 or len(objectives) == 0:
+        return []
+    if objectives.shape[1] == 2:
+        return _sweep_sort_2d(objectives)
+    if len(objectives) <= PAIRWISE_SORT_LIMIT:
+        return _pairwise_sort(objectives)
+    return _binary_search_sort(objectives)
+
+
+def non_dominated_filter(objectives) -> "numpy.ndarray":
+    """
+    :param objectives: Macierz (N, M) wartości funkcji celu (minimalizacja).
+    :return: Posortowana tablica indeksów wierszy niezdominowanych, czyli
+        pierwszy front. Powtórzenia punktów niezdominowanych są zachowywane.
+    """
+    objectives = numpy.asarray(objectives, dtype=float)
+    if objectives.ndim != 2 or len(objectives) == 0:
+        return numpy.array([], dtype=int)
+    # unique rows come back sorted lexicographically, so from now on a point
+    # can only be dominated by one of the points preceding it
+    points, inverse = numpy.unique(objectives, axis=0, return_inverse=True)
+    dims = points.shape[1]
+    if dims == 1:
+        maxima = numpy.arange(len(points)) == 0
+    elif dims == 2:
+        maxima = _maxima_2d(points)
+    elif dims == 3:
+        maxima = _maxima_3d(points)
+    else:
+        maxima = _maxima_divide_and_conquer(points)
+    return numpy.flatnonzero(maxima[inverse.ravel()])
+
+
+def fronts_to_ranks(fronts, size) -> "numpy.ndarray":
+    """ :return: Tablica rang (od 1) dla każdego z `size` wierszy. """
+    ranks = numpy.zeros(size, dtype=int)
+    for front_no, front in enumerate(fronts, start=1):
+        ranks[front] = front_no
+    return ranks
+
+
+def dominance_matrix(objectives) -> "numpy.ndarray":
+    """ :return: Macierz D taka, że D[i, j] <=> wiersz i dominuje wiersz j. """
+    objectives = numpy.asarray(objectives, dtype=float)
+    a = objectives[:, numpy.newaxis, :]
+    b = objectives[numpy.newaxis, :, :]
+    return numpy.all(a <= b, axis=2) & numpy.any(a < b, axis=2)
+
+
+def _pairwise_sort(objectives):
+    dominates = dominance_matrix(objectives)
+    dominated_count = dominates.sum(axis=0)
+    remaining = numpy.ones(len(objectives), dtype=bool)
+    fronts = []
+    while remaining.any():
+        front = numpy.flatnonzero(remaining & (dominated_count == 0))
+        fronts.append(front)
+        remaining[front] = False
+        dominated_count -= dominates[front].sum(axis=0)
+    return fronts
+
+
+def _lexicographic_order(objectives):
+    # numpy.lexsort uses the last key as the primary one
+    return numpy.lexsort(objectives.T[::-1])
+
+
+def _sweep_sort_2d(objectives):
+    """
+    O(N log N) dla dwóch kryteriów. Po posortowaniu leksykograficznym punkt
+    może być zdominowany tylko przez punkty wcześniejsze, a w obrębie frontu
+    najlepszą drugą współrzędną ma ostatnio dodany punkt - wystarczy więc
+    porównanie z ostatnim elementem frontu i wyszukiwanie binarne po frontach.
+    """
+    order = _lexicographic_order(objectives)
+    rows = objectives.tolist()
+    fronts = []
+    last = []
+    for idx in order.tolist():
+        f1, f2 = rows[idx]
+        lo, hi = 0, len(fronts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            l1, l2 = last[mid]
+            if l2 < f2 or (l2 == f2 and l1 < f1):
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(fronts):
+            fronts.append([])
+            last.append(None)
+        fronts[lo].append(idx)
+        last[lo] = (f1, f2)
+    return [numpy.sort(front) for front in fronts]
+
+
+def _binary_search_sort(objectives):
+    """
+    Efficient Non-dominated Sort z wyszukiwaniem binarnym (Zhang i in., 2015).
+    Punkty przetwarzane są w kolejności leksykograficznej, a sprawdzenie
+    dominacji przez cały front odbywa się wektorowo.
+    """
+    order = _lexicographic_order(objectives)
+    dims = objectives.shape[1]
+    buffers = []
+    sizes = []
+    fronts = []
+
+    def dominated_by(front_no, point):
+        members = buffers[front_no][: sizes[front_no]]
+        return numpy.any(
+            numpy.all(members <= point, axis=1) & numpy.any(members < point, axis=1)
+        )
+
+    for idx in order:
+        point = objectives[idx]
+        lo, hi = 0, len(fronts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if dominated_by(mid, point):
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(fronts):
+            buffers.append(numpy.empty((16, dims)))
+            sizes.append(0)
+            fronts.append([])
+        if sizes[lo] == len(buffers[lo]):
+            buffers[lo] = numpy.concatenate([buffers[lo], numpy.empty_like(buffers[lo])])
+        buffers[lo][sizes[lo]] = point
+        sizes[lo] += 1
+        fronts[lo].append(idx)
+    return [numpy.sort(front) for front in fronts]
+
+
+def _maxima_2d(points):
+    best_before = numpy.concatenate(
+        [[numpy.inf], numpy.minimum.accumulate(points[:-1, 1])]
+    )
+    return points[:, 1] < best_before
+
+
+def _maxima_3d(points):
+    """
+    Algorytm Kunga dla trzech kryteriów: "schodki" niezdominowanych par
+    (f2, f3) trzymane są w listach posortowanych po f2, więc każde zapytanie
+    to jedno wyszukiwanie binarne.
+    """
+    maxima = numpy.zeros(len(points), dtype=bool)
+    stairs_f2 = []
+    stairs_f3 = []
+    for idx, (_, f2, f3) in enumerate(points.tolist()):
+        pos = bisect.bisect_right(stairs_f2, f2)
+        if pos > 0 and stairs_f3[pos - 1] <= f3:
+            continue
+        maxima[idx] = True
+        start = pos - 1 if pos > 0 and stairs_f2[pos - 1] == f2 else pos
+        end = pos
+        while end < len(stairs_f2) and stairs_f3[end] >= f3:
+            end += 1
+        stairs_f2[start:end] = [f2]
+        stairs_f3[start:end] = [f3]
+    return maxima
+
+
+def _maxima_divide_and_conquer(points):
+    if len(points) <= FILTER_BLOCK_SIZE:
+        weakly_dominated = numpy.all(
+            points[:, numpy.newaxis, :] >= points[numpy.newaxis, :, :], axis=2
+        )
+        return ~numpy.tril(weakly_dominated, -1).any(axis=1)
+
+    half = len(points) // 2
+    maxima = numpy.concatenate(
+        [
+            _maxima_divide_and_conquer(points[:half]),
+            _maxima_divide_and_conquer(points[half:]),
+        ]
+    )
+    top = points[numpy.flatnonzero(maxima[:half])]
+    bottom = half + numpy.flatnonzero(maxima[half:])
+    chunk = max(1, FILTER_CHUNK_ELEMENTS // (len(top) * points.shape[1]))
+    for i in range(0, len(bottom), chunk):
+        candidates = bottom[i : i + chunk]
+        dominated = numpy.any(
+            numpy.all(
+                top[numpy.newaxis, :, :] <= points[candidates, numpy.newaxis, :],
+                axis=2,
+            ),
+            axis=1,
+        )
+        maxima[candidates[dominated]] = False
+    return maxima
@@ -1,37 +1,39 @@
+import numpy
+
+
 class Epsilon:
+    """
+    Addytywny wskaźnik epsilon: max po punktach rozwiązania z min po punktach
+    frontu z max po kryteriach różnicy (front - rozwiązanie dla _obj[k] == 0,
+    rozwiązanie - front w przeciwnym razie).
+    Rozwiązanie przetwarzane jest porcjami tak, by macierz różnic miała co
+    najwyżej chunk_size elementów.
+    """
+
+    chunk_size = 2 ** 22
+
     def __init__(self):
         self._dim = 0
         self._obj = []
 
     def epsilon(self, solution, pareto):
-        eps_j = 0.0
-        eps_k = 0.0
-
         self._dim = len(pareto[0])
         self.set_params()
 
-        eps = float("-inf")
+        # for _obj[k] != 0 both sides are negated: -p - (-s) == s - p
+        signs = numpy.where(numpy.asarray(self._obj) == 0, 1.0, -1.0)
+        pareto = numpy.asarray(pareto, dtype=float) * signs
+        solution = numpy.asarray(solution, dtype=float).reshape(-1, self._dim) * signs
 
-        for i in range(len(solution)):
-            for j in range(len(pareto)):
-                for k in range(self._dim):
-                    if self._obj[k] == 0:
-                        eps_temp = pareto[j][k] - solution[i][k]
-                    else:
-                        eps_temp = solution[i][k] - pareto[j][k]
-
-                    if k == 0:
-                        eps_k = eps_temp
-                    elif eps_k < eps_temp:
-                        eps_k = eps_temp
-                if j == 0:
-                    eps_j = eps_k
-                elif eps_j > eps_k:
-                    eps_j = eps_k
-            if i == 0:
-                eps = eps_j
-            elif eps < eps_j:
-                eps = eps_j
+        eps = float("-inf")
+        rows = max(1, self.chunk_size // len(pareto))
+        for start in range(0, len(solution), rows):
+            chunk = solution[start : start + rows]
+            eps_k = numpy.full((len(chunk), len(pareto)), -numpy.inf)
+            for k in range(self._dim):
+                differences = pareto[numpy.newaxis, :, k] - chunk[:, k, numpy.newaxis]
+                numpy.maximum(eps_k, differences, out=eps_k)
+            eps = max(eps, float(eps_k.min(axis=1).max()))
 
         return eps
 
@@ -15,8 +15,8 @@ def filter_not_dominated(solution):
 #
 
 # im mniejszy tym lepszy, jak daleko solution od pareto, zbieznosc
-def generational_distance(solution, not_dominated_solution, pareto):
-    return metrics_utils.generational_distance(not_dominated_solution, pareto)
+def generational_distance(solution, not_dominated_solution, pareto, problem=None):
+    return metrics_utils.generational_distance(not_dominated_solution, pareto, problem)
 
 
 # im mniejszy tym lepszy, jak daleko pareto od solution, zbieznosc + pokrycie calosci
@@ -25,9 +25,9 @@ def inverse_generational_distance(solution, not_dominated_solution, pareto):
 
 
 # im mniejszy tym lepszy, gorsza z wartosci : GD, IGD dla danego rozwiazania
-def average_hausdorff_distance(solution, not_dominated_solution, pareto):
+def average_hausdorff_distance(solution, not_dominated_solution, pareto, problem=None):
     return max(
-        generational_distance(solution, not_dominated_solution, pareto),
+        generational_distance(solution, not_dominated_solution, pareto, problem),
         inverse_generational_distance(solution, not_dominated_solution, pareto),
     )
 
@@ -52,13 +52,27 @@ def non_domination_ratio(solution, not_dominated_solution, pareto):
     return metrics_utils.non_domination_ratio(solution, not_dominated_solution)
 
 
-# im wiekszy tym lepszy, jak duzy hipervolume zdominowany, zbieznosc i pokrycie
-def hypervolume(solution, not_dominated_solution, pareto):
+def hypervolume_reference_point(pareto):
     dims = len(pareto[0])
-    reference_point = [50.0 for _ in range(dims)]
     # TODO kij wie jaki powinien byc -.-
-    hv_instance = hv.HyperVolume(reference_point)
-    return hv_instance.compute(not_dominated_solution)
+    return [50.0 for _ in range(dims)]
+
+
+# im wiekszy tym lepszy, jak duzy hipervolume zdominowany, zbieznosc i pokrycie
+def hypervolume(solution, not_dominated_solution, pareto):
+    reference_point = hypervolume_reference_point(pareto)
+    return hv.hypervolume(not_dominated_solution, reference_point)
+
+
+# jak wyzej, ale estymowany Monte Carlo (wiele kryteriow); zwraca hv.HypervolumeEstimate
+# z przedzialem ufnosci
+def hypervolume_monte_carlo(
+    solution, not_dominated_solution, pareto, samples, confidence=0.95, seed=None
+):
+    reference_point = hypervolume_reference_point(pareto)
+    return hv.hypervolume_monte_carlo(
+        not_dominated_solution, reference_point, samples, confidence, seed
+    )
 
 
 # im wiekszy tym lepszy, jaka czesc niezdominowanych ze wszystkich metod stanowia niezdominowane z podanego rozwiazania
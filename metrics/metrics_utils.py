@@ -2,11 +2,16 @@ import logging
 import math
 
 import numpy as np
+from scipy.spatial import cKDTree
 
-from evotools.ea_utils import dominates
+from evotools.nondominated import non_dominated_filter
 
 EPSILON = np.finfo(float).eps
 
+# KD-trees of the pareto fronts by problem name; a front never changes within
+# a process, so the tree is built once and queried by all results of the problem
+_FRONT_TREES = {}
+
 
 def distance_from_pareto(solution, pareto):
     logger = logging.getLogger(__name__)
@@ -37,12 +42,10 @@ def distribution(solution, sigma=0.5):
 def extent(solution):
     logger = logging.getLogger(__name__)
     logger.debug("extent: input length %d", len(solution))
-    return math.sqrt(
-        sum(
-            max(math.fabs(x[i] - y[i]) for x in solution for y in solution)
-            for i in range(len(solution[0]))
-        )
-    )
+    points = np.asarray(solution, dtype=float).reshape(-1, len(solution[0]))
+    # the largest pairwise difference of a dimension is always max - min
+    ranges = np.fabs(points.max(axis=0) - points.min(axis=0))
+    return math.sqrt(sum(ranges.tolist()))
 
 
 def euclid_distance(xs, ys):
@@ -53,8 +56,14 @@ def euclid_sqr_distance(xs, ys):
     return sum((x - y) ** 2 for x, y in zip(xs, ys))
 
 
-def generational_distance(solution, pareto):
-    return distance(solution, pareto)
+def generational_distance(solution, pareto, problem=None):
+    """
+    :param problem: Nazwa problemu frontu `pareto`; bez niej drzewo KD
+        nie jest zapamiętywane.
+    """
+    if problem is None:
+        return distance(solution, pareto)
+    return distance(solution, pareto, to_tree=front_tree(problem, pareto))
 
 
 def inverse_generational_distance(solution, pareto):
@@ -67,17 +76,9 @@ def non_domination_ratio(solution, not_dominated_solution):
 
 def spacing(solution):
     dims = len(solution[0])
+    points = np.asarray(solution, dtype=float).reshape(-1, dims)
 
-    min_distances = []
-    for i, ind_a in enumerate(solution):
-        distances = []
-        for j, ind_b in enumerate(solution):
-            if not i == j:
-                dist = sum([math.fabs(ind_a[k] - ind_b[k]) for k in range(dims)])
-                distances.append(dist)
-        if len(distances) > 0:
-            min_distances.append(min(distances))
-
+    min_distances = nearest_manhattan_distances(points).tolist()
     if len(min_distances) > 0:
         mean_dist = np.mean(min_distances)
     else:
@@ -86,9 +87,47 @@ def spacing(solution):
     return math.sqrt(dist_sum / (float(len(solution) - 1) + EPSILON))
 
 
-def distance(from_set, to_set):
-    distances = [min([euclid_sqr_distance(f, t) for t in to_set]) for f in from_set]
-    return math.sqrt(sum(distances) / len(distances))
+def nearest_manhattan_distances(points):
+    """
+    :param points: Macierz (N, M).
+    :return: Dla każdego punktu odległość w metryce miejskiej do najbliższego
+        innego punktu (pusta tablica dla N < 2). Drzewo KD wskazuje kandydatów,
+        a odległość do nich liczona jest tak jak w pętli po współrzędnych.
+    """
+    if len(points) < 2:
+        return np.zeros(0)
+    neighbours = min(3, len(points))
+    _, candidates = cKDTree(points).query(points, k=neighbours, p=1)
+    best = np.full(len(points), np.inf)
+    for column in range(neighbours):
+        others = candidates[:, column]
+        distances = np.zeros(len(points))
+        for k in range(points.shape[1]):
+            distances += np.fabs(points[:, k] - points[others, k])
+        # the point itself (or an equal one) may be returned in any column
+        distances[others == np.arange(len(points))] = np.inf
+        np.minimum(best, distances, out=best)
+    return best
+
+
+def distance(from_set, to_set, to_tree=None):
+    """
+    :param to_tree: Gotowe drzewo KD zbioru `to_set`, np. z front_tree.
+    :return: Pierwiastek ze średniego kwadratu odległości punktów `from_set`
+        od najbliższych punktów `to_set`.
+    """
+    if to_tree is None:
+        to_tree = cKDTree(np.asarray(list(to_set), dtype=float))
+    from_points = np.asarray(list(from_set), dtype=float)
+    distances, _ = to_tree.query(from_points.reshape(-1, to_tree.m))
+    return math.sqrt(float(np.dot(distances, distances)) / len(distances))
+
+
+def front_tree(problem, pareto) -> cKDTree:
+    """ :return: Drzewo KD frontu Pareto problemu, budowane raz na cały proces. """
+    if problem not in _FRONT_TREES:
+        _FRONT_TREES[problem] = cKDTree(np.asarray(pareto, dtype=float))
+    return _FRONT_TREES[problem]
 
 
 def pareto_dominance_indicator(solution, not_dominated_solution, all_solutions):
@@ -99,29 +138,13 @@ def pareto_dominance_indicator(solution, not_dominated_solution, all_solutions):
 
 
 def filter_not_dominated2(ind_set):
-    d = {
-        tuple(ind): [not dominates(other_ind, ind) for other_ind in ind_set]
-        for ind in ind_set
-    }
-    result = [ind for ind in d.keys() if all(d[ind])]
-    # for x in result:
-    #     for y in result:
-    #         if dominates(x,y) or dominates(y,x):
-    #             print("co do chuja wacława?!")
-    return result
+    unique = list(dict.fromkeys(tuple(ind) for ind in ind_set))
+    return [unique[i] for i in non_dominated_filter(unique)]
 
 
 def filter_not_dominated(ind_set):
-    not_dominated = []
-    for ind in ind_set:
-        dominated_by_sth = False
-        new_not_dominated = []
-        for nd_ind in not_dominated:
-            if not dominates(ind, nd_ind):
-                new_not_dominated.append(nd_ind)
-            if dominates(nd_ind, ind):
-                dominated_by_sth = True
-        if not dominated_by_sth:
-            new_not_dominated.append(ind)
-        not_dominated = new_not_dominated
-    return not_dominated
+    if not isinstance(ind_set, np.ndarray):
+        ind_set = list(ind_set)
+    if len(ind_set) == 0:
+        return []
+    return [ind_set[i] for i in non_dominated_filter(ind_set)]
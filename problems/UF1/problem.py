@@ -1,5 +1,7 @@
 import math
 
+import numpy
+
 n = 30
 p_no = 150
 emoa_points = [i / (p_no - 1) for i in range(p_no)]
@@ -29,6 +31,31 @@ def fit_2(x):
     return 1 - math.sqrt(x[0]) + base_fit(x, J2)
 
 
+def evaluate(x):
+    # j = 2, 3, ..., n belong alternately to J2 and J1
+    angle = 6 * math.pi * x[0]
+    terms = [
+        (x[j - 1] - math.sin(angle + j * math.pi / n)) ** 2 for j in range(2, n + 1)
+    ]
+    f1 = x[0] + 2 / len(J1) * sum(terms[1::2])
+    f2 = 1 - math.sqrt(x[0]) + 2 / len(J2) * sum(terms[::2])
+    return f1, f2
+
+
+def base_fit_batch(xs, J):
+    J = numpy.array(J)
+    x0 = xs[:, :1]
+    y = xs[:, J - 1] - numpy.sin(6 * math.pi * x0 + J * math.pi / n)
+    return 2 / len(J) * (y ** 2).sum(axis=1)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    f1 = xs[:, 0] + base_fit_batch(xs, J1)
+    f2 = 1 - numpy.sqrt(xs[:, 0]) + base_fit_batch(xs, J2)
+    return numpy.column_stack([f1, f2])
+
+
 name = "UF1"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] + [(-1, 1)] * (n - 1)
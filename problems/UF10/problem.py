@@ -1,6 +1,8 @@
 import math
 import itertools
 
+import numpy
+
 n = 30
 eps = 0.1
 p_no = 150
@@ -47,6 +49,40 @@ def fit_3(x):
     return math.sin(0.5 * x[0] * math.pi) + base_fit(x, J3)
 
 
+def evaluate(x):
+    terms = {}
+    for j in range(3, n + 1):
+        y = yj(x, j)
+        terms[j] = 4 * y ** 2 - math.cos(8 * math.pi * y) + 1
+    base_1, base_2, base_3 = [
+        (2 * sum(terms[j] for j in J)) / len(J) for J in (J1, J2, J3)
+    ]
+    cos_0 = math.cos(0.5 * x[0] * math.pi)
+    return (
+        cos_0 * math.cos(0.5 * x[1] * math.pi) + base_1,
+        cos_0 * math.sin(0.5 * x[1] * math.pi) + base_2,
+        math.sin(0.5 * x[0] * math.pi) + base_3,
+    )
+
+
+def base_fit_batch(xs, J):
+    J = numpy.array(J)
+    x0 = xs[:, :1]
+    x1 = xs[:, 1:2]
+    y = xs[:, J - 1] - 2 * x1 * numpy.sin(2 * math.pi * x0 + (J * math.pi) / n)
+    return (2 * (4 * y ** 2 - numpy.cos(8 * math.pi * y) + 1).sum(axis=1)) / len(J)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    half_x0 = 0.5 * xs[:, 0] * math.pi
+    half_x1 = 0.5 * xs[:, 1] * math.pi
+    f1 = numpy.cos(half_x0) * numpy.cos(half_x1) + base_fit_batch(xs, J1)
+    f2 = numpy.cos(half_x0) * numpy.sin(half_x1) + base_fit_batch(xs, J2)
+    f3 = numpy.sin(half_x0) + base_fit_batch(xs, J3)
+    return numpy.column_stack([f1, f2, f3])
+
+
 name = "UF10"
 fitnesses = [fit_1, fit_2, fit_3]
 dims = [(0, 1)] * 2 + [(-2, 2)] * (n - 2)
@@ -105,6 +105,48 @@ def gen_fit(m):
 
 fitnesses = [gen_fit(m) for m in range(1, f_dims + 1)]
 
+
+def evaluate(x):
+    Z = z(x)
+    z_b = z_bis(Z)
+    g_val = g(Z)
+    up = [
+        (1 + g_val)
+        * base_fit_cos(z_b, m - 1)
+        * (math.sin(z_b[m - 1]) if m < f_dims else 1)
+        + 1
+        for m in range(1, f_dims + 1)
+    ]
+    if all_non_negative(Z):
+        return tuple(up)
+    return tuple(S(z_b, m - 1) * up[m - 1] for m in range(1, f_dims + 1))
+
+
+def evaluate_batch(xs):
+    Z = np.dot(np.asarray(xs, dtype=float), M.T)
+    lambdas_row = np.array(lambdas)
+    z_b = np.where(Z < 0, -lambdas_row * Z, np.where(Z > 1, lambdas_row * Z, Z))
+    g_val = 100 * (
+        Z.shape[1]
+        + ((Z - 0.5) ** 2 - np.cos(20 * math.pi * (Z - 0.5))).sum(axis=1)
+    )
+
+    # column m - 1 holds the factors of the m-th objective
+    ones = np.ones((len(Z), 1))
+    cos_prod = np.hstack(
+        [ones, np.cumprod(np.cos((z_b[:, : f_dims - 1] * math.pi) / 2.0), axis=1)]
+    )
+    sin_term = np.hstack([np.sin(z_b[:, : f_dims - 1]), ones])
+    up = (1 + g_val)[:, np.newaxis] * cos_prod * sin_term + 1
+
+    p_val = np.where(z_b < 0, -z_b, np.where(z_b > 1, z_b - 1, 0))
+    p_sum = np.sqrt(
+        np.hstack([np.zeros_like(ones), np.cumsum(p_val[:, : f_dims - 1] ** 2, axis=1)])
+    )
+    bottom = 2 / (1 + np.exp(-p_sum)) * up
+    return np.where(np.all(Z >= 0, axis=1)[:, np.newaxis], up, bottom)
+
+
 dims = [
     (xmin, xmax)
     for xmin, xmax in zip(
@@ -1,5 +1,7 @@
 import math
 
+import numpy
+
 n = 30
 p_no = 150
 emoa_points = [i / (p_no - 1) for i in range(p_no)]
@@ -40,6 +42,41 @@ def fit_2(x):
     return 1 - math.sqrt(x[0]) + base_fit(x, J2, math.sin)
 
 
+def evaluate(x):
+    # j = 2, 3, ..., n belong alternately to J2 and J1
+    angle = 6 * math.pi * x[0]
+    a = 0.3 * x[0] ** 2
+    b = 0.6 * x[0]
+    terms = [
+        (
+            x[j - 1]
+            - (a * math.cos(24 * math.pi * x[0] + 4 * j * math.pi / n) + b)
+            * (math.cos if j % 2 else math.sin)(angle + j * math.pi / n)
+        )
+        ** 2
+        for j in range(2, n + 1)
+    ]
+    f1 = x[0] + 2 / len(J1) * sum(terms[1::2])
+    f2 = 1 - math.sqrt(x[0]) + 2 / len(J2) * sum(terms[::2])
+    return f1, f2
+
+
+def base_fit_batch(xs, J, trig):
+    J = numpy.array(J)
+    x0 = xs[:, :1]
+    amplitude = 0.3 * x0 ** 2 * numpy.cos(24 * math.pi * x0 + 4 * J * math.pi / n)
+    phase = 6 * math.pi * x0 + J * math.pi / n
+    y = xs[:, J - 1] - (amplitude + 0.6 * x0) * trig(phase)
+    return 2 / len(J) * (y ** 2).sum(axis=1)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    f1 = xs[:, 0] + base_fit_batch(xs, J1, numpy.cos)
+    f2 = 1 - numpy.sqrt(xs[:, 0]) + base_fit_batch(xs, J2, numpy.sin)
+    return numpy.column_stack([f1, f2])
+
+
 name = "UF2"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] + [(-1, 1)] * (n - 1)
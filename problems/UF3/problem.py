@@ -2,6 +2,8 @@ import functools
 import math
 import operator
 
+import numpy
+
 n = 30
 p_no = 150
 emoa_points = [i / (p_no - 1) for i in range(p_no)]
@@ -45,6 +47,51 @@ def fit_2(x):
     return 1 - math.sqrt(x[0]) + base_fit(x, J2)
 
 
+def evaluate(x):
+    # j = 2, 3, ..., n belong alternately to J2 and J1
+    Y = [
+        x[j - 1] - math.pow(x[0], 0.5 * (1.0 + (3 * (j - 2)) / (n - 2)))
+        for j in range(2, n + 1)
+    ]
+
+    def shared_base_fit(ys, J):
+        return (
+            2
+            * (
+                4 * sum(y ** 2 for y in ys)
+                - 2
+                * functools.reduce(
+                    operator.mul,
+                    [
+                        math.cos((20 * y * math.pi) / math.sqrt(j))
+                        for y, j in zip(ys, J)
+                    ],
+                )
+                + 2
+            )
+            / len(J)
+        )
+
+    f1 = x[0] + shared_base_fit(Y[1::2], J1)
+    f2 = 1 - math.sqrt(x[0]) + shared_base_fit(Y[::2], J2)
+    return f1, f2
+
+
+def base_fit_batch(xs, J):
+    J = numpy.array(J)
+    x0 = xs[:, :1]
+    y = xs[:, J - 1] - x0 ** (0.5 * (1.0 + (3 * (J - 2)) / (n - 2)))
+    product = numpy.cos((20 * y * math.pi) / numpy.sqrt(J)).prod(axis=1)
+    return 2 * (4 * (y ** 2).sum(axis=1) - 2 * product + 2) / len(J)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    f1 = xs[:, 0] + base_fit_batch(xs, J1)
+    f2 = 1 - numpy.sqrt(xs[:, 0]) + base_fit_batch(xs, J2)
+    return numpy.column_stack([f1, f2])
+
+
 name = "UF3"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] * n
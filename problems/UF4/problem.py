@@ -2,6 +2,8 @@ import functools
 import math
 import operator
 
+import numpy
+
 n = 30
 p_no = 150
 emoa_points = [i / (p_no - 1) for i in range(p_no)]
@@ -33,6 +35,29 @@ def fit_2(x):
     return 1 - x[0] ** 2 + base_fit(x, J2)
 
 
+def evaluate(x):
+    # j = 2, 3, ..., n belong alternately to J2 and J1
+    angle = 6 * math.pi * x[0]
+    H = [h(x[j - 1] - math.sin(angle + (j * math.pi) / n)) for j in range(2, n + 1)]
+    f1 = x[0] + (2 * sum(H[1::2])) / len(J1)
+    f2 = 1 - x[0] ** 2 + (2 * sum(H[::2])) / len(J2)
+    return f1, f2
+
+
+def base_fit_batch(xs, J):
+    J = numpy.array(J)
+    x0 = xs[:, :1]
+    t = numpy.abs(xs[:, J - 1] - numpy.sin(6 * math.pi * x0 + (J * math.pi) / n))
+    return (2 * (t / (1 + numpy.exp(2 * t))).sum(axis=1)) / len(J)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    f1 = xs[:, 0] + base_fit_batch(xs, J1)
+    f2 = 1 - xs[:, 0] ** 2 + base_fit_batch(xs, J2)
+    return numpy.column_stack([f1, f2])
+
+
 name = "UF4"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] + [(-2, 2)] * (n - 1)
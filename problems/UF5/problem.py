@@ -1,5 +1,7 @@
 import math
 
+import numpy
+
 n = 10
 eps = 0.1
 
@@ -32,6 +34,33 @@ def fit_2(x):
     return 1 - x[0] + base_fit(x, J2)
 
 
+def evaluate(x):
+    # j = 2, 3, ..., n belong alternately to J2 and J1
+    angle = 6 * math.pi * x[0]
+    H = [h(x[j - 1] - math.sin(angle + (j * math.pi) / n)) for j in range(2, n + 1)]
+    shared = (1 / (2 * n) + eps) * math.fabs(math.sin(2 * n * math.pi * x[0]))
+    f1 = x[0] + (shared + (2 * sum(H[1::2])) / len(J1))
+    f2 = 1 - x[0] + (shared + (2 * sum(H[::2])) / len(J2))
+    return f1, f2
+
+
+def base_fit_batch(xs, J):
+    J = numpy.array(J)
+    x0 = xs[:, :1]
+    t = xs[:, J - 1] - numpy.sin(6 * math.pi * x0 + (J * math.pi) / n)
+    h_sum = (2 * t ** 2 - numpy.cos(4 * math.pi * t) + 1).sum(axis=1)
+    return (1 / (2 * n) + eps) * numpy.abs(numpy.sin(2 * n * math.pi * xs[:, 0])) + (
+        2 * h_sum
+    ) / len(J)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    f1 = xs[:, 0] + base_fit_batch(xs, J1)
+    f2 = 1 - xs[:, 0] + base_fit_batch(xs, J2)
+    return numpy.column_stack([f1, f2])
+
+
 name = "UF5"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] + [(-1, 1)] * (n - 1)
@@ -57,6 +57,56 @@ def fit_2(x):
     return 1 - x[0] + base_fit(x, J2)
 
 
+def evaluate(x):
+    # j = 2, 3, ..., n belong alternately to J2 and J1
+    angle = 6 * math.pi * x[0]
+    Y = [x[j - 1] - math.sin(angle + (j * math.pi) / n) for j in range(2, n + 1)]
+    shared = max(0, 2 * (1 / (2 * n) + eps) * math.sin(2 * n * math.pi * x[0]))
+
+    def shared_base_fit(ys, J):
+        return (
+            2
+            * (
+                4 * sum(y ** 2 for y in ys)
+                - 2
+                * functools.reduce(
+                    operator.mul,
+                    [
+                        math.cos((20 * y * math.pi) / math.sqrt(j))
+                        for y, j in zip(ys, J)
+                    ],
+                )
+                + 2
+            )
+            / len(J)
+        )
+
+    f1 = x[0] + (shared + shared_base_fit(Y[1::2], J1))
+    f2 = 1 - x[0] + (shared + shared_base_fit(Y[::2], J2))
+    return f1, f2
+
+
+def base_fit_batch(xs, J):
+    J = numpy.array(J)
+    x0 = xs[:, :1]
+    y = xs[:, J - 1] - numpy.sin(6 * math.pi * x0 + (J * math.pi) / n)
+    product = numpy.cos((20 * y * math.pi) / numpy.sqrt(J)).prod(axis=1)
+    inner = 2 * (4 * (y ** 2).sum(axis=1) - 2 * product + 2) / len(J)
+    return (
+        numpy.maximum(
+            0, 2 * (1 / (2 * n) + eps) * numpy.sin(2 * n * math.pi * xs[:, 0])
+        )
+        + inner
+    )
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    f1 = xs[:, 0] + base_fit_batch(xs, J1)
+    f2 = 1 - xs[:, 0] + base_fit_batch(xs, J2)
+    return numpy.column_stack([f1, f2])
+
+
 name = "UF6"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] + [(-1, 1)] * (n - 1)
@@ -1,5 +1,7 @@
 import math
 
+import numpy
+
 n = 30
 p_no = 150
 emoa_points = [i / (p_no - 1) for i in range(p_no)]
@@ -27,6 +29,33 @@ def fit_2(x):
     return 1 - math.pow(x[0], 0.2) + base_fit(x, J2)
 
 
+def evaluate(x):
+    # j = 2, 3, ..., n belong alternately to J2 and J1
+    angle = 6 * math.pi * x[0]
+    squares = [
+        (x[j - 1] - math.sin(angle + (j * math.pi) / n)) ** 2 for j in range(2, n + 1)
+    ]
+    root = math.pow(x[0], 0.2)
+    f1 = root + (2 * sum(squares[1::2])) / len(J1)
+    f2 = 1 - root + (2 * sum(squares[::2])) / len(J2)
+    return f1, f2
+
+
+def base_fit_batch(xs, J):
+    J = numpy.array(J)
+    x0 = xs[:, :1]
+    y = xs[:, J - 1] - numpy.sin(6 * math.pi * x0 + (J * math.pi) / n)
+    return (2 * (y ** 2).sum(axis=1)) / len(J)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    root = xs[:, 0] ** 0.2
+    f1 = root + base_fit_batch(xs, J1)
+    f2 = 1 - root + base_fit_batch(xs, J2)
+    return numpy.column_stack([f1, f2])
+
+
 name = "UF7"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] + [(-1, 1)] * (n - 1)
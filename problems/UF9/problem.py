@@ -1,6 +1,8 @@
 import math
 import itertools
 
+import numpy
+
 n = 30
 eps = 0.1
 p_no = 150
@@ -47,6 +49,41 @@ def fit_3(x):
     return 1 - x[1] + base_fit(x, J3)
 
 
+def evaluate(x):
+    terms = {
+        j: (x[j - 1] - 2 * x[1] * math.sin(2 * math.pi * x[0] + (j * math.pi) / n)) ** 2
+        for j in range(3, n + 1)
+    }
+    base_1, base_2, base_3 = [
+        (2 * sum(terms[j] for j in J)) / len(J) for J in (J1, J2, J3)
+    ]
+    shape = max(0, (1 + eps) * (1 - 4 * (2 * x[0] - 1) ** 2))
+    return (
+        0.5 * (shape + 2 * x[0]) * x[1] + base_1,
+        0.5 * (shape - 2 * x[0] + 2) * x[1] + base_2,
+        1 - x[1] + base_3,
+    )
+
+
+def base_fit_batch(xs, J):
+    J = numpy.array(J)
+    x0 = xs[:, :1]
+    x1 = xs[:, 1:2]
+    y = xs[:, J - 1] - 2 * x1 * numpy.sin(2 * math.pi * x0 + (J * math.pi) / n)
+    return (2 * (y ** 2).sum(axis=1)) / len(J)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    x0 = xs[:, 0]
+    x1 = xs[:, 1]
+    bump = numpy.maximum(0, (1 + eps) * (1 - 4 * (2 * x0 - 1) ** 2))
+    f1 = 0.5 * (bump + 2 * x0) * x1 + base_fit_batch(xs, J1)
+    f2 = 0.5 * (bump - 2 * x0 + 2) * x1 + base_fit_batch(xs, J2)
+    f3 = 1 - x1 + base_fit_batch(xs, J3)
+    return numpy.column_stack([f1, f2, f3])
+
+
 name = "UF9"
 fitnesses = [fit_1, fit_2, fit_3]
 dims = [(0, 1)] * 2 + [(-2, 2)] * (n - 2)
@@ -1,5 +1,7 @@
 import functools
 
+import numpy
+
 p_no = 150
 emoa_points = [i / (p_no - 1) for i in range(p_no)]
 
@@ -20,6 +22,12 @@ def subfit2(x, f1, g, h):
     return emoa_fitness_2(f1, g, h, x)
 
 
+def emoa_evaluate(x, f1, g, h):
+    y1 = f1(x[0])
+    y = g(x[1:])
+    return y1, y * h(y1, y)
+
+
 def emoa_fitnesses(f1, g, h, dimensions, letter, known_front):
     return (
         [
@@ -45,8 +53,11 @@ def f1b(x):
     return x
 
 
+g_factor = 0.3103448275862069  # 9 / (30-1) = 0.31...
+
+
 def gb(xs):
-    return 1 + 0.3103448275862069 * sum(xs)  # 9 / (30-1) = 0.31...
+    return 1 + g_factor * sum(xs)
 
 
 def hb(f1, g):
@@ -61,3 +72,13 @@ fitnesses, dims, name, pareto_front = emoa_fitnesses(
 )
 
 pareto_front = [[x, y] for x, y in zip(pareto_front[0], pareto_front[1])]
+
+
+evaluate = functools.partial(emoa_evaluate, f1=f1b, g=gb, h=hb)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    f1 = xs[:, 0]
+    g = 1 + g_factor * xs[:, 1:].sum(axis=1)
+    return numpy.column_stack([f1, g * (1 - (f1 / g) ** 2)])
@@ -1,5 +1,8 @@
 import functools
 import math
+
+import numpy
+
 from evotools import ea_utils
 
 p_no = 150
@@ -22,6 +25,12 @@ def subfit2(x, f1, g, h):
     return emoa_fitness_2(f1, g, h, x)
 
 
+def emoa_evaluate(x, f1, g, h):
+    y1 = f1(x[0])
+    y = g(x[1:])
+    return y1, y * h(y1, y)
+
+
 def emoa_fitnesses(f1, g, h, dimensions, letter, known_front):
     return (
         [
@@ -47,8 +56,11 @@ def f1c(x):
     return x
 
 
+g_factor = 0.3103448275862069  # 9 / (30-1) = 0.31...
+
+
 def gc(xs):
-    return 1 + 0.3103448275862069 * sum(xs)  # 9 / (30-1) = 0.31...
+    return 1 + g_factor * sum(xs)
 
 
 def hc(f1, g):
@@ -85,3 +97,15 @@ fitnesses, dims, name, pareto_front = emoa_fitnesses(
 pareto_front = trim_dominated(
     [[x, y] for x, y in zip(pareto_front[0], pareto_front[1])]
 )
+
+
+evaluate = functools.partial(emoa_evaluate, f1=f1c, g=gc, h=hc)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    f1 = xs[:, 0]
+    g = 1 + g_factor * xs[:, 1:].sum(axis=1)
+    f1_g = f1 / g
+    h = 1 - numpy.sqrt(numpy.abs(f1_g)) - f1_g * numpy.sin(10 * math.pi * f1)
+    return numpy.column_stack([f1, g * h])
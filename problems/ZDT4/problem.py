@@ -1,6 +1,8 @@
 import functools
 import math
 
+import numpy
+
 dims = [(-5, 5), (-5, 5), (-5, 5)]
 pareto_set = []
 
@@ -24,6 +26,12 @@ def subfit2(x, f1, g, h):
     return emoa_fitness_2(f1, g, h, x)
 
 
+def emoa_evaluate(x, f1, g, h):
+    y1 = f1(x[0])
+    y = g(x[1:])
+    return y1, y * h(y1, y)
+
+
 def emoa_fitnesses(f1, g, h, dimensions, letter, known_front):
     return (
         [
@@ -68,3 +76,13 @@ fitnesses, dims, name, pareto_front = emoa_fitnesses2(
     f1d, gd, hd, 10, "d", emoa_d_analytical
 )
 pareto_front = [[x, y] for x, y in zip(pareto_front[0], pareto_front[1])]
+
+
+evaluate = functools.partial(emoa_evaluate, f1=f1d, g=gd, h=hd)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    f1 = xs[:, 0]
+    g = 91 + (xs[:, 1:] ** 2 - 10 * numpy.cos(fpi * xs[:, 1:])).sum(axis=1)
+    return numpy.column_stack([f1, g * (1 - numpy.sqrt(numpy.abs(f1 / g)))])
@@ -1,6 +1,8 @@
 import functools
 import math
 
+import numpy
+
 dims = [(-5, 5), (-5, 5), (-5, 5)]
 pareto_set = []
 
@@ -24,6 +26,12 @@ def subfit2(x, f1, g, h):
     return emoa_fitness_2(f1, g, h, x)
 
 
+def emoa_evaluate(x, f1, g, h):
+    y1 = f1(x[0])
+    y = g(x[1:])
+    return y1, y * h(y1, y)
+
+
 def emoa_fitnesses(f1, g, h, dimensions, letter, known_front):
     return (
         [
@@ -47,13 +55,15 @@ def emoa_fitnesses2(f1, g, h, dimensions, letter, known_front):
 
 spi = 6 * math.pi
 
+g_factor = 5.19615  # 9 / 9 ** 0.25 = 5.196...
+
 
 def f1e(x):
     return 1 - math.exp(-4 * x) * (math.sin(spi * x) ** 6)
 
 
 def ge(xs):
-    return 1 + 5.19615 * sum(xs) ** 0.25
+    return 1 + g_factor * sum(xs) ** 0.25
 
 
 def he(f1, g):
@@ -68,3 +78,13 @@ fitnesses, dims, name, pareto_front = emoa_fitnesses(
     f1e, ge, he, 10, "e", emoa_e_analytical
 )
 pareto_front = [[x, y] for x, y in zip(pareto_front[0], pareto_front[1])]
+
+
+evaluate = functools.partial(emoa_evaluate, f1=f1e, g=ge, h=he)
+
+
+def evaluate_batch(xs):
+    xs = numpy.asarray(xs, dtype=float)
+    f1 = 1 - numpy.exp(-4 * xs[:, 0]) * numpy.sin(spi * xs[:, 0]) ** 6
+    g = 1 + g_factor * xs[:, 1:].sum(axis=1) ** 0.25
+    return numpy.column_stack([f1, g * (1 - (f1 / g) ** 2)])
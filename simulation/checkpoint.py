@@ -0,0 +1,95 @@
+import logging
+import pickle
+import time
+from contextlib import suppress
+from pathlib import Path
+
+from algorithms.base import drivertools
+from algorithms.base.driver import Driver
+from simulation.serializer import load_file
+
+CHECKPOINT_NAME = "checkpoint.pickle"
+
+DEFAULT_INTERVAL = 300
+
+
+class Checkpoint:
+    """
+    Saved state of a running simulation case, kept next to its results in
+    <run dir>/checkpoint.pickle: the driver snapshot (see Driver.snapshot),
+    the state of the random generators and the progress of the worker.
+
+    tick() is called after every step of the driver and saves the state once
+    `steps` steps or `interval` seconds have passed since the last save; None
+    or 0 turns the respective condition off. A driver whose state cannot be
+    pickled (e.g. DHGS) turns checkpointing of the case off.
+    """
+
+    def __init__(self, run_path, interval=DEFAULT_INTERVAL, steps=None):
+        self.path = Path(run_path) / CHECKPOINT_NAME
+        self.interval = interval
+        self.steps = steps
+        self.enabled = True
+        self._saved_time = time.time()
+        self._steps = 0
+
+    def exists(self):
+        return self.path.exists()
+
+    def restore(self, driver: Driver):
+        """
+        Restores the driver and the random generators from the checkpoint.
+        :return: Progress saved with the checkpoint, None when there is none.
+        """
+        if not self.exists():
+            return None
+        state = load_file(self.path)
+        driver.restore(state["driver"])
+        drivertools.set_random_state(state["random"])
+        self._reset()
+        return state["progress"]
+
+    def tick(self, driver: Driver, **progress):
+        self._steps += 1
+        if (self.steps and self._steps >= self.steps) or (
+            self.interval and time.time() - self._saved_time >= self.interval
+        ):
+            self.save(driver, **progress)
+
+    def save(self, driver: Driver, **progress):
+        if not self.enabled:
+            return
+        try:
+            state = pickle.dumps(
+                {
+                    "driver": driver.snapshot(),
+                    "random": drivertools.random_state(),
+                    "progress": progress,
+                },
+                pickle.HIGHEST_PROTOCOL,
+            )
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger = logging.getLogger(__name__)
+            logger.warning(
+                "Checkpoints of %s turned off, its state cannot be saved: %s",
+                self.path.parent,
+                e,
+            )
+            self.enabled = False
+            return
+
+        with suppress(FileExistsError):
+            self.path.parent.mkdir(parents=True)
+        # a worker killed while writing leaves the previous checkpoint intact
+        partial_path = self.path.with_suffix(".partial")
+        partial_path.write_bytes(state)
+        partial_path.replace(self.path)
+        self._reset()
+
+    def remove(self):
+        with suppress(FileNotFoundError):
+            self.path.unlink()
+
+    def _reset(self):
+        self._saved_time = time.time()
+        self._steps = 0
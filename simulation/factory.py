@@ -3,11 +3,14 @@ from contextlib import suppress
 from functools import partial
 from importlib import import_module
 from itertools import product
+from pathlib import Path
 from typing import List, Dict, Any
 
+from algorithms.base.drivertools import ProblemFitnesses
 from evotools.ea_utils import gen_population
 from evotools.random_tools import show_partial, show_conf
-from simulation import run_config, serialization, worker
+from simulation import run_config, results_catalog, serialization, worker
+from simulation.checkpoint import CHECKPOINT_NAME
 from simulation.model import SimulationCase
 from simulation.run_config import NotViableConfiguration
 
@@ -19,6 +22,12 @@ TIMEOUT_PARAM = "timeout"
 
 SAMPLING_INTERVAL_PARAM = "sampling_interval"
 
+CHECKPOINT_INTERVAL_PARAM = "checkpoint_interval"
+
+CHECKPOINT_STEPS_PARAM = "checkpoint_steps"
+
+KEEP_CHECKPOINTS_PARAM = "keep_checkpoints"
+
 
 def resolve_configuration(args: Dict[str, str]):
     worker_dict = {
@@ -32,13 +41,106 @@ def resolve_configuration(args: Dict[str, str]):
 
 def create_budget_simulation(args: Dict[str, str]):
     params = {BUDGETS_PARAM: parse_budgets(args)}
-    return worker.BudgetWorker, create_simulation(args, params)
+    params.update(parse_checkpoints(args))
+    simulation_cases = create_simulation(args, params)
+    if args["--resume"]:
+        simulation_cases = resume_budget_simulation(simulation_cases)
+    return worker.BudgetWorker, simulation_cases
+
+
+def resume_budget_simulation(simulation_cases: List[SimulationCase]):
+    """
+    Continues the runs stored in the results directory instead of starting
+    new ones. The stored runs of a problem and algorithm, oldest first, take
+    the places of its -N repetitions: a run with all budgets stored is
+    dropped, one with missing budgets continues from its checkpoint. The
+    repetitions without such a run start new runs.
+
+    A checkpoint cannot go back, so budgets lower than the last one stored
+    in it are reported and left missing.
+    """
+    stored = {}
+    resumed = []
+    for simulation in simulation_cases:
+        if simulation.config not in stored:
+            stored[simulation.config] = continuable_runs(simulation)
+        if not stored[simulation.config]:
+            resumed.append(simulation)
+            continue
+
+        run, budgets, has_checkpoint = stored[simulation.config].pop(0)
+        missing = [b for b in simulation.params[BUDGETS_PARAM] if b not in budgets]
+        if has_checkpoint and budgets:
+            holes = [b for b in missing if b < max(budgets)]
+            missing = [b for b in missing if b > max(budgets)]
+            if holes:
+                logger.warning(
+                    "%s :: %s :: %s: budgets %s precede the stored ones, left missing",
+                    simulation.problem_name,
+                    simulation.algorithm_name,
+                    run,
+                    holes,
+                )
+        if missing:
+            logger.debug("Resuming %s, missing budgets: %s", run, missing)
+            simulation.id = run
+            resumed.append(simulation)
+
+    logger.info(
+        "Resuming: %d of %d simulation cases left to run",
+        len(resumed),
+        len(simulation_cases),
+    )
+    return resumed
+
+
+def continuable_runs(simulation: SimulationCase):
+    """
+    :return: stored_runs without the runs that miss some of the budgets and
+        have no checkpoint (finished runs remove theirs unless
+        --keep-checkpoints is given). Such runs are left as they are, since
+        budgets computed from scratch would come from another trajectory.
+    """
+    runs = []
+    for run, budgets, has_checkpoint in stored_runs(simulation):
+        missing = set(simulation.params[BUDGETS_PARAM]) - budgets
+        if missing and not has_checkpoint:
+            logger.info(
+                "%s :: %s :: %s has no checkpoint to compute %s, not resumed",
+                simulation.problem_name,
+                simulation.algorithm_name,
+                run,
+                sorted(missing),
+            )
+            continue
+        runs.append((run, budgets, has_checkpoint))
+    return runs
+
+
+def stored_runs(simulation: SimulationCase):
+    """
+    :return: Tuples (run, stored budgets, whether it has a checkpoint) of the
+        runs of the simulation's problem and algorithm, oldest first.
+    """
+    catalog = results_catalog.catalog_for(simulation.results_dir)
+    problem, algo = simulation.config
+    runs = {
+        run: {name for name, _ in catalog.results(problem, algo, run)}
+        for run in catalog.runs(problem, algo)
+    }
+    # runs stopped before their first result are known only by a checkpoint
+    algo_path = Path(simulation.results_dir, problem, algo)
+    checkpoints = {p.parent.name for p in algo_path.glob("*/" + CHECKPOINT_NAME)}
+    for run in checkpoints:
+        runs.setdefault(run, set())
+    return [(run, runs[run], run in checkpoints) for run in sorted(runs)]
 
 
 def create_time_bound_simulation(args: Dict[str, str]):
     timeout = int(args["<timeout>"])
     sampling_interval = int(args["<step>"])
     params = {TIMEOUT_PARAM: timeout, SAMPLING_INTERVAL_PARAM: sampling_interval}
+    params.update(parse_checkpoints(args))
     return worker.TimeWorker, create_simulation(args, params)
 
 
@@ -105,6 +207,15 @@ def parse_budgets(args):
     return budgets
 
 
+def parse_checkpoints(args):
+    steps = args["--checkpoint-steps"]
+    return {
+        CHECKPOINT_INTERVAL_PARAM: int(args["--checkpoint-interval"]),
+        CHECKPOINT_STEPS_PARAM: int(steps) if steps else None,
+        KEEP_CHECKPOINTS_PARAM: bool(args["--keep-checkpoints"]),
+    }
+
+
 def prepare(algo: str, problem: str):
     drivers = algo.split("+")
     final_driver, problem_mod = None, None
@@ -335,12 +446,24 @@ def load_algorithm_config(algo: str, config: Dict[str, str]):
 
 
 def load_obligatory_problem_parameters(config: Dict[str, str], problem_mod):
-    update = {"dims": problem_mod.dims, "fitnesses": problem_mod.fitnesses}
+    update = {"dims": problem_mod.dims, "fitnesses": problem_fitnesses(problem_mod)}
     logger.debug("Per-problem config: %s", update)
     config.update(update)
     logger.debug("config: %s", show_conf(config))
 
 
+def problem_fitnesses(problem_mod):
+    """
+    Objectives of the problem, together with its single-pass `evaluate` and
+    vectorized `evaluate_batch` if it defines them.
+    """
+    return ProblemFitnesses(
+        problem_mod.fitnesses,
+        evaluate_batch=getattr(problem_mod, "evaluate_batch", None),
+        evaluate=getattr(problem_mod, "evaluate", None),
+    )
+
+
 def prepare_problem_class(problem: str):
     problem_mod = ".".join(["problems", problem, "problem"])
     problem_mod = import_module(problem_mod)
@@ -0,0 +1,147 @@
+import atexit
+import hashlib
+import pickle
+import sqlite3
+from pathlib import Path
+
+import numpy
+
+STORE_NAME = "metrics.sqlite"
+
+
+class MetricStore:
+    """
+    Cache of metric values of one problem, kept in a single SQLite file in
+    the problem's results directory instead of one pickle per result and
+    metric. Rows are keyed by (algo, run, result, metric, params digest).
+
+    The whole table is read with one query on first use; new values are
+    written in batches of FLUSH_EVERY rows and by flush_all(), which has to
+    be called at the end of every batch of metrics computed in a pool
+    worker: the workers exit without running atexit hooks.
+    """
+
+    FLUSH_EVERY = 1000
+
+    def __init__(self, problem_path):
+        self.path = Path(problem_path) / STORE_NAME
+        self._connection = None
+        self._values = None
+        self._pending = []
+
+    def get(self, key):
+        """ :raises KeyError: When the value has not been stored yet. """
+        return self._load()[key]
+
+    def put(self, key, value):
+        self._load()[key] = value
+        self._pending.append(tuple(key) + (pickle.dumps(value),))
+        if len(self._pending) >= self.FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+        self._pending = []
+
+    def delete_metric(self, metric):
+        self.flush()
+        with self._connect() as connection:
+            connection.execute("DELETE FROM metrics WHERE metric = ?", (metric,))
+        if self._values is not None:
+            self._values = {k: v for k, v in self._values.items() if k[3] != metric}
+
+    def close(self):
+        self.flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            # pool workers of `stats` write to the same file at the same time
+            self._connection = sqlite3.connect(str(self.path), timeout=60)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS metrics ("
+                "algo TEXT, run TEXT, result TEXT, metric TEXT, params TEXT, "
+                "value BLOB, PRIMARY KEY (algo, run, result, metric, params))"
+            )
+        return self._connection
+
+    def _load(self):
+        if self._values is None:
+            rows = self._connect().execute("SELECT * FROM metrics")
+            self._values = {tuple(row[:5]): pickle.loads(row[5]) for row in rows}
+        return self._values
+
+
+_stores = {}
+
+
+def store_for_problem(problem_path) -> MetricStore:
+    """ :return: The store of a problem directory, shared within the process. """
+    problem_path = Path(problem_path).resolve()
+    if problem_path not in _stores:
+        _stores[problem_path] = MetricStore(problem_path)
+    return _stores[problem_path]
+
+
+def result_key(result_path, metric_name, metric_params_digest):
+    """
+    :param result_path: <results>/<problem>/<algo>/<run>/<result>.pickle
+    :param metric_params_digest: See params_digest.
+    :return: Key of the metric of this result in the problem's store.
+    """
+    result_path = Path(result_path)
+    return (
+        result_path.parent.parent.name,
+        result_path.parent.name,
+        result_path.with_suffix("").name,
+        metric_name,
+        metric_params_digest,
+    )
+
+
+def params_digest(params) -> str:
+    """
+    :return: Digest of the metric parameters, independent of set ordering.
+        Digesting a pareto front takes a while, so callers computing many
+        metrics with the same parameters digest them once.
+    """
+    digest = hashlib.sha1()
+    for name in sorted(params):
+        digest.update(repr(name).encode())
+        value_digest = hashlib.sha1(repr(_canonical(params[name])).encode())
+        digest.update(value_digest.hexdigest().encode())
+    return digest.hexdigest()
+
+
+def _canonical(value):
+    if isinstance(value, numpy.ndarray):
+        value = value.tolist()
+    if isinstance(value, dict):
+        return tuple(sorted((repr(k), _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return ("set",) + tuple(sorted((_canonical(v) for v in value), key=repr))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    if isinstance(value, numpy.generic):
+        return value.item()
+    return value
+
+
+def flush_all():
+    """ Writes the pending values of all stores of the process. """
+    for store in _stores.values():
+        store.flush()
+
+
+@atexit.register
+def _close_all():
+    for store in _stores.values():
+        store.close()
@@ -2,7 +2,6 @@ import fnmatch
 import logging
 import os
 import pickle
-import re
 from collections import defaultdict
 from contextlib import suppress
 from functools import partial
@@ -10,111 +9,124 @@ from importlib import import_module
 from pathlib import Path
 from typing import List
 
+import numpy
+
 from metrics import metrics
-from simulation import serializer
+from simulation import metric_store, results_catalog, serializer
+from simulation.metric_store import params_digest
 from simulation.serializer import ResultWithMetadata
 
+# Problems for which the exact hypervolume is too expensive (5 objectives).
+# Their hypervolume is estimated by sampling, with a fixed seed so that all
+# results of a problem are measured on the same samples.
+HYPERVOLUME_ESTIMATORS = {
+    "UF11": {"samples": 10 ** 6, "confidence": 0.95, "seed": 0},
+    "UF12": {"samples": 10 ** 6, "confidence": 0.95, "seed": 0},
+}
+
 
 def yield_metrics(result_list: List[ResultWithMetadata], problem_mod):
     for result in result_list:
         result.non_dominated_fitnesses = metrics.filter_not_dominated(result.fitnesses)
 
+    pareto = problem_mod.pareto_front
+    # params are the same for all results of the problem: digested once
+    front = dict(pareto=pareto, params_digest=params_digest({"pareto": pareto}))
+    hv_estimator = HYPERVOLUME_ESTIMATORS.get(problem_mod.name)
+    hv_digest = front["params_digest"]
+    if hv_estimator is not None:
+        hv_digest = params_digest(dict(hv_estimator, pareto=pareto))
+
     yield "cost", "cost", [
         partial(float, x.additional_data["cost"]) for x in result_list
     ]
     yield "gd", "generational distance", [
-        partial(generational_distance, result=result, pareto=problem_mod.pareto_front)
+        partial(generational_distance, result=result, problem=problem_mod.name, **front)
         for result in result_list
     ]
     yield "igd", "inverse generational distance", [
-        partial(
-            inverse_generational_distance,
-            result=result,
-            pareto=problem_mod.pareto_front,
-        )
+        partial(inverse_generational_distance, result=result, **front)
         for result in result_list
     ]
     yield "ahd", "average hausdorff distance", [
         partial(
-            average_hausdorff_distance, result=result, pareto=problem_mod.pareto_front
+            average_hausdorff_distance, result=result, problem=problem_mod.name, **front
         )
         for result in result_list
     ]
     yield "epsilon", "epsilon", [
-        partial(epsilon, result=result, pareto=problem_mod.pareto_front)
-        for result in result_list
+        partial(epsilon, result=result, **front) for result in result_list
     ]
     yield "extent", "extent", [
-        partial(extent, result=result, pareto=problem_mod.pareto_front)
-        for result in result_list
+        partial(extent, result=result, **front) for result in result_list
     ]
     yield "spacing", "spacing", [
-        partial(spacing, result=result, pareto=problem_mod.pareto_front)
-        for result in result_list
+        partial(spacing, result=result, **front) for result in result_list
     ]
     yield "ndr", "non domination ratio", [
-        partial(non_domination_ratio, result=result, pareto=problem_mod.pareto_front)
-        for result in result_list
+        partial(non_domination_ratio, result=result, **front) for result in result_list
     ]
-    yield "hypervolume", "hypervolume", [
-        partial(hypervolume, result=result, pareto=problem_mod.pareto_front)
+    yield "hypervolume", hypervolume_description(hv_estimator), [
+        partial(
+            hypervolume,
+            result=result,
+            pareto=pareto,
+            estimator=hv_estimator,
+            params_digest=hv_digest,
+        )
         for result in result_list
     ]
     cache = defaultdict(list)
+    digests = {}
     yield "pdi", "pareto dominance indicator", [
-        partial(pareto_dominance_indicator, result=result, cache=cache)
+        partial(pareto_dominance_indicator, result=result, cache=cache, digests=digests)
         for result in result_list
     ]
 
 
 def get_metric(
-    result: ResultWithMetadata, metric_name, metric_mod_name=None, metric_params=None
+    result: ResultWithMetadata,
+    metric_name,
+    metric_mod_name=None,
+    metric_params=None,
+    params_digest=None,
+    metric_kwargs=None,
 ):
+    """
+    :param params_digest: Digest of metric_params, see metric_store.params_digest;
+        computed when not given.
+    :param metric_kwargs: Arguments of the metric function that do not change
+        its value (e.g. the problem name), so they are not a part of the key.
+    """
     logger = logging.getLogger(__name__)
     try:
         if not metric_mod_name:
             metric_mod_name = ["metrics", "metrics"]
         if not metric_params:
             metric_params = {}
+        if params_digest is None:
+            params_digest = metric_store.params_digest(metric_params)
+        if not metric_kwargs:
+            metric_kwargs = {}
+
+        store = metric_store.store_for_problem(result.path.parent.parent.parent)
+        key = metric_store.result_key(result.path, metric_name, params_digest)
+        with suppress(KeyError):
+            return store.get(key)
+
+        try:
+            metric_val = load_legacy_metric(result, metric_name, metric_params)
+        except (FileNotFoundError, KeyError):
+            metric_mod = import_module(".".join(metric_mod_name))
+            metric_fun = getattr(metric_mod, metric_name)
+            metric_val = metric_fun(
+                result.fitnesses,
+                result.non_dominated_fitnesses,
+                **metric_params,
+                **metric_kwargs
+            )
 
-        metric_path = result.path.parent / f"{result.name}.{metric_name}.pickle"
-
-        with suppress(FileNotFoundError):
-            with metric_path.open(mode="rb") as fh:
-                res = pickle.load(fh)
-                metric_val = res["value"]
-                if res["metric"]["params"] != metric_params:
-                    e = Exception(
-                        "You have changed params of the metric. "
-                        "recalculating / per-param storage not implemented"
-                    )
-                    logger.exception(
-                        "Metric params do not match: %s != %s",
-                        res["metric"]["params"],
-                        metric_params,
-                        exc_info=e,
-                    )
-                    raise e
-            return metric_val
-
-        # noinspection PyUnreachableCode
-        metric_mod = import_module(".".join(metric_mod_name))
-        metric_fun = getattr(metric_mod, metric_name)
-        metric_val = metric_fun(
-            result.fitnesses, result.non_dominated_fitnesses, **metric_params
-        )
-
-        with metric_path.open(mode="wb") as fh:
-            pickle_store = {
-                "value": metric_val,
-                "metric": {
-                    "name": metric_name,
-                    "module": metric_mod_name,
-                    "params": metric_params,
-                },
-            }
-            pickle.dump(pickle_store, fh)
-
+        store.put(key, metric_val)
         return metric_val
     except Exception as e:
         logger.exception(
@@ -123,43 +135,109 @@ def get_metric(
         raise e
 
 
-def generational_distance(result: ResultWithMetadata, pareto):
-    return get_metric(result, "generational_distance", metric_params={"pareto": pareto})
+def load_legacy_metric(result: ResultWithMetadata, metric_name, metric_params):
+    """
+    Reads a value cached by older versions in <result>.<metric>.pickle.
+    :raises KeyError: When the file was computed for other params.
+    """
+    metric_path = result.path.parent / f"{result.name}.{metric_name}.pickle"
+    with metric_path.open(mode="rb") as fh:
+        res = pickle.load(fh)
+    if res["metric"]["params"] != metric_params:
+        raise KeyError(metric_name)
+    return res["value"]
+
+
+def generational_distance(
+    result: ResultWithMetadata, pareto, params_digest=None, problem=None
+):
+    return get_metric(
+        result,
+        "generational_distance",
+        metric_params={"pareto": pareto},
+        params_digest=params_digest,
+        metric_kwargs={"problem": problem},
+    )
 
 
-def inverse_generational_distance(result: ResultWithMetadata, pareto):
+def inverse_generational_distance(
+    result: ResultWithMetadata, pareto, params_digest=None
+):
     return get_metric(
-        result, "inverse_generational_distance", metric_params={"pareto": pareto}
+        result,
+        "inverse_generational_distance",
+        metric_params={"pareto": pareto},
+        params_digest=params_digest,
     )
 
 
-def average_hausdorff_distance(result: ResultWithMetadata, pareto):
+def average_hausdorff_distance(
+    result: ResultWithMetadata, pareto, params_digest=None, problem=None
+):
     return get_metric(
-        result, "average_hausdorff_distance", metric_params={"pareto": pareto}
+        result,
+        "average_hausdorff_distance",
+        metric_params={"pareto": pareto},
+        params_digest=params_digest,
+        metric_kwargs={"problem": problem},
     )
 
 
-def epsilon(result: ResultWithMetadata, pareto):
-    return get_metric(result, "epsilon", metric_params={"pareto": pareto})
+def epsilon(result: ResultWithMetadata, pareto, params_digest=None):
+    return get_metric(
+        result, "epsilon", metric_params={"pareto": pareto}, params_digest=params_digest
+    )
+
+
+def extent(result: ResultWithMetadata, pareto, params_digest=None):
+    return get_metric(
+        result, "extent", metric_params={"pareto": pareto}, params_digest=params_digest
+    )
 
 
-def extent(result: ResultWithMetadata, pareto):
-    return get_metric(result, "extent", metric_params={"pareto": pareto})
+def spacing(result: ResultWithMetadata, pareto, params_digest=None):
+    return get_metric(
+        result, "spacing", metric_params={"pareto": pareto}, params_digest=params_digest
+    )
 
 
-def spacing(result: ResultWithMetadata, pareto):
-    return get_metric(result, "spacing", metric_params={"pareto": pareto})
+def non_domination_ratio(result: ResultWithMetadata, pareto, params_digest=None):
+    return get_metric(
+        result,
+        "non_domination_ratio",
+        metric_params={"pareto": pareto},
+        params_digest=params_digest,
+    )
 
 
-def non_domination_ratio(result: ResultWithMetadata, pareto):
-    return get_metric(result, "non_domination_ratio", metric_params={"pareto": pareto})
+def hypervolume(result: ResultWithMetadata, pareto, estimator=None, params_digest=None):
+    if estimator is None:
+        return get_metric(
+            result,
+            "hypervolume",
+            metric_params={"pareto": pareto},
+            params_digest=params_digest,
+        )
+    # the whole estimate, with its confidence interval, is kept in the metric file
+    estimate = get_metric(
+        result,
+        "hypervolume_monte_carlo",
+        metric_params=dict(estimator, pareto=pareto),
+        params_digest=params_digest,
+    )
+    return estimate.value
 
 
-def hypervolume(result: ResultWithMetadata, pareto):
-    return get_metric(result, "hypervolume", metric_params={"pareto": pareto})
+def hypervolume_description(estimator=None):
+    if estimator is None:
+        return "hypervolume"
+    return "hypervolume (monte carlo, {} samples, {:.0%} CI)".format(
+        estimator["samples"], estimator["confidence"]
+    )
 
 
-def pareto_dominance_indicator(result: ResultWithMetadata, cache):
+def pareto_dominance_indicator(result: ResultWithMetadata, cache, digests=None):
+    """ :param digests: Digests of the params by cache key, computed on the way. """
     problem = result.simulation_case.problem_name
     algorithm = result.simulation_case.algorithm_name
     run_no = result.run_no
@@ -168,10 +246,16 @@ def pareto_dominance_indicator(result: ResultWithMetadata, cache):
     try:
         all_solutions = cache[(problem, result.name, run_no)]
         print("cache: " +str(cache))
+        metric_params = {"all_solutions": all_solutions}
+        if digests is None:
+            digests = {}
+        if (problem, result.name, run_no) not in digests:
+            digests[problem, result.name, run_no] = params_digest(metric_params)
         return get_metric(
             result,
             "pareto_dominance_indicator",
-            metric_params={"all_solutions": all_solutions},
+            metric_params=metric_params,
+            params_digest=digests[problem, result.name, run_no],
         )
 
     except KeyError:
@@ -189,30 +273,22 @@ def preload_results_for_problem(cache, problem_path: Path):
     logger = logging.getLogger(__name__)
     problem_name = problem_path.name
     logger.debug("Loading for problem : {}".format(problem_name))
-    for algo_path in problem_path.iterdir():
-        if algo_path.is_dir():
-            runs = [run for run in algo_path.iterdir() if run.is_dir()]
-            for run_no in range(len(runs)):
-                for result_file in runs[run_no].iterdir():
-                    try:
-                        print(result_file)
-                        match = re.fullmatch(
-                            "(?P<name>[0-9]+)\.pickle", result_file.name
-                        )
-
-                        result_name = match.groupdict()["name"]
-                        result = serializer.load_file(result_file)
-
-                        logger.debug(
-                            "Caching for algo: {} ... {}".format(
-                                algo_path.name, (problem_name, result_name, run_no)
-                            )
-                        )
-                        cache[(problem_name, result_name, run_no)].append(
-                            result.fitnesses
-                        )
-                    except (AttributeError, IsADirectoryError):
-                        pass
+    catalog = results_catalog.catalog_for(problem_path.parent)
+    for algo_name in catalog.algorithms(problem_name):
+        for run_no, run in enumerate(catalog.runs(problem_name, algo_name)):
+            for result_name, file_name in catalog.results(problem_name, algo_name, run):
+                result_file = problem_path / algo_name / run / file_name
+                print(result_file)
+                result = serializer.load_result_file(result_file)
+
+                logger.debug(
+                    "Caching for algo: {} ... {}".format(
+                        algo_name, (problem_name, str(result_name), run_no)
+                    )
+                )
+                cache[(problem_name, str(result_name), run_no)].append(
+                    numpy.asarray(result.fitnesses).tolist()
+                )
     filter_non_dominated_in_cache(problem_path, cache)
 
 
@@ -254,6 +330,9 @@ def filter_non_dominated_in_cache(problem_path: Path, cache):
 
 def clear_old_pdi_metrics(problem_path: Path):
     logger = logging.getLogger(__name__)
+    metric_store.store_for_problem(problem_path).delete_metric(
+        "pareto_dominance_indicator"
+    )
 
     for filename in fnmatch.filter(
         [str(p) for p in problem_path.iterdir()], "*{}_*".format(problem_path.name)
@@ -0,0 +1,209 @@
+import logging
+import re
+import sqlite3
+from pathlib import Path
+
+CATALOG_NAME = "catalog.sqlite"
+
+RUN_PATTERN = re.compile(
+    r"(?P<rundate>\d{4}-\d{2}-\d{2}\.\d{6}\.\d{6})__(?P<runid>\d{7})"
+)
+RESULT_PATTERN = re.compile(r"(?P<name>[0-9]+)\.(?P<format>npres|pickle)")
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs ("
+    "problem TEXT, algo TEXT, run TEXT, run_date TEXT, run_id TEXT, "
+    "PRIMARY KEY (problem, algo, run))",
+    "CREATE TABLE IF NOT EXISTS results ("
+    "problem TEXT, algo TEXT, run TEXT, name INTEGER, file TEXT, "
+    "PRIMARY KEY (problem, algo, run, name))",
+    "CREATE TABLE IF NOT EXISTS timings ("
+    "problem TEXT, algo TEXT, budget INTEGER, proc_time REAL)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+# set in the meta table once the tree has been indexed
+INDEXED_KEY = "indexed"
+
+
+class ResultsCatalog:
+    """
+    Index of the runs and their budget/time snapshots under a results
+    directory, kept in <results_dir>/catalog.sqlite. Serializer.store
+    registers every result it writes, so that the results can be listed
+    with a query instead of walking the directory tree.
+
+    The first connection to a catalog that has not been indexed yet (a new
+    file, whoever creates it) indexes the results already on disk, e.g.
+    written by older versions. Trees changed by hand are indexed again with
+    rebuild(). The catalog also keeps the CPU times of finished simulation
+    cases, which rebuild() leaves untouched.
+    """
+
+    def __init__(self, results_dir):
+        self.results_dir = Path(results_dir)
+        self.path = self.results_dir / CATALOG_NAME
+        self._connection = None
+
+    def add(self, problem, algo, run, name, file_name):
+        """ Registers a stored result, together with its run. """
+        match = RUN_PATTERN.fullmatch(run)
+        run_date, run_id = match.groups() if match else (None, None)
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?)",
+                (problem, algo, run, run_date, run_id),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (problem, algo, run, int(name), file_name),
+            )
+
+    def add_timing(self, problem, algo, budget, proc_time):
+        """ Records the CPU time of a simulation case, see scheduler.cost_key. """
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO timings VALUES (?, ?, ?, ?)",
+                (problem, algo, budget, proc_time),
+            )
+
+    def timings(self):
+        """ :return: Pairs ((problem, algo, budget), CPU time) of recorded cases. """
+        rows = self._rows("SELECT problem, algo, budget, proc_time FROM timings")
+        return [(tuple(row[:3]), row[3]) for row in rows]
+
+    def problems(self):
+        return self._column("SELECT DISTINCT problem FROM runs ORDER BY problem")
+
+    def algorithms(self, problem):
+        return self._column(
+            "SELECT DISTINCT algo FROM runs WHERE problem = ? ORDER BY algo",
+            problem,
+        )
+
+    def runs(self, problem, algo):
+        """ :return: Run directory names of the algorithm, in run order. """
+        return self._column(
+            "SELECT run FROM runs WHERE problem = ? AND algo = ? ORDER BY run",
+            problem,
+            algo,
+        )
+
+    def results(self, problem, algo, run):
+        """ :return: Pairs (name, file name) of the run's results, by name. """
+        return self._rows(
+            "SELECT name, file FROM results "
+            "WHERE problem = ? AND algo = ? AND run = ? ORDER BY name",
+            problem,
+            algo,
+            run,
+        )
+
+    def problem_results(self, problem):
+        """ :return: Tuples (algo, run, name, file name) of the problem's results. """
+        return self._rows(
+            "SELECT algo, run, name, file FROM results WHERE problem = ? "
+            "ORDER BY algo, run, name",
+            problem,
+        )
+
+    def rebuild(self):
+        """ Replaces the catalog contents with the results found on disk. """
+        with self._connect(index=False) as connection:
+            return self._index(connection)
+
+    def _index(self, connection):
+        """ :return: Number of results found on disk. """
+        rows = list(_walk(self.results_dir))
+        connection.execute("DELETE FROM runs")
+        connection.execute("DELETE FROM results")
+        for problem, algo, run, name, file_name in rows:
+            match = RUN_PATTERN.fullmatch(run)
+            connection.execute(
+                "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?)",
+                (problem, algo, run) + match.groups(),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (problem, algo, run, name, file_name),
+            )
+        connection.execute(
+            "INSERT OR REPLACE INTO meta VALUES (?, '1')", (INDEXED_KEY,)
+        )
+        return len(rows)
+
+    def _column(self, query, *params):
+        return [row[0] for row in self._rows(query, *params)]
+
+    def _rows(self, query, *params):
+        return self._connect().execute(query, params).fetchall()
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self, index=True):
+        if self._connection is None:
+            # several workers may store results at the same time; within a
+            # process the connection is used by one thread at a time
+            self._connection = sqlite3.connect(
+                str(self.path), timeout=60, check_same_thread=False
+            )
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+            if index:
+                self._index_once()
+        return self._connection
+
+    def _index_once(self):
+        with self._connection as connection:
+            # the other workers wait until the tree is indexed
+            connection.execute("BEGIN IMMEDIATE")
+            indexed = connection.execute(
+                "SELECT 1 FROM meta WHERE key = ?", (INDEXED_KEY,)
+            ).fetchone()
+            if indexed is None:
+                logger = logging.getLogger(__name__)
+                logger.info("Indexing results in %s", self.results_dir)
+                self._index(connection)
+
+
+def _walk(results_dir):
+    """
+    :return: Tuples (problem, algo, run, name, file name) of the results in
+        <results_dir>/<problem>/<algo>/<run>/; when a result is stored in both
+        formats, only the .npres file is listed.
+    """
+    for problem_path in sorted(p for p in results_dir.iterdir() if p.is_dir()):
+        for algo_path in sorted(p for p in problem_path.iterdir() if p.is_dir()):
+            for run_path in sorted(algo_path.iterdir()):
+                if not (run_path.is_dir() and RUN_PATTERN.fullmatch(run_path.name)):
+                    continue
+                files = {}
+                for result_path in sorted(run_path.iterdir()):
+                    match = RESULT_PATTERN.fullmatch(result_path.name)
+                    if match and result_path.is_file():
+                        name = int(match.group("name"))
+                        if match.group("format") == "npres" or name not in files:
+                            files[name] = result_path.name
+                for name, file_name in sorted(files.items()):
+                    run = problem_path.name, algo_path.name, run_path.name
+                    yield run + (name, file_name)
+
+
+_catalogs = {}
+
+
+def catalog_for(results_dir) -> ResultsCatalog:
+    """ :return: The catalog of a results directory, shared within the process. """
+    results_dir = Path(results_dir).resolve()
+    if results_dir not in _catalogs:
+        _catalogs[results_dir] = ResultsCatalog(results_dir)
+    return _catalogs[results_dir]
+
+
+def rebuild_catalog(args):
+    results_dir = args["--dir"]
+    indexed = ResultsCatalog(results_dir).rebuild()
+    print("Indexed {} results in {}".format(indexed, results_dir))
@@ -37,6 +37,10 @@ class NotViableConfiguration(Exception):
 
 sclng_coeffs = [10, 2.5, 1]
 
+# from this many objectives on HGS estimates the hypervolume of its nodes by sampling
+MONTE_CARLO_HYPERVOLUME_MIN_OBJECTIVES = 5
+MONTE_CARLO_HYPERVOLUME_SAMPLES = 100000
+
 algo_base = {
     "IBEA": {"kappa": 0.05, "mating_population_size": 0.5},
     "NSGAII": {"mating_population_size": 0.5},
@@ -89,6 +93,11 @@ def init_alg___HGS(algo_config, problem_mod):
             "crossover_rates": [0.9 for _ in range(3)],
         }
     )
+    if (
+        algo_config.get("hgs_type") == "classic"
+        and len(reference_point) >= MONTE_CARLO_HYPERVOLUME_MIN_OBJECTIVES
+    ):
+        algo_config.update({"hypervolume_samples": MONTE_CARLO_HYPERVOLUME_SAMPLES})
 
 init_alg___DHGS = init_alg___HGS
 
@@ -3,13 +3,14 @@ import logging
 import operator
 import random
 from datetime import datetime
+from pathlib import Path
 
 import rx
 from rx import operators as ops
 from thespian.actors import ActorSystem
 
 from evotools import rxtools
-from simulation import factory, log_helper
+from simulation import factory, log_helper, results_catalog, scheduler
 from simulation.timing import log_time
 from simulation.timing import system_time
 
@@ -18,10 +19,19 @@ logger = logging.getLogger(__name__)
 
 def run_parallel(args):
     worker_factory, simulation_cases = factory.resolve_configuration(args)
+    if not simulation_cases:
+        logger.info("Nothing to run")
+        return
 
     logger.debug("Shuffling the job queue")
+    # cases with equal expected times are run in random order
     random.shuffle(simulation_cases)
 
+    results_dir = Path(factory.resolve_results_dir(args))
+    results_dir.mkdir(parents=True, exist_ok=True)
+    catalog = results_catalog.catalog_for(results_dir)
+    job_queue = scheduler.Scheduler(simulation_cases, catalog.timings())
+
     logger.debug("Creating the pool")
 
     processes_no = int(args["-j"])
@@ -29,33 +39,56 @@ def run_parallel(args):
 
     wall_time = []
     start_time = datetime.now()
-    results = []
+    # results in the order of simulation_cases; None for failed cases
+    results = [None] * len(simulation_cases)
     logger.debug("Simulation cases: %s", simulation_cases)
     logger.debug("Work will be divided into %d processes", processes_no)
 
     sys = ActorSystem("multiprocTCPBase", logDefs=log_helper.EVOGIL_LOG_CONFIG)
 
+    def dispatch():
+        i = job_queue.next_case()
+        simulation_worker = worker_factory(simulation_cases[i], i)
+        return rxtools.from_process(simulation_worker.run).pipe(
+            ops.catch(lambda e, _: report_failure(i, e)),
+            ops.map(lambda subres: (i, subres)),
+        )
+
+    def report_failure(i, e):
+        logger.error("Worker failed: %s", simulation_cases[i], exc_info=e)
+        return rx.of(None)
+
     with log_time(system_time, logger, "Pool evaluated in {time_res}s", out=wall_time):
 
-        def process_result(subres):
-            results.append(subres)
-            log_simulation_stats(start_time, subres[-1], len(simulation_cases))
+        def process_result(indexed_subres):
+            i, subres = indexed_subres
+            results[i] = subres
+            if subres is None:
+                job_queue.finished(i)
+            else:
+                job_queue.finished(i, subres[1])
+                catalog.add_timing(
+                    *scheduler.cost_key(simulation_cases[i]), proc_time=subres[1]
+                )
+            log_simulation_stats(start_time, job_queue.progress())
 
+        # at most processes_no cases are handed to the pool at a time; each
+        # one is chosen when a slot frees up, so that it is the longest one
+        # expected with the times of the cases finished so far
         rx.from_iterable(range(len(simulation_cases))).pipe(
-            ops.map(lambda i: worker_factory(simulation_cases[i], i)),
-            # ops.map(lambda w: rxtools.from_process(w.run)),
-            ops.map(lambda w : w.run()),
-            # ops.merge(max_concurrent=1)
-            ops.do_action(on_next=process_result)
+            ops.map(lambda _: rx.defer(lambda _: dispatch())),
+            ops.merge(max_concurrent=processes_no),
+            ops.do_action(on_next=process_result),
         ).run()
     log_summary(args, results, simulation_cases, wall_time)
     rxtools.shutdown_default_executor()
     sys.shutdown()
 
-def log_simulation_stats(start_time, simulation_id, simultations_count):
+
+def log_simulation_stats(start_time, ratio):
+    """ :param ratio: Part of the batch that is done, see Scheduler.progress. """
     current_time = datetime.now()
     diff_time = current_time - start_time
-    ratio = simulation_id * 1.0 / simultations_count
     try:
         est_delivery_time = start_time + diff_time / ratio
         time_to_delivery = est_delivery_time - current_time
@@ -68,7 +101,9 @@ def log_simulation_stats(start_time, simulation_id, simultations_count):
             est_delivery_time.strftime("%Y-%m-%d %H:%M:%S.%f"),
         )
     except ZeroDivisionError:
-        logging.info("Job queue progress: %.3f%%. Est. finish: unknown yet", ratio)
+        logging.info(
+            "Job queue progress: %.3f%%. Est. finish: unknown yet", ratio * 100
+        )
 
 
 def log_summary(args, results, simulation_cases, wall_time):
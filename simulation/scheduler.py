@@ -0,0 +1,120 @@
+import threading
+from collections import defaultdict
+
+from simulation import factory
+from simulation.model import SimulationCase
+
+
+def cost_key(simulation: SimulationCase):
+    """
+    :return: (problem, algorithm, budget) under which the CPU time of the case
+        is recorded; budget is the largest one of the case, None for time runs.
+    """
+    budgets = simulation.params.get(factory.BUDGETS_PARAM)
+    budget = max(budgets) if budgets else None
+    return simulation.problem_name, simulation.algorithm_name, budget
+
+
+class Scheduler:
+    """
+    Hands out simulation cases longest-expected-first.
+
+    The expected CPU time of a case is the mean time recorded for the same
+    problem, algorithm and budget. Without such records it is scaled linearly
+    from the nearest budget of the same problem and algorithm, then from the
+    same algorithm on other problems. Cases that cannot be estimated at all
+    go first, and times of finished cases refine the estimates of the rest.
+    Ties keep the order of simulation_cases.
+    """
+
+    def __init__(self, simulation_cases, history=()):
+        """
+        :param history: Pairs (cost_key, CPU time) of earlier runs.
+        """
+        self.simulation_cases = simulation_cases
+        self.keys = [cost_key(simulation) for simulation in simulation_cases]
+        self.pending = list(range(len(simulation_cases)))
+        self.running = set()
+        self.finished_time = 0.0
+        # recorded times by key, by budget of (problem, algo) and per unit of
+        # budget of each algorithm
+        self.times = defaultdict(list)
+        self.budget_times = defaultdict(dict)
+        self.unit_times = defaultdict(list)
+        self._lock = threading.Lock()
+        for key, proc_time in history:
+            self._record(tuple(key), proc_time)
+
+    def next_case(self) -> int:
+        """ :return: Index of the case to run next. """
+        with self._lock:
+            estimates = self._estimates(self.pending)
+            unknown = [i for i, e in zip(self.pending, estimates) if e is None]
+            if unknown:
+                chosen = unknown[0]
+            else:
+                chosen = self.pending[estimates.index(max(estimates))]
+            self.pending.remove(chosen)
+            self.running.add(chosen)
+            return chosen
+
+    def finished(self, i, proc_time=None):
+        """ :param proc_time: CPU time of the case; None when it failed. """
+        with self._lock:
+            self.running.discard(i)
+            if proc_time is not None:
+                self.finished_time += proc_time
+                self._record(self.keys[i], proc_time)
+
+    def estimate(self, i):
+        """ :return: Expected CPU time of the case, None if unknown. """
+        with self._lock:
+            return self._estimate(self.keys[i])
+
+    def progress(self) -> float:
+        """
+        :return: Part of the expected CPU time of the batch that is done;
+            the part of finished cases when nothing can be estimated.
+        """
+        with self._lock:
+            unfinished = self.pending + sorted(self.running)
+            estimates = self._estimates(unfinished)
+            known = [e for e in estimates if e is not None]
+            if not known:
+                done = len(self.simulation_cases) - len(unfinished)
+                return done / len(self.simulation_cases)
+            remaining = sum(known) + _average(known) * (len(estimates) - len(known))
+            total = self.finished_time + remaining
+            return self.finished_time / total if total else 1.0
+
+    def _record(self, key, proc_time):
+        problem, algo, budget = key
+        self.times[key].append(proc_time)
+        if budget:
+            self.budget_times[problem, algo][budget] = self.times[key]
+            self.unit_times[algo].append(proc_time / budget)
+
+    def _estimates(self, indices):
+        by_key = {}
+        for i in indices:
+            if self.keys[i] not in by_key:
+                by_key[self.keys[i]] = self._estimate(self.keys[i])
+        return [by_key[self.keys[i]] for i in indices]
+
+    def _estimate(self, key):
+        problem, algo, budget = key
+        if self.times.get(key):
+            return _average(self.times[key])
+        if budget is None:
+            return None
+        budget_times = self.budget_times.get((problem, algo))
+        if budget_times:
+            nearest = min(budget_times, key=lambda b: abs(b - budget))
+            return _average(budget_times[nearest]) * budget / nearest
+        if self.unit_times.get(algo):
+            return _average(self.unit_times[algo]) * budget
+        return None
+
+
+def _average(values):
+    return sum(values) / len(values)
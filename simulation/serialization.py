@@ -1,12 +1,11 @@
-import re
 from collections import defaultdict
 from contextlib import suppress
 from importlib import import_module
 from pathlib import Path
 
-from simulation import model, metrics_processor
+from simulation import model, metrics_processor, results_catalog
 from simulation.model import SimulationCase
-from simulation.serializer import Serializer, ResultWithMetadata
+from simulation.serializer import Serializer, ResultWithMetadata, load_result_file
 
 RESULTS_DIR = "../results_temp/results_k2"
 
@@ -20,29 +19,20 @@ class ResultsExtractor:
         raise NotImplementedError
 
     def _each_run(self, algo, problem, results_path="results"):
-        rootpath = Path(results_path, problem, algo)
-        run_no = 0
-        for candidate in sorted(rootpath.iterdir()):
-            try:
-                match = re.fullmatch(
-                    "(?P<rundate>\d{4}-\d{2}-\d{2}\.\d{2}\d{2}\d{2}\.\d{6})__(?P<runid>\d{7})",
-                    candidate.name,
-                )
-                matchdict = match.groupdict()
-                run_id = matchdict["runid"]
-                run_date = matchdict["rundate"]
-                simulation_case = SimulationCase(
-                    problem,
-                    algo,
-                    run_id,
-                    None,
-                    results_path,
-                    model.get_simulation_id(run_id, run_date),
-                )
-                yield (simulation_case, run_no)
-                run_no += 1
-            except AttributeError:
-                pass
+        catalog = results_catalog.catalog_for(results_path)
+        for run_no, run in enumerate(catalog.runs(problem, algo)):
+            matchdict = results_catalog.RUN_PATTERN.fullmatch(run).groupdict()
+            run_id = matchdict["runid"]
+            run_date = matchdict["rundate"]
+            simulation_case = SimulationCase(
+                problem,
+                algo,
+                run_id,
+                None,
+                results_path,
+                model.get_simulation_id(run_id, run_date),
+            )
+            yield (simulation_case, run_no)
 
 
 class NumberMeasuredResultExtractor(ResultsExtractor):
@@ -62,20 +52,21 @@ class NumberMeasuredResultExtractor(ResultsExtractor):
     def load_number_measured_results(self, simulation_case, run_no):
         numbers = []
         serializer = Serializer(simulation_case)
-        with suppress(FileNotFoundError):
-            for candidate in sorted(serializer.path.iterdir()):
-                try:
-                    match = re.fullmatch(f"(?P<{self.property_name}>[0-9]+)\.pickle", candidate.name)
-
-                    number = int(match.groupdict()[self.property_name])
-                    population_pickle = serializer.load(number)
-
-                    res = ResultWithMetadata(
-                        population_pickle, candidate, run_no, simulation_case
-                    )
-                    numbers.append(res)
-                except (AttributeError, IsADirectoryError):
-                    pass
+        catalog = results_catalog.catalog_for(simulation_case.results_dir)
+        for number, file_name in catalog.results(
+            simulation_case.problem_name,
+            simulation_case.algorithm_name,
+            simulation_case.id,
+        ):
+            result_path = serializer.path / file_name
+            with suppress(FileNotFoundError):
+                res = ResultWithMetadata(
+                    load_result_file(result_path),
+                    result_path,
+                    run_no,
+                    simulation_case,
+                )
+                numbers.append(res)
         return numbers
 
 
@@ -105,12 +96,14 @@ def each_result(result_extractor: ResultsExtractor, results_path=RESULTS_DIR):
             }
 
     def f_problem(problem_path, problem_mod):
-        for algo_path in problem_path.iterdir():
-            if algo_path.is_dir():
-                yield algo_path.name, f_algo(problem_path, algo_path, problem_mod)
+        for algo_name in catalog.algorithms(problem_path.name):
+            yield algo_name, f_algo(problem_path, problem_path / algo_name, problem_mod)
 
     with suppress(FileNotFoundError):
-        for problem in Path(results_path).iterdir():
-            problem_mod = ".".join(["problems", problem.name, "problem"])
+        catalog = results_catalog.catalog_for(results_path)
+        for problem_name in catalog.problems():
+            problem_mod = ".".join(["problems", problem_name, "problem"])
             problem_mod = import_module(problem_mod)
-            yield problem.name, problem_mod, f_problem(problem, problem_mod)
+            yield problem_name, problem_mod, f_problem(
+                Path(results_path, problem_name), problem_mod
+            )
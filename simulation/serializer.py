@@ -1,9 +1,23 @@
+import json
 import pickle
 from contextlib import suppress
 from pathlib import Path
 from typing import Any
 
+import numpy
+
 from simulation.model import SimulationCase
+from simulation.results_catalog import ResultsCatalog
+
+RESULT_SUFFIX = ".npres"
+LEGACY_RESULT_SUFFIX = ".pickle"
+
+# Binary result file: the magic line, a JSON header line padded so that the
+# data starts at a multiple of ARRAY_ALIGNMENT, then a C-ordered float64 array
+# of shape (size, dims + objectives) - decision vectors followed by fitnesses.
+RESULT_MAGIC = b"EVOGIL-RESULT 1\n"
+ARRAY_ALIGNMENT = 64
+ARRAY_DTYPE = "<f8"
 
 
 class Result:
@@ -13,16 +27,57 @@ class Result:
         self.additional_data = additional_data
 
 
+class MappedResult(Result):
+    """
+    Result read from a binary result file. The population and fitnesses are
+    memory-mapped on each access rather than loaded, so that a large set of
+    results neither has to be read up front nor keeps its files open.
+    """
+
+    def __init__(self, path: Path, header: dict, offset: int):
+        self.path = path
+        self.size = header["size"]
+        self.dims = header["dims"]
+        self.objectives = header["objectives"]
+        self.offset = offset
+        self.additional_data = header["additional_data"]
+
+    @property
+    def population(self):
+        return self._array()[:, : self.dims]
+
+    @property
+    def fitnesses(self):
+        return self._array()[:, self.dims :]
+
+    def _array(self):
+        shape = (self.size, self.dims + self.objectives)
+        if self.size == 0:
+            return numpy.empty(shape)
+        return numpy.memmap(
+            str(self.path), ARRAY_DTYPE, mode="r", offset=self.offset, shape=shape
+        )
+
+
 class ResultWithMetadata(Result):
     def __init__(
         self, result: Result, path: Path, run_no: int, simulation_case: SimulationCase
     ):
-        super().__init__(result.population, result.fitnesses, **result.additional_data)
+        self.result = result
+        self.additional_data = result.additional_data
         self.path = path
         self.name = path.with_suffix("").name
         self.run_no = run_no
         self.simulation_case = simulation_case
 
+    @property
+    def population(self):
+        return self.result.population
+
+    @property
+    def fitnesses(self):
+        return self.result.fitnesses
+
 
 def load_file(path: Path):
     with path.open(mode="rb") as fh:
@@ -34,6 +89,45 @@ def save_file(path: Path, obj: Any):
         pickle.dump(obj, fh)
 
 
+def load_result_file(path: Path) -> Result:
+    """ :return: Result read from a binary result file or a legacy pickle. """
+    if path.suffix == LEGACY_RESULT_SUFFIX:
+        return load_file(path)
+    with path.open(mode="rb") as fh:
+        if fh.readline() != RESULT_MAGIC:
+            raise ValueError(f"Not a result file: {path}")
+        header = json.loads(fh.readline().decode())
+        return MappedResult(path, header, fh.tell())
+
+
+def save_result_file(path: Path, result: Result):
+    population = _as_matrix(result.population)
+    fitnesses = _as_matrix(result.fitnesses)
+    header = {
+        "size": len(population),
+        "dims": population.shape[1],
+        "objectives": fitnesses.shape[1],
+        "additional_data": result.additional_data,
+    }
+    header = json.dumps(header, default=_json_scalar).encode()
+    padding = -(len(RESULT_MAGIC) + len(header) + 1) % ARRAY_ALIGNMENT
+    with path.open(mode="wb") as fh:
+        fh.write(RESULT_MAGIC)
+        fh.write(header + b" " * padding + b"\n")
+        fh.write(numpy.hstack([population, fitnesses]).astype(ARRAY_DTYPE).tobytes())
+
+
+def _as_matrix(rows):
+    matrix = numpy.asarray(rows, dtype=float)
+    return matrix.reshape(len(matrix), -1) if matrix.size else matrix.reshape(0, 0)
+
+
+def _json_scalar(value):
+    if isinstance(value, numpy.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
 class Serializer:
     def __init__(self, simulation_case: SimulationCase):
         self.path = Path(
@@ -42,18 +136,36 @@ class Serializer:
             simulation_case.algorithm_name,
             simulation_case.id,
         )
+        self.simulation_case = simulation_case
+        self.catalog = ResultsCatalog(simulation_case.results_dir)
 
     def store(self, result: Result, file_name: str) -> Path:
         with suppress(FileExistsError):
             self.path.mkdir(parents=True)
 
         store_path = self.get_result_path(file_name)
-        save_file(store_path, result)
+        # the catalog only lists complete files
+        partial_path = store_path.with_suffix(".partial")
+        save_result_file(partial_path, result)
+        partial_path.replace(store_path)
+        self.catalog.add(
+            self.simulation_case.problem_name,
+            self.simulation_case.algorithm_name,
+            self.simulation_case.id,
+            file_name,
+            store_path.name,
+        )
         return store_path
 
     def get_result_path(self, file_name) -> Path:
-        return self.path / f"{file_name}.pickle"
+        return self.path / f"{file_name}{RESULT_SUFFIX}"
+
+    def find_result_path(self, file_name) -> Path:
+        """ :return: Path of the stored result, in either format. """
+        store_path = self.get_result_path(file_name)
+        if store_path.exists():
+            return store_path
+        return self.path / f"{file_name}{LEGACY_RESULT_SUFFIX}"
 
     def load(self, file_name) -> Result:
-        load_path = self.get_result_path(file_name)
-        return load_file(load_path)
+        return load_result_file(self.find_result_path(file_name))
@@ -8,8 +8,11 @@ from types import ModuleType
 from rx import operators as ops
 
 from algorithms.base.driver import BudgetRun, Driver, TimeRun
+from algorithms.base import drivertools
+from algorithms.base.drivertools import evaluate_population
 from algorithms.base.model import TimeProgressMessage
 from simulation import factory, log_helper
+from simulation.checkpoint import Checkpoint, DEFAULT_INTERVAL
 from simulation.model import SimulationCase
 from simulation.run_config import NotViableConfiguration
 from simulation.serializer import Serializer, Result
@@ -84,6 +87,14 @@ class SimulationWorker:
     ):
         raise NotImplementedError()
 
+    def create_checkpoint(self, serializer: Serializer) -> Checkpoint:
+        params = self.simulation.params
+        return Checkpoint(
+            serializer.path,
+            params.get(factory.CHECKPOINT_INTERVAL_PARAM, DEFAULT_INTERVAL),
+            params.get(factory.CHECKPOINT_STEPS_PARAM),
+        )
+
     def _init_random_seed(self, logger):
         logger.debug("Getting random seed")
         # basically we duplicate the code of https://github.com/python/cpython/blob/master/Lib/random.py#L111 because
@@ -96,6 +107,7 @@ class SimulationWorker:
                 time.time() * 256 + os.getpid()
             )  # that's not enough for MT, but will have to do for now.
         random.seed(random_seed)
+        drivertools.seed_generator(random_seed)
 
 
 class BudgetWorker(SimulationWorker):
@@ -110,21 +122,53 @@ class BudgetWorker(SimulationWorker):
         self, driver: Driver, problem_mod: ModuleType, logger: logging.Logger
     ):
         serializer = Serializer(self.simulation)
+        checkpoint = self.create_checkpoint(serializer)
         results = []
+        # the last budget stored before the checkpoint
+        stored_budget = None
+
+        progress = checkpoint.restore(driver)
+        if progress is not None:
+            stored_budget = progress["budget"]
+            logger.info(
+                "Resuming from the checkpoint: cost=%d, driver step=%d. simulation case:%s",
+                driver.cost,
+                driver.step_no,
+                self.simulation,
+            )
 
         def process_results(budget: int):
+            nonlocal stored_budget
             finalpop = driver.finalized_population()
-            finalpop_fit = [[fit(x) for fit in problem_mod.fitnesses] for x in finalpop]
+            finalpop_fit = evaluate_population(
+                factory.problem_fitnesses(problem_mod), finalpop
+            )
             serializer.store(
                 Result(finalpop, finalpop_fit, cost=driver.cost), str(budget)
             )
             results.append((driver.cost, finalpop))
+            stored_budget = budget
+            checkpoint.save(driver, budget=budget)
 
         driver.max_budget = self.budgets[-1]
         for budget in self.budgets:
+            if serializer.find_result_path(str(budget)).exists():
+                logger.debug("Budget %d already stored, skipping", budget)
+                continue
+            if stored_budget is not None and budget < stored_budget:
+                logger.warning(
+                    "Budget %d precedes the checkpoint (after budget %d), skipping. simulation case:%s",
+                    budget,
+                    stored_budget,
+                    self.simulation,
+                )
+                continue
             budget_run = BudgetRun(budget)
             budget_run.create_job(driver).pipe(
-                ops.do_action(on_completed=lambda: process_results(budget))
+                ops.do_action(
+                    on_next=lambda _: checkpoint.tick(driver, budget=stored_budget)
+                ),
+                ops.do_action(on_completed=lambda: process_results(budget)),
             ).subscribe(
                 lambda proxy: logger.debug(
                     "{}{} : Driver progress: budget={}, current cost={}, driver step={}".format(
@@ -136,6 +180,10 @@ class BudgetWorker(SimulationWorker):
                     )
                 )
             )
+        # kept only on request, to continue the run with larger budgets later;
+        # otherwise --resume replaces the run with a new one
+        if not self.simulation.params.get(factory.KEEP_CHECKPOINTS_PARAM):
+            checkpoint.remove()
         return results
 
 
@@ -151,15 +199,48 @@ class TimeWorker(SimulationWorker):
         sampling_interval = self.simulation.params[factory.SAMPLING_INTERVAL_PARAM]
 
         serializer = Serializer(self.simulation)
+        checkpoint = self.create_checkpoint(serializer)
 
         slots_filled = set()
-
-        time_run = TimeRun(sampling_interval, timeout)
+        saved_slots = 0
+
+        def save_progress(time_run: TimeRun):
+            nonlocal saved_slots
+            progress = dict(
+                time_elapsed=time_run.time_elapsed,
+                step_no=time_run.step_no,
+                previous_result=time_run.previous_result,
+                slots_filled=set(slots_filled),
+            )
+            if len(slots_filled) > saved_slots:
+                # right after a stored result, so that it is not computed again
+                checkpoint.save(driver, **progress)
+                saved_slots = len(slots_filled)
+            else:
+                checkpoint.tick(driver, **progress)
+
+        time_run = TimeRun(sampling_interval, timeout, on_step=save_progress)
+
+        progress = checkpoint.restore(driver)
+        if progress is not None:
+            time_run.time_elapsed = progress["time_elapsed"]
+            time_run.step_no = progress["step_no"]
+            time_run.previous_result = progress["previous_result"]
+            slots_filled.update(progress["slots_filled"])
+            logger.info(
+                "Resuming from the checkpoint: %.3fs elapsed, driver step=%d. simulation case:%s",
+                time_run.time_elapsed,
+                driver.step_no,
+                self.simulation,
+            )
+            saved_slots = len(slots_filled)
 
         def process_results(msg: TimeProgressMessage):
             finalpop = driver.finalized_population()
             print(f"final pop result: {finalpop}")
-            finalpop_fit = [[fit(x) for fit in problem_mod.fitnesses] for x in finalpop]
+            finalpop_fit = evaluate_population(
+                factory.problem_fitnesses(problem_mod), finalpop
+            )
 
             time_slot = msg.elapsed_time
 
@@ -171,5 +252,7 @@ class TimeWorker(SimulationWorker):
 
 
         time_run.create_job(driver).pipe(ops.do_action(on_next=process_results)).run()
+        # a finished time run is not continued
+        checkpoint.remove()
 
         return results
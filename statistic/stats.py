@@ -3,7 +3,7 @@ import multiprocessing
 from itertools import repeat
 
 from evotools.random_tools import close_and_join
-from simulation import serialization
+from simulation import metric_store, serialization
 from simulation.serialization import BudgetResultsExtractor
 from simulation.timing import process_time, log_time
 from statistic.stats_bootstrap import yield_analysis, average
@@ -49,6 +49,8 @@ def force_data(args):
     boot_size, (metric_name, metric_name_long, data_process) = args
 
     data_process = list(x() for x in data_process)
+    # run in pool workers, which do not write the store when they exit
+    metric_store.flush_all()
     force_analysis = yield_analysis(data_process, boot_size)
     return metric_name, metric_name_long, data_process, force_analysis
 
@@ -0,0 +1,136 @@
+import pickle
+import random
+import unittest
+
+from algorithms.base.archive import CrowdingArchive, NonDominatedArchive
+from test.test_common.test_util import naive_crowding
+
+
+class Point:
+    def __init__(self, objectives):
+        self.objectives = objectives
+
+
+class ListArchive:
+    """ Reference implementation: a plain list scanned on every update. """
+
+    def __init__(self, eta, reject_equal):
+        self.archive = []
+        self.eta = eta
+        self.reject_equal = reject_equal
+
+    def dominates(self, a, b):
+        at_least_one = False
+        for a_i, b_i in zip(a, b):
+            if b_i < a_i / (1 + self.eta):
+                return False
+            elif b_i > a_i / (1 + self.eta):
+                at_least_one = True
+        return at_least_one
+
+    def add(self, p):
+        for other in self.archive:
+            if self.dominates(other.objectives, p.objectives):
+                return False
+            if self.reject_equal and other.objectives == p.objectives:
+                return False
+        self.archive = [
+            other
+            for other in self.archive
+            if not self.dominates(p.objectives, other.objectives)
+        ]
+        self.archive.append(p)
+        return True
+
+    def remove(self, p):
+        self.archive.remove(p)
+
+
+class TestNonDominatedArchive(unittest.TestCase):
+    def setUp(self):
+        random.seed(11)
+
+    def random_point(self, objectives_no):
+        return Point([random.randint(-20, 100) / 10 for _ in range(objectives_no)])
+
+    def check_against_list(self, eta, reject_equal, objectives_no, steps):
+        archive = NonDominatedArchive(eta, reject_equal=reject_equal, max_leaf_size=4)
+        reference = ListArchive(eta, reject_equal)
+        for _ in range(steps):
+            if archive.archive and random.random() < 0.1:
+                victim = random.choice(archive.archive)
+                archive.remove(victim)
+                reference.remove(victim)
+            else:
+                p = self.random_point(objectives_no)
+                self.assertEqual(archive.add(p), reference.add(p))
+            self.assertEqual(len(archive), len(reference.archive))
+        self.assertEqual(
+            sorted(map(id, archive)), sorted(map(id, reference.archive))
+        )
+
+    def test_matches_list_archive(self):
+        for objectives_no in [2, 3, 5]:
+            for eta in [0.0, 0.0075, 0.1]:
+                for reject_equal in [True, False]:
+                    with self.subTest(
+                        objectives_no=objectives_no, eta=eta, reject_equal=reject_equal
+                    ):
+                        self.check_against_list(eta, reject_equal, objectives_no, 400)
+
+    def test_keeps_insertion_order(self):
+        archive = NonDominatedArchive()
+        points = [Point([i, 10 - i]) for i in range(10)]
+        for p in points:
+            archive.add(p)
+        self.assertEqual(archive.archive, points)
+
+    def test_custom_key(self):
+        archive = NonDominatedArchive(key=lambda x: x, reject_equal=False)
+        for p in [[1, 2], [1, 2], [2, 1], [0, 3], [2, 2]]:
+            archive.add(p)
+        self.assertEqual(sorted(archive), [[0, 3], [1, 2], [1, 2], [2, 1]])
+
+
+class TestCrowdingArchive(unittest.TestCase):
+    def setUp(self):
+        random.seed(13)
+
+    def test_matches_pruned_list_archive(self):
+        for objectives_no in [2, 3]:
+            with self.subTest(objectives_no=objectives_no):
+                archive = CrowdingArchive(10, max_leaf_size=4)
+                reference = ListArchive(0.0, True)
+                for _ in range(500):
+                    # points scattered around a plane, so most are non-dominated
+                    head = [
+                        random.randint(0, 40) / 10 for _ in range(objectives_no - 1)
+                    ]
+                    p = Point(head + [random.randint(0, 4) / 10 - sum(head)])
+                    self.assertEqual(archive.add(p), reference.add(p))
+                    if len(reference.archive) > 10:
+                        objectives = [q.objectives for q in reference.archive]
+                        distances = naive_crowding(objectives, range(len(objectives)))
+                        most_crowded = min(range(len(objectives)), key=distances.get)
+                        reference.remove(reference.archive[most_crowded])
+                    self.assertEqual(archive.archive, reference.archive)
+
+                archive.crowding()
+                objectives = [q.objectives for q in reference.archive]
+                distances = naive_crowding(objectives, range(len(objectives)))
+                for i, p in enumerate(archive):
+                    self.assertAlmostEqual(distances[i], p.crowd_val)
+
+    def test_continues_after_pickling(self):
+        archive = CrowdingArchive(10, max_leaf_size=4)
+        points = [Point([random.random(), random.random()]) for _ in range(300)]
+        for p in points[:150]:
+            archive.add(p)
+        restored = pickle.loads(pickle.dumps(archive))
+        for p in points[150:]:
+            archive.add(p)
+            restored.add(Point(p.objectives))
+            restored.crowding()
+        self.assertEqual(
+            [p.objectives for p in restored], [p.objectives for p in archive]
+        )
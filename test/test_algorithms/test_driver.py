@@ -1,5 +1,7 @@
+import random
 import unittest
 
+from algorithms.base import drivertools
 from algorithms.base.driver import Driver, ProgressMessage
 from simulation.factory import prepare
 
@@ -29,3 +31,28 @@ class DriverTest(unittest.TestCase):
                 self.assertIsInstance(proxy, ProgressMessage)
                 self.assertEqual(proxy.step_no, driver.step_no - 1)
                 self.assertEqual(proxy.cost, driver.cost)
+
+    def test_restored_driver_continues_the_run(self):
+        for algorithm in ["NSGAII", "OMOPSO", "SPEA2"]:
+            with self.subTest(algorithm=algorithm):
+                driver_factory, _ = prepare(algorithm, "ZDT1")
+                driver = driver_factory()
+                for _ in range(3):
+                    driver.next_step()
+                snapshot = driver.snapshot()
+                random_state = drivertools.random_state()
+                for _ in range(3):
+                    driver.next_step()
+
+                restored = driver_factory()
+                restored.restore(snapshot)
+                drivertools.set_random_state(random_state)
+                for _ in range(3):
+                    restored.next_step()
+
+                self.assertEqual(restored.cost, driver.cost)
+                self.assertEqual(restored.step_no, driver.step_no)
+                self.assertEqual(
+                    list(map(list, restored.finalized_population())),
+                    list(map(list, driver.finalized_population())),
+                )
@@ -0,0 +1,92 @@
+import random
+import unittest
+
+import numpy
+
+from algorithms.base.drivertools import (
+    crossover,
+    crossover_pairs,
+    crossover_population,
+    mutate,
+    mutate_population,
+)
+
+DIMS = [(0, 1), (-5, 5), (-1, 1)]
+XS = [0.2, 4.5, -0.9]
+YS = [0.7, -3.0, -0.85]
+
+
+def max_cdf_distance(a, b):
+    """ Two-sample Kolmogorov-Smirnov statistic. """
+    a, b = numpy.sort(a), numpy.sort(b)
+    points = numpy.concatenate([a, b])
+    cdf_a = numpy.searchsorted(a, points, side="right") / len(a)
+    cdf_b = numpy.searchsorted(b, points, side="right") / len(b)
+    return numpy.abs(cdf_a - cdf_b).max()
+
+
+class TestPopulationOperators(unittest.TestCase):
+    SAMPLES = 20000
+    # critical value of the KS test at alpha = 0.001
+    KS_LIMIT = 1.95 * (2 / SAMPLES) ** 0.5
+
+    def setUp(self):
+        random.seed(3)
+        self.rng = numpy.random.default_rng(3)
+
+    def assertSameDistribution(self, scalar, vectorized):
+        for i in range(len(DIMS)):
+            self.assertLess(
+                max_cdf_distance(scalar[:, i], vectorized[:, i]), self.KS_LIMIT
+            )
+
+    def test_mutation_matches_mutate(self):
+        for eta in [2, 20]:
+            with self.subTest(eta=eta):
+                scalar = numpy.array(
+                    [mutate(XS, DIMS, 0.5, eta) for _ in range(self.SAMPLES)]
+                )
+                vectorized = mutate_population(
+                    [XS] * self.SAMPLES, DIMS, 0.5, eta, self.rng
+                )
+                self.assertSameDistribution(scalar, vectorized)
+
+    def test_crossover_matches_crossover(self):
+        for eta in [2, 20]:
+            with self.subTest(eta=eta):
+                scalar = numpy.array(
+                    [crossover(XS, YS, DIMS, 0.9, eta) for _ in range(self.SAMPLES)]
+                )
+                vectorized = crossover_population(
+                    [XS] * self.SAMPLES, [YS] * self.SAMPLES, DIMS, 0.9, eta, self.rng
+                )
+                self.assertSameDistribution(scalar, vectorized)
+
+    def test_offspring_within_bounds(self):
+        xs = self.rng.uniform(-5, 5, (500, len(DIMS)))
+        xs = numpy.clip(xs, [lb for lb, _ in DIMS], [ub for _, ub in DIMS])
+        for offspring in [
+            mutate_population(xs, DIMS, 1.0, 1, self.rng),
+            crossover_population(xs, xs[::-1], DIMS, 1.0, 1, self.rng),
+        ]:
+            self.assertTrue(numpy.all(offspring >= [lb for lb, _ in DIMS]))
+            self.assertTrue(numpy.all(offspring <= [ub for _, ub in DIMS]))
+
+    def test_masks(self):
+        mutated, mask = mutate_population(
+            [XS] * 100, DIMS, 0.3, 20, self.rng, return_mask=True
+        )
+        numpy.testing.assert_array_equal(mutated[~mask], numpy.array([XS] * 100)[~mask])
+
+        children_a, children_b, crossed = crossover_pairs(
+            [XS] * 100, [YS] * 100, DIMS, 0.5, 20, self.rng
+        )
+        self.assertTrue(0 < crossed.sum() < 100)
+        numpy.testing.assert_array_equal(children_a[~crossed], [XS] * (~crossed).sum())
+        numpy.testing.assert_array_equal(children_b[~crossed], [YS] * (~crossed).sum())
+
+    def test_empty_population(self):
+        self.assertEqual(mutate_population([], DIMS, 0.5, 20).shape, (0, len(DIMS)))
+        self.assertEqual(
+            crossover_population([], [], DIMS, 0.5, 20).shape, (0, len(DIMS))
+        )
@@ -0,0 +1,122 @@
+import random
+import unittest
+
+from algorithms.base.hv import (
+    HyperVolume,
+    exclusive_contributions,
+    hypervolume,
+    hypervolume_monte_carlo,
+)
+from evotools.nondominated import non_dominated_filter
+
+
+class TestHypervolume(unittest.TestCase):
+    def setUp(self):
+        random.seed(3)
+
+    def test_matches_hypervolume_class(self):
+        for objectives_no in [1, 2, 3, 4]:
+            for _ in range(100):
+                # dominated points and points beyond the reference point included
+                points = [
+                    [random.randint(-4, 12) / 4 for _ in range(objectives_no)]
+                    for _ in range(random.randint(1, 50))
+                ]
+                reference_point = [
+                    random.choice([0.0, 2.5, 3.0]) for _ in range(objectives_no)
+                ]
+                expected = HyperVolume(reference_point).compute(
+                    [list(p) for p in points]
+                )
+                self.assertAlmostEqual(hypervolume(points, reference_point), expected)
+
+    def test_boxes(self):
+        self.assertEqual(hypervolume([], [1, 1]), 0.0)
+        self.assertEqual(hypervolume([[2, 0]], [1, 1]), 0.0)
+        self.assertEqual(hypervolume([[0, 1], [1, 0]], [2, 2]), 3.0)
+        self.assertEqual(hypervolume([[1, 0, 1], [0, 1, 0]], [2, 2, 2]), 5.0)
+
+
+class TestHypervolumeMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        random.seed(4)
+
+    def test_interval_contains_exact_value(self):
+        for objectives_no in [2, 3, 5]:
+            points = [
+                [random.uniform(0, 1) for _ in range(objectives_no)] for _ in range(30)
+            ]
+            reference_point = [1.2] * objectives_no
+            exact = HyperVolume(reference_point).compute([list(p) for p in points])
+            estimate = hypervolume_monte_carlo(
+                points, reference_point, samples=200000, confidence=0.999, seed=1
+            )
+            self.assertLessEqual(estimate.lower, exact)
+            self.assertLessEqual(exact, estimate.upper)
+            self.assertLessEqual(estimate.lower, estimate.value)
+            self.assertLessEqual(estimate.value, estimate.upper)
+            self.assertEqual(estimate.samples, 200000)
+
+    def test_seed_and_batches(self):
+        points = [[random.uniform(0, 1) for _ in range(4)] for _ in range(20)]
+        estimates = [
+            hypervolume_monte_carlo(points, [1, 1, 1, 1], 5000, seed=7, batchSize=b)
+            for b in [5000, 5000, 1000]
+        ]
+        self.assertEqual(estimates[0], estimates[1])
+        self.assertEqual(estimates[0], estimates[2])
+
+    def test_nothing_to_sample(self):
+        self.assertEqual(hypervolume_monte_carlo([], [1, 1]).value, 0.0)
+        self.assertEqual(hypervolume_monte_carlo([[2, 2]], [1, 1]).value, 0.0)
+
+
+class TestExclusiveContributions(unittest.TestCase):
+    def setUp(self):
+        random.seed(5)
+
+    def random_front(self, objectives_no):
+        size = random.randint(1, 40)
+        if random.random() < 0.5:
+            # coarse values produce ties on single objectives
+            points = [
+                [random.randint(0, 12) / 4 for _ in range(objectives_no)]
+                for _ in range(size)
+            ]
+        else:
+            points = [
+                [random.uniform(0, 3) for _ in range(objectives_no)]
+                for _ in range(size)
+            ]
+        return [points[i] for i in non_dominated_filter(points)]
+
+    def leave_one_out(self, front, reference_point):
+        hv = HyperVolume(reference_point)
+        total = hv.compute([list(p) for p in front])
+        return [
+            total - hv.compute([list(q) for j, q in enumerate(front) if j != i])
+            for i in range(len(front))
+        ]
+
+    def test_matches_leave_one_out(self):
+        for objectives_no in [2, 3, 4]:
+            for _ in range(100):
+                front = self.random_front(objectives_no)
+                if random.random() < 0.3:
+                    front += [list(p) for p in random.sample(front, 1)]
+                reference_point = [
+                    random.choice([2.5, 3.0, 3.5]) for _ in range(objectives_no)
+                ]
+                expected = self.leave_one_out(front, reference_point)
+                result = exclusive_contributions(front, reference_point)
+                self.assertEqual(len(result), len(front))
+                for a, b in zip(result, expected):
+                    self.assertAlmostEqual(a, b)
+
+    def test_boxes(self):
+        self.assertEqual(exclusive_contributions([], [1, 1]), [])
+        self.assertEqual(exclusive_contributions([[0, 0]], [1, 2]), [2.0])
+        self.assertEqual(
+            exclusive_contributions([[0, 1, 0], [1, 0, 0], [3, 3, 3]], [2, 2, 2]),
+            [2.0, 2.0, 0.0],
+        )
@@ -0,0 +1,104 @@
+import math
+import random
+import sys
+import unittest
+
+from algorithms.IBEA.IBEA import IBEA
+
+
+def legacy_selection(points, population_size, kappa):
+    """ Reference: tuple-keyed indicator dict and per-removal resorting. """
+    columns = list(zip(*points))
+    bounds = [(min(c), max(c)) for c in columns]
+    scaled = [
+        [
+            (x - min_o) / (max_o - min_o + sys.float_info.epsilon)
+            for x, (min_o, max_o) in zip(point, bounds)
+        ]
+        for point in points
+    ]
+    individuals = list(range(len(points)))
+    indicators = {
+        (i, j): max(a - b for a, b in zip(scaled[i], scaled[j]))
+        for i in individuals
+        for j in individuals
+    }
+    c = max(abs(x) for x in indicators.values())
+    scale = abs(c * kappa + sys.float_info.epsilon)
+    fitness = {
+        i: sum(-math.exp(-indicators[(j, i)] / scale) for j in individuals if j != i)
+        for i in individuals
+    }
+    while len(individuals) > population_size:
+        individuals = sorted(individuals, key=lambda y: fitness[y], reverse=True)
+        removed = individuals.pop()
+        for i in individuals:
+            fitness[i] += math.exp(-indicators[(removed, i)] / scale)
+    return individuals, fitness
+
+
+class TestIBEASelection(unittest.TestCase):
+    def setUp(self):
+        random.seed(3)
+
+    def test_matches_legacy_selection(self):
+        for objectives_no in [2, 3]:
+            for population_size, union_size in [(5, 10), (20, 30), (40, 80)]:
+                with self.subTest(objectives_no=objectives_no, size=union_size):
+                    points = [
+                        [random.random() for _ in range(objectives_no)]
+                        for _ in range(union_size)
+                    ]
+                    expected, fitness = legacy_selection(
+                        points, population_size, kappa=0.05
+                    )
+
+                    driver = IBEA(
+                        points[:population_size],
+                        [(0, 1)] * objectives_no,
+                        [lambda x, m=m: x[m] for m in range(objectives_no)],
+                        kappa=0.05,
+                        mating_population_size=0.5,
+                        mutation_eta=20,
+                        crossover_eta=15,
+                        mutation_rate=0.1,
+                        crossover_rate=0.9,
+                    )
+                    driver.individuals = [IBEA.Individual(p) for p in points]
+                    driver._scale_objectives()
+                    driver._calculate_fitness()
+                    driver._environmental_selection()
+
+                    self.assertEqual([points[i] for i in expected], driver.population)
+                    for i, value in zip(expected, driver.fitness):
+                        self.assertAlmostEqual(fitness[i], value)
+
+
+class TestIBEAEvaluations(unittest.TestCase):
+    def test_every_individual_is_evaluated_once(self):
+        evaluated = []
+
+        def f1(x):
+            evaluated.append(tuple(x))
+            return x[0]
+
+        driver = IBEA(
+            [[random.random(), random.random()] for _ in range(20)],
+            [(0, 1), (0, 1)],
+            [f1, lambda x: 1 - x[0] + x[1]],
+            kappa=0.05,
+            mating_population_size=0.5,
+            mutation_eta=20,
+            crossover_eta=15,
+            mutation_rate=0.1,
+            crossover_rate=0.9,
+        )
+        for _ in range(5):
+            driver.step()
+        driver.finish()
+
+        self.assertEqual(20 + 5 * driver.mating_size, len(evaluated))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import itertools
+import random
+import unittest
+
+import numpy
+
+from algorithms.NSGAIII.NSGAIII import (
+    associate,
+    das_dennis_directions,
+    reference_divisions,
+    theta_non_dominated_sort,
+)
+
+
+def naive_theta_ranks(clusters, theta_fitness):
+    """ Reference: front numbers from pairwise theta-dominance. """
+    size = len(clusters)
+    ranks = [None] * size
+    remaining = set(range(size))
+    front_no = 0
+    while remaining:
+        front = {
+            x
+            for x in remaining
+            if not any(
+                clusters[y] == clusters[x] and theta_fitness[y] < theta_fitness[x]
+                for y in remaining
+            )
+        }
+        for x in front:
+            ranks[x] = front_no
+        remaining -= front
+        front_no += 1
+    return ranks
+
+
+class TestReferenceDirections(unittest.TestCase):
+    def test_das_dennis(self):
+        for objective_no, divisions in [(2, 4), (3, 5), (5, 3)]:
+            with self.subTest(objective_no=objective_no, divisions=divisions):
+                directions = das_dennis_directions(objective_no, divisions)
+                expected = sorted(
+                    point
+                    for point in itertools.product(
+                        range(divisions + 1), repeat=objective_no
+                    )
+                    if sum(point) == divisions
+                )
+                self.assertEqual(
+                    expected,
+                    sorted(
+                        tuple(p)
+                        for p in (directions * divisions).round().astype(int).tolist()
+                    ),
+                )
+                numpy.testing.assert_allclose(directions.sum(axis=1), 1.0)
+
+    def test_divisions_fit_population(self):
+        self.assertEqual(63, reference_divisions(2, 64))
+        self.assertEqual(9, reference_divisions(3, 64))
+        self.assertEqual(len(das_dennis_directions(5, 5)), 126)
+        self.assertEqual(5, reference_divisions(5, 200))
+        self.assertEqual(1, reference_divisions(1, 64))
+        self.assertEqual([[1.0]], das_dennis_directions(1, 1).tolist())
+
+
+class TestNiching(unittest.TestCase):
+    def setUp(self):
+        random.seed(9)
+
+    def test_associate_matches_vector_rejection(self):
+        directions = das_dennis_directions(3, 4)
+        lengths = numpy.linalg.norm(directions, axis=1)
+        points = numpy.array([[random.random() for _ in range(3)] for _ in range(30)])
+        projections, rejections = associate(points, directions, lengths)
+        for i, point in enumerate(points):
+            for k, direction in enumerate(directions):
+                projection = numpy.dot(point, direction) / lengths[k]
+                rejection = numpy.linalg.norm(
+                    point - projection / lengths[k] * direction
+                )
+                self.assertAlmostEqual(projection, projections[i, k])
+                self.assertAlmostEqual(rejection, rejections[i, k])
+
+    def test_theta_sort_matches_pairwise(self):
+        for _ in range(20):
+            size = random.randint(1, 60)
+            clusters = [random.randint(0, 5) for _ in range(size)]
+            theta_fitness = [
+                random.choice([0.5, 1.0, random.random()]) for _ in range(size)
+            ]
+            fronts = theta_non_dominated_sort(clusters, theta_fitness)
+            ranks = [None] * size
+            for front_no, front in enumerate(fronts):
+                self.assertEqual(sorted(front.tolist()), front.tolist())
+                for i in front:
+                    ranks[i] = front_no
+            self.assertEqual(naive_theta_ranks(clusters, theta_fitness), ranks)
+
+    def test_theta_sort_empty(self):
+        self.assertEqual([], theta_non_dominated_sort([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+
+import numpy
+
+from algorithms.base.population import Population, Swarm
+
+
+class TupleKeyDict(dict):
+    """Like the HGS ResultArchive: vectors are stored under tuple keys."""
+
+    def __contains__(self, key):
+        return super().__contains__(tuple(key))
+
+    def __getitem__(self, key):
+        return super().__getitem__(tuple(key))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(tuple(key), value)
+
+
+class TestPopulation(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+
+        def f1(x):
+            self.calls += 1
+            return x[0]
+
+        self.fitnesses = [f1, lambda x: x[0] + x[1]]
+        self.pop = Population.from_vectors([[1, 2], [3, 4], [5, 6]], 2, 2)
+
+    def test_from_vectors(self):
+        self.assertEqual(len(self.pop), 3)
+        self.assertEqual(self.pop.population, [[1, 2], [3, 4], [5, 6]])
+        self.assertFalse(self.pop.evaluated.any())
+        self.assertEqual(len(set(self.pop.ids)), 3)
+        self.assertEqual(Population.from_vectors([], 2, 2).decisions.shape, (0, 2))
+
+    def test_evaluate(self):
+        archive = TupleKeyDict({(3, 4): [30, 70]})
+        self.assertEqual(self.pop.evaluate(self.fitnesses, archive), 2)
+        numpy.testing.assert_array_equal(
+            self.pop.objectives, [[1, 3], [30, 70], [5, 11]]
+        )
+        self.assertEqual(self.pop.evaluate(self.fitnesses, archive), 0)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(archive[(1, 2)], [1, 3])
+
+    def test_views_keep_ids(self):
+        self.pop.rank[:] = [2, 1, 3]
+        selected = self.pop[numpy.array([2, 0])]
+        self.assertEqual(selected.population, [[5, 6], [1, 2]])
+        numpy.testing.assert_array_equal(selected.rank, [3, 2])
+        numpy.testing.assert_array_equal(selected.ids, self.pop.ids[[2, 0]])
+        self.assertEqual(self.pop[self.pop.rank > 1].population, [[1, 2], [5, 6]])
+        self.assertEqual(self.pop[1:].population, [[3, 4], [5, 6]])
+
+    def test_views_share_storage(self):
+        tail = self.pop[1:]
+        tail.decisions[0, 0] = 30
+        reversed_tail = tail[::-1]
+        self.assertEqual(reversed_tail.population, [[5, 6], [30, 4]])
+        self.assertEqual(self.pop[::-1][:1].population, [[5, 6]])
+
+        selected = self.pop[[2, 0]]
+        selected.rank = [7, 8]
+        numpy.testing.assert_array_equal(self.pop.rank, [8, 0, 7])
+        selected[[0]].crowding = [1.5]
+        numpy.testing.assert_array_equal(self.pop.crowding, [0, 0, 1.5])
+
+        copied = selected.copy()
+        copied.rank = [0, 0]
+        numpy.testing.assert_array_equal(self.pop.rank, [8, 0, 7])
+        numpy.testing.assert_array_equal(copied.ids, selected.ids)
+
+    def test_evaluate_view(self):
+        tail = self.pop[1:]
+        self.assertEqual(tail.evaluate(self.fitnesses), 2)
+        self.assertEqual(self.pop.evaluated.tolist(), [False, True, True])
+        numpy.testing.assert_array_equal(self.pop.objectives[1:], [[3, 7], [5, 11]])
+
+    def test_partition(self):
+        rest, taken = self.pop.partition([[5, 6], [1, 2], [9, 9]])
+        self.assertEqual(rest.population, [[3, 4]])
+        self.assertEqual([p.population for p in taken], [[[1, 2]], [[5, 6]]])
+        numpy.testing.assert_array_equal(taken[0].ids, self.pop.ids[:1])
+
+    def test_swarm_columns(self):
+        swarm = Swarm.from_vectors([[1, 2], [3, 4]], 2, 1)
+        numpy.testing.assert_array_equal(swarm.speed, numpy.zeros((2, 2)))
+        self.assertTrue(numpy.isnan(swarm.best_objectives).all())
+        swarm.objectives = [[1], [2]]
+        moved = Swarm.concat(swarm, swarm[[0]])
+        self.assertIsInstance(moved, Swarm)
+        self.assertEqual(
+            [(p.value, p.objectives) for p in moved.leaders()],
+            [([1, 2], [1]), ([3, 4], [2]), ([1, 2], [1])],
+        )
+
+    def test_concat_and_unique(self):
+        union = Population.concat(self.pop, self.pop[[1]], self.pop[[0]])
+        self.assertEqual(len(union), 5)
+        self.assertEqual(union.unique().population, self.pop.population)
@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from algorithms.SPEA2.SPEA2 import SPEA2
+from algorithms.base.population import Population
+from benchmarks.spea2 import LegacySelection
+
+
+class TestSPEA2Selection(unittest.TestCase):
+    def setUp(self):
+        random.seed(17)
+
+    def make_driver(self, archive_size):
+        return SPEA2(
+            [[0.0, 0.0]] * archive_size,
+            [lambda x: x[0], lambda x: x[1]],
+            [(0, 1), (0, 1)],
+            mutation_eta=20,
+            mutation_rate=0.1,
+            crossover_eta=15,
+            crossover_rate=0.9,
+        )
+
+    def random_union(self, size, objectives_no, coarse):
+        def value():
+            # a coarse grid produces duplicates and equal distances
+            return random.randint(0, 6) / 3 if coarse else random.random()
+
+        union = []
+        for _ in range(size):
+            head = [value() for _ in range(objectives_no - 1)]
+            union.append({"value": head, "objectives": head + [value() - sum(head)]})
+        return union
+
+    def check_selection(self, archive_size, union_size, objectives_no, coarse):
+        expected_union = self.random_union(union_size, objectives_no, coarse)
+        legacy = LegacySelection(archive_size)
+        legacy.calculate_fitnesses(expected_union)
+        expected = legacy.environmental_selection(expected_union)
+
+        union = Population(
+            [p["value"] for p in expected_union],
+            [p["objectives"] for p in expected_union],
+        )
+        driver = self.make_driver(archive_size)
+        driver.calculate_objectives = lambda pop: 0
+        archive, population = union[: union_size // 2], union[union_size // 2 :]
+        driver.calculate_fitnesses(population, archive)
+        for p_fitness, q in zip(union.fitness, expected_union):
+            self.assertAlmostEqual(q["fitness"], p_fitness)
+        selected = driver.environmental_selection(population, archive)
+
+        positions = {i: position for position, i in enumerate(union.ids.tolist())}
+        expected_positions = {
+            id(q): position for position, q in enumerate(expected_union)
+        }
+        self.assertEqual(
+            [positions[i] for i in selected.ids.tolist()],
+            [expected_positions[id(q)] for q in expected],
+        )
+
+    def test_matches_legacy_selection(self):
+        for objectives_no in [2, 3]:
+            for coarse in [False, True]:
+                for archive_size, union_size in [(5, 10), (10, 20), (16, 40), (30, 45)]:
+                    with self.subTest(
+                        objectives_no=objectives_no,
+                        coarse=coarse,
+                        archive_size=archive_size,
+                        union_size=union_size,
+                    ):
+                        self.check_selection(
+                            archive_size, union_size, objectives_no, coarse
+                        )
+
+
+if __name__ == "__main__":
+    unittest.main()
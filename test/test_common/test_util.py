@@ -17,3 +17,16 @@ def non_decreasing(L):
 
 def monotonic(L):
     return non_increasing(L) or non_decreasing(L)
+
+
+# Reference crowding distance of one front: a sort per objective
+def naive_crowding(objectives, front):
+    distances = {i: 0.0 for i in front}
+    for m in range(len(objectives[0])):
+        ordered = sorted(front, key=lambda i: objectives[i][m])
+        span = objectives[ordered[-1]][m] - objectives[ordered[0]][m]
+        distances[ordered[0]] = distances[ordered[-1]] = float("inf")
+        for prev, i, next_ in zip(ordered, ordered[1:], ordered[2:]):
+            if span > 0:
+                distances[i] += (objectives[next_][m] - objectives[prev][m]) / span
+    return distances
@@ -0,0 +1,49 @@
+import random
+import unittest
+
+import numpy
+
+from evotools.crowding import crowding_distance
+from evotools.nondominated import non_dominated_sort
+from test.test_common.test_util import naive_crowding
+
+
+class TestCrowdingDistance(unittest.TestCase):
+    def setUp(self):
+        random.seed(5)
+
+    def random_objectives(self, size, objectives_no):
+        # distinct values, so the sorting order of every objective is unique
+        return [[random.random() for _ in range(objectives_no)] for _ in range(size)]
+
+    def test_matches_naive_per_front(self):
+        for objectives_no in [2, 3, 5]:
+            for size in [1, 2, 3, 10, 60]:
+                with self.subTest(objectives_no=objectives_no, size=size):
+                    objectives = self.random_objectives(size, objectives_no)
+                    fronts = non_dominated_sort(objectives)
+                    distances = crowding_distance(objectives, fronts)
+                    for front in fronts:
+                        expected = naive_crowding(objectives, list(front))
+                        for i, value in expected.items():
+                            self.assertAlmostEqual(value, distances[i])
+
+    def test_single_front_by_default(self):
+        objectives = [[0.0, 4.0], [1.0, 2.0], [3.0, 1.0], [4.0, 0.0]]
+        numpy.testing.assert_allclose(
+            crowding_distance(objectives),
+            [numpy.inf, 3 / 4 + 3 / 4, 3 / 4 + 2 / 4, numpy.inf],
+        )
+
+    def test_constant_objective_adds_nothing(self):
+        objectives = [[0.0, 1.0], [1.0, 1.0], [2.0, 1.0], [4.0, 1.0]]
+        numpy.testing.assert_allclose(
+            crowding_distance(objectives), [numpy.inf, 2 / 4, 3 / 4, numpy.inf]
+        )
+
+    def test_empty(self):
+        self.assertEqual(0, len(crowding_distance(numpy.zeros((0, 2)), [])))
+
+
+if __name__ == "__main__":
+    unittest.main()
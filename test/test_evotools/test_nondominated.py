@@ -0,0 +1,112 @@
+import random
+import unittest
+
+import numpy
+
+from evotools import nondominated
+from evotools.ea_utils import dominates, paretofront_layers
+
+
+def naive_sort(objectives):
+    remaining = list(range(len(objectives)))
+    fronts = []
+    while remaining:
+        front = [
+            i
+            for i in remaining
+            if not any(dominates(objectives[j], objectives[i]) for j in remaining)
+        ]
+        fronts.append(front)
+        remaining = [i for i in remaining if i not in front]
+    return fronts
+
+
+class TestNonDominatedSort(unittest.TestCase):
+    def setUp(self):
+        random.seed(7)
+
+    def random_objectives(self, size, objectives_no):
+        # coarse values produce plenty of ties and duplicates
+        return [
+            [random.choice([0.0, 1.0, 2.0, random.random()]) for _ in range(objectives_no)]
+            for _ in range(size)
+        ]
+
+    def assertSameFronts(self, expected, fronts):
+        self.assertListEqual(expected, [list(front) for front in fronts])
+
+    def test_empty(self):
+        self.assertListEqual([], nondominated.non_dominated_sort([]))
+
+    def test_simple(self):
+        objectives = [[0, 0], [1, 1], [0, 1], [1, 0], [1, 1]]
+        self.assertSameFronts(
+            [[0], [2, 3], [1, 4]], nondominated.non_dominated_sort(objectives)
+        )
+
+    def test_all_variants_match_naive_sort(self):
+        variants = [
+            nondominated._pairwise_sort,
+            nondominated._binary_search_sort,
+            nondominated.non_dominated_sort,
+        ]
+        for objectives_no in [1, 2, 3, 5]:
+            for _ in range(20):
+                objectives = self.random_objectives(random.randint(1, 80), objectives_no)
+                expected = naive_sort(objectives)
+                for variant in variants:
+                    with self.subTest(variant=variant.__name__, m=objectives_no):
+                        self.assertSameFronts(
+                            expected, variant(numpy.array(objectives))
+                        )
+
+    def test_sweep_2d_matches_naive_sort(self):
+        for _ in range(20):
+            objectives = self.random_objectives(random.randint(1, 200), 2)
+            self.assertSameFronts(
+                naive_sort(objectives),
+                nondominated._sweep_sort_2d(numpy.array(objectives)),
+            )
+
+    def test_large_population_matches_pairwise(self):
+        objectives = numpy.random.RandomState(3).rand(
+            nondominated.PAIRWISE_SORT_LIMIT + 100, 3
+        )
+        self.assertSameFronts(
+            [list(front) for front in nondominated._pairwise_sort(objectives)],
+            nondominated.non_dominated_sort(objectives),
+        )
+
+    def test_ranks(self):
+        fronts = nondominated.non_dominated_sort([[1, 1], [0, 0], [2, 2]])
+        self.assertListEqual(
+            [2, 1, 3], list(nondominated.fronts_to_ranks(fronts, 3))
+        )
+
+    def test_filter_matches_first_front(self):
+        for objectives_no in [1, 2, 3, 4, 6]:
+            for _ in range(10):
+                size = random.randint(1, 300 if objectives_no > 3 else 150)
+                objectives = self.random_objectives(size, objectives_no)
+                with self.subTest(m=objectives_no, n=size):
+                    self.assertListEqual(
+                        naive_sort(objectives)[0],
+                        list(nondominated.non_dominated_filter(objectives)),
+                    )
+
+    def test_filter_keeps_duplicates(self):
+        objectives = [[1, 0, 1], [0, 1, 1], [1, 0, 1], [1, 1, 1]]
+        self.assertListEqual(
+            [0, 1, 2], list(nondominated.non_dominated_filter(objectives))
+        )
+
+    def test_paretofront_layers_keeps_individuals(self):
+        individuals = [("a", [1, 1]), ("b", [0, 0]), ("c", [0, 1])]
+        layers = list(paretofront_layers(individuals, lambda ind: ind[1]))
+        self.assertListEqual(
+            [["b"], ["c"], ["a"]], [[ind[0] for ind in layer] for layer in layers]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
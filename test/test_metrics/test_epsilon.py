@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from metrics.epsilon import Epsilon
+
+
+def naive_epsilon(solution, pareto, obj):
+    return max(
+        min(
+            max(
+                (p_k - s_k) if obj_k == 0 else (s_k - p_k)
+                for p_k, s_k, obj_k in zip(p, s, obj)
+            )
+            for p in pareto
+        )
+        for s in solution
+    )
+
+
+class MixedDirections(Epsilon):
+    def set_params(self):
+        self._obj = [k % 2 for k in range(self._dim)]
+
+
+class TestEpsilon(unittest.TestCase):
+    def setUp(self):
+        random.seed(4)
+
+    def random_set(self, size, dims):
+        return [[random.uniform(-1, 2) for _ in range(dims)] for _ in range(size)]
+
+    def test_matches_naive(self):
+        for indicator in [Epsilon(), MixedDirections()]:
+            for dims in [2, 3]:
+                with self.subTest(indicator=type(indicator).__name__, dims=dims):
+                    solution = self.random_set(40, dims)
+                    pareto = self.random_set(70, dims)
+                    indicator._dim = dims
+                    indicator.set_params()
+                    self.assertEqual(
+                        naive_epsilon(solution, pareto, indicator._obj),
+                        indicator.epsilon(solution, pareto),
+                    )
+
+    def test_chunks(self):
+        solution = self.random_set(50, 3)
+        pareto = self.random_set(30, 3)
+        indicator = Epsilon()
+        expected = indicator.epsilon(solution, pareto)
+        indicator.chunk_size = 1
+        self.assertEqual(expected, indicator.epsilon(solution, pareto))
+
+    def test_empty_solution(self):
+        self.assertEqual(float("-inf"), Epsilon().epsilon([], [[0.0, 1.0]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import math
+import random
+import unittest
+
+import numpy
+
+from metrics import metrics_utils
+from metrics.metrics_utils import EPSILON, euclid_sqr_distance
+
+
+def naive_distance(from_set, to_set):
+    distances = [min(euclid_sqr_distance(f, t) for t in to_set) for f in from_set]
+    return math.sqrt(sum(distances) / len(distances))
+
+
+def naive_spacing(solution):
+    dims = len(solution[0])
+    min_distances = []
+    for i, ind_a in enumerate(solution):
+        distances = [
+            sum([math.fabs(ind_a[k] - ind_b[k]) for k in range(dims)])
+            for j, ind_b in enumerate(solution)
+            if not i == j
+        ]
+        if len(distances) > 0:
+            min_distances.append(min(distances))
+    mean_dist = numpy.mean(min_distances) if len(min_distances) > 0 else 0
+    dist_sum = sum([(mean_dist - dist) ** 2 for dist in min_distances])
+    return math.sqrt(dist_sum / (float(len(solution) - 1) + EPSILON))
+
+
+def naive_extent(solution):
+    return math.sqrt(
+        sum(
+            max(math.fabs(x[i] - y[i]) for x in solution for y in solution)
+            for i in range(len(solution[0]))
+        )
+    )
+
+
+class TestFrontDistances(unittest.TestCase):
+    def setUp(self):
+        random.seed(21)
+
+    def random_set(self, size, dims):
+        return [[random.random() for _ in range(dims)] for _ in range(size)]
+
+    def test_matches_naive(self):
+        for dims in [2, 3, 5]:
+            with self.subTest(dims=dims):
+                pareto = self.random_set(200, dims)
+                solution = self.random_set(30, dims)
+                self.assertAlmostEqual(
+                    naive_distance(solution, pareto),
+                    metrics_utils.generational_distance(solution, pareto),
+                )
+                self.assertAlmostEqual(
+                    naive_distance(pareto, solution),
+                    metrics_utils.inverse_generational_distance(solution, pareto),
+                )
+
+    def test_front_tree_is_cached(self):
+        pareto = self.random_set(50, 2)
+        self.addCleanup(metrics_utils._FRONT_TREES.clear)
+        tree = metrics_utils.front_tree("test_problem", pareto)
+        self.assertIs(tree, metrics_utils.front_tree("test_problem", list(pareto)))
+        self.assertIsNot(tree, metrics_utils.front_tree("other_problem", pareto))
+        self.assertAlmostEqual(
+            metrics_utils.generational_distance(pareto[:10], pareto),
+            metrics_utils.generational_distance(pareto[:10], pareto, "test_problem"),
+        )
+
+    def test_empty_solution(self):
+        with self.assertRaises(ZeroDivisionError):
+            metrics_utils.generational_distance([], [[0.0, 1.0]])
+
+
+class TestSpacingAndExtent(unittest.TestCase):
+    def setUp(self):
+        random.seed(8)
+
+    def random_sets(self):
+        for size in [1, 2, 3, 10, 100]:
+            for dims in [2, 3, 5]:
+                yield [
+                    [random.uniform(-3, 3) for _ in range(dims)] for _ in range(size)
+                ]
+                # a coarse grid: duplicates and equally distant neighbours
+                yield [
+                    [random.randint(0, 3) / 2 for _ in range(dims)] for _ in range(size)
+                ]
+
+    def test_spacing_identical_to_pairwise(self):
+        for solution in self.random_sets():
+            with self.subTest(size=len(solution), dims=len(solution[0])):
+                self.assertEqual(
+                    naive_spacing(solution), metrics_utils.spacing(solution)
+                )
+
+    def test_extent_identical_to_pairwise(self):
+        for solution in self.random_sets():
+            with self.subTest(size=len(solution), dims=len(solution[0])):
+                self.assertEqual(naive_extent(solution), metrics_utils.extent(solution))
+
+
+if __name__ == "__main__":
+    unittest.main()
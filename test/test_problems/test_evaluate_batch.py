@@ -0,0 +1,107 @@
+import importlib
+import random
+import unittest
+
+import numpy
+
+from algorithms.base.drivertools import (
+    ProblemFitnesses,
+    evaluate_individuals,
+    evaluate_population,
+    evaluate_vector,
+)
+
+PROBLEMS = ["ZDT1", "ZDT2", "ZDT3", "ZDT4", "ZDT6"] + [
+    "UF{}".format(i) for i in range(1, 13)
+]
+
+
+def random_vectors(problem_mod, count):
+    xs = [[random.uniform(a, b) for a, b in problem_mod.dims] for _ in range(count)]
+    xs.append([a for a, _ in problem_mod.dims])
+    xs.append([b for _, b in problem_mod.dims])
+    return xs
+
+
+class TestEvaluate(unittest.TestCase):
+    def setUp(self):
+        random.seed(5)
+
+    def test_matches_scalar_fitnesses(self):
+        for problem in PROBLEMS:
+            with self.subTest(problem=problem):
+                problem_mod = importlib.import_module(
+                    "problems.{}.problem".format(problem)
+                )
+                for x in random_vectors(problem_mod, 50):
+                    result = problem_mod.evaluate(x)
+                    self.assertIsInstance(result, tuple)
+                    self.assertEqual(
+                        list(result), [f(x) for f in problem_mod.fitnesses]
+                    )
+
+
+class TestEvaluateBatch(unittest.TestCase):
+    def setUp(self):
+        random.seed(7)
+
+    def test_matches_scalar_fitnesses(self):
+        for problem in PROBLEMS:
+            with self.subTest(problem=problem):
+                problem_mod = importlib.import_module(
+                    "problems.{}.problem".format(problem)
+                )
+                xs = random_vectors(problem_mod, 50)
+                expected = [[f(x) for f in problem_mod.fitnesses] for x in xs]
+                result = problem_mod.evaluate_batch(numpy.array(xs))
+                numpy.testing.assert_allclose(result, expected, rtol=1e-10, atol=1e-10)
+
+
+class TestEvaluateIndividuals(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+
+        def f1(x):
+            self.calls += 1
+            return x[0]
+
+        def batch(xs):
+            self.calls += len(xs)
+            return numpy.column_stack([xs[:, 0], xs[:, 0] + xs[:, 1]])
+
+        def evaluate(x):
+            self.calls += 1
+            return x[0], x[0] + x[1]
+
+        self.scalar = [f1, lambda x: x[0] + x[1]]
+        self.batched = ProblemFitnesses(self.scalar, batch, evaluate)
+
+    def test_population(self):
+        xs = [[1, 2], [3, 4]]
+        self.assertEqual(evaluate_population(self.scalar, xs), [[1, 3], [3, 7]])
+        self.assertEqual(evaluate_population(self.batched, xs), [[1, 3], [3, 7]])
+        self.assertEqual(evaluate_population(self.batched, []), [])
+
+    def test_vector(self):
+        self.assertEqual(evaluate_vector(self.scalar, [1, 2]), [1, 3])
+        self.assertEqual(evaluate_vector(self.batched, [1, 2]), [1, 3])
+        self.assertEqual(self.calls, 2)
+
+    def test_archive(self):
+        archive = {(1, 2): [10, 20]}
+        xs = [(1, 2), (3, 4), (3, 4)]
+        results, evaluated = evaluate_individuals(self.batched, xs, archive)
+        self.assertEqual(results, [[10, 20], [3, 7], [3, 7]])
+        self.assertEqual(evaluated, [False, True, False])
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(archive[(3, 4)], [3, 7])
+
+    def test_archive_without_store(self):
+        archive = {(1, 2): [10, 20]}
+        xs = [(3, 4), (3, 4), (1, 2)]
+        results, evaluated = evaluate_individuals(
+            self.batched, xs, archive, store=False
+        )
+        self.assertEqual(results, [[3, 7], [3, 7], [10, 20]])
+        self.assertEqual(evaluated, [True, True, False])
+        self.assertNotIn((3, 4), archive)
@@ -0,0 +1,193 @@
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from algorithms.base import drivertools
+from algorithms.base.driver import Driver
+from simulation import factory
+from simulation.checkpoint import Checkpoint
+from simulation.factory import prepare
+from simulation.model import SimulationCase
+from simulation.serializer import Serializer
+from simulation.worker import BudgetWorker, SimulationWorker, TimeWorker
+
+
+class CountingDriver(Driver):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counter = 0
+
+    def finalized_population(self):
+        return [[float(self.counter)]]
+
+    def step(self):
+        time.sleep(0.1)
+        self.counter += 1
+        self.cost += 1
+
+
+class LocalStateDriver(CountingDriver):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.callback = lambda: None
+
+
+class CountingProblem:
+    fitnesses = [sum]
+
+
+def fixed_seed(_self, _logger):
+    random.seed(1)
+    drivertools.seed_generator(1)
+
+
+def other_seed(_self, _logger):
+    random.seed(2)
+    drivertools.seed_generator(2)
+
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory(prefix="evogil_checkpoint_")
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name)
+
+    def test_restores_driver_and_random_state(self):
+        driver = CountingDriver()
+        driver.next_step()
+        checkpoint = Checkpoint(self.path)
+        checkpoint.save(driver, budget=1)
+        expected = random.random()
+        driver.next_step()
+
+        restored = CountingDriver()
+        progress = Checkpoint(self.path).restore(restored)
+
+        self.assertEqual(progress, {"budget": 1})
+        self.assertEqual((restored.counter, restored.step_no), (1, 1))
+        self.assertIs(restored.message_adapter.driver, restored)
+        self.assertEqual(random.random(), expected)
+
+    def test_saves_every_steps(self):
+        driver = CountingDriver()
+        checkpoint = Checkpoint(self.path, interval=0, steps=3)
+        for _ in range(2):
+            checkpoint.tick(driver)
+        self.assertFalse(checkpoint.exists())
+        checkpoint.tick(driver)
+        self.assertTrue(checkpoint.exists())
+
+    def test_unpicklable_driver_turns_checkpoints_off(self):
+        checkpoint = Checkpoint(self.path)
+        with self.assertLogs("simulation.checkpoint", "WARNING"):
+            checkpoint.save(LocalStateDriver())
+        checkpoint.save(CountingDriver())
+        self.assertFalse(checkpoint.enabled)
+        self.assertFalse(checkpoint.exists())
+
+    def test_no_checkpoint(self):
+        self.assertIsNone(Checkpoint(self.path).restore(CountingDriver()))
+
+
+@mock.patch.object(SimulationWorker, "_init_random_seed", fixed_seed)
+class BudgetWorkerResumeTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory(prefix="evogil_checkpoint_")
+        self.addCleanup(temp_dir.cleanup)
+        self.results_dir = temp_dir.name
+        patcher = mock.patch.object(factory, "prepare", prepare)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def simulation(self, budgets, id, keep_checkpoints=True):
+        return SimulationCase(
+            "ZDT1",
+            "NSGAII",
+            0,
+            None,
+            self.results_dir,
+            id=id,
+            budgets=budgets,
+            keep_checkpoints=keep_checkpoints,
+        )
+
+    def test_checkpoint_is_removed_after_last_budget(self):
+        simulation = self.simulation(
+            [300], "2020-01-01.000000.000000__0000001", keep_checkpoints=False
+        )
+        BudgetWorker(simulation, 0).run()
+
+        serializer = Serializer(simulation)
+        self.assertTrue(serializer.find_result_path("300").exists())
+        self.assertFalse(Checkpoint(serializer.path).exists())
+
+    def test_resumed_run_matches_uninterrupted(self):
+        uninterrupted = self.simulation([300, 600], "2020-01-01.000000.000000__0000001")
+        BudgetWorker(uninterrupted, 0).run()
+
+        interrupted = self.simulation([300], "2020-01-01.000000.000000__0000002")
+        BudgetWorker(interrupted, 0).run()
+        stored = Serializer(interrupted).find_result_path("300").stat().st_mtime_ns
+
+        interrupted.params[factory.BUDGETS_PARAM] = [300, 600]
+        # the random state comes from the checkpoint
+        with mock.patch.object(SimulationWorker, "_init_random_seed", other_seed):
+            results, _, _ = BudgetWorker(interrupted, 0).run()
+
+        self.assertEqual(len(results), 1)
+        serializer = Serializer(interrupted)
+        self.assertEqual(serializer.find_result_path("300").stat().st_mtime_ns, stored)
+        expected = Serializer(uninterrupted).load("600")
+        resumed = serializer.load("600")
+        self.assertEqual(resumed.additional_data, expected.additional_data)
+        self.assertEqual(resumed.population.tolist(), expected.population.tolist())
+
+    def test_budgets_before_checkpoint_are_skipped(self):
+        simulation = self.simulation([600], "2020-01-01.000000.000000__0000001")
+        BudgetWorker(simulation, 0).run()
+
+        simulation.params[factory.BUDGETS_PARAM] = [300, 600, 900]
+        with self.assertLogs("simulation.worker", "WARNING"):
+            results, _, _ = BudgetWorker(simulation, 0).run()
+
+        self.assertEqual(len(results), 1)
+        serializer = Serializer(simulation)
+        self.assertFalse(serializer.find_result_path("300").exists())
+        self.assertTrue(serializer.find_result_path("900").exists())
+
+
+class TimeWorkerResumeTest(unittest.TestCase):
+    def test_resumes_from_stored_slot(self):
+        with tempfile.TemporaryDirectory(prefix="evogil_checkpoint_") as temp_dir:
+            simulation = SimulationCase(
+                "test_problem",
+                "test_algo",
+                0,
+                None,
+                temp_dir,
+                timeout=1,
+                sampling_interval=1,
+            )
+            serializer = Serializer(simulation)
+            checkpoint = Checkpoint(serializer.path)
+            preparation = mock.patch.object(
+                factory, "prepare", lambda *_: (CountingDriver, CountingProblem())
+            )
+            # keeps the checkpoint of the finished run, as if it was stopped
+            # right after the first slot
+            with preparation, mock.patch.object(Checkpoint, "remove"):
+                TimeWorker(simulation, 0).run()
+            self.assertTrue(checkpoint.exists())
+            first_slot = serializer.load("1").population.tolist()
+
+            simulation.params[factory.TIMEOUT_PARAM] = 2
+            with preparation:
+                results, _, _ = TimeWorker(simulation, 0).run()
+
+            self.assertEqual(len(results), 1)
+            self.assertEqual(serializer.load("1").population.tolist(), first_slot)
+            self.assertGreater(serializer.load("2").population.tolist(), first_slot)
+            self.assertFalse(checkpoint.exists())
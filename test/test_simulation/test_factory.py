@@ -0,0 +1,89 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from simulation import factory, results_catalog, serializer
+from simulation.checkpoint import CHECKPOINT_NAME
+from simulation.model import SimulationCase
+
+RUNS = [
+    "2020-01-01.000000.000000__0000001",
+    "2020-01-02.000000.000000__0000002",
+    "2020-01-03.000000.000000__0000003",
+]
+
+
+class TestResumeBudgetSimulation(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.results_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        results_catalog._catalogs.clear()
+        self.tmp.cleanup()
+
+    def store(self, run, *budgets, checkpoint=True):
+        case = SimulationCase("ZDT1", "NSGAII", 1, None, self.tmp.name, run)
+        storage = serializer.Serializer(case)
+        for budget in budgets:
+            storage.store(serializer.Result([[0.5]], [[1.0, 1.0]]), budget)
+        if checkpoint:
+            storage.path.mkdir(parents=True, exist_ok=True)
+            (storage.path / CHECKPOINT_NAME).touch()
+
+    def resume(self, runs_no, budgets):
+        simulation_cases = [
+            SimulationCase(
+                "ZDT1", "NSGAII", run_id, None, self.tmp.name, budgets=budgets
+            )
+            for run_id in range(runs_no)
+        ]
+        return factory.resume_budget_simulation(simulation_cases)
+
+    def test_continues_stored_runs(self):
+        self.store(RUNS[0], 300, 600)
+        self.store(RUNS[1], 300)
+
+        resumed = self.resume(3, [300, 600])
+
+        self.assertEqual(RUNS[1], resumed[0].id)
+        self.assertEqual([1, 2], [s.run_id for s in resumed])
+        self.assertNotIn(resumed[1].id, RUNS)
+
+    def test_extends_budgets(self):
+        self.store(RUNS[0], 300, 600)
+
+        resumed = self.resume(1, [300, 600, 900])
+
+        self.assertEqual([RUNS[0]], [s.id for s in resumed])
+
+    def test_lower_budgets_are_left_missing(self):
+        self.store(RUNS[0], 600)
+
+        with self.assertLogs(factory.logger, "WARNING"):
+            resumed = self.resume(1, [300, 600])
+
+        self.assertEqual([], resumed)
+
+    def test_run_without_checkpoint_is_replaced(self):
+        self.store(RUNS[0], 300, checkpoint=False)
+
+        resumed = self.resume(1, [300, 600])
+
+        self.assertEqual(1, len(resumed))
+        self.assertNotIn(resumed[0].id, RUNS)
+
+    def test_replaced_run_is_not_replaced_again(self):
+        self.store(RUNS[0], 300, checkpoint=False)
+        self.store(RUNS[1], 300, 600, checkpoint=False)
+
+        resumed = self.resume(1, [300, 600])
+
+        self.assertEqual([], resumed)
+
+    def test_run_known_only_by_checkpoint(self):
+        self.store(RUNS[2])
+
+        resumed = self.resume(1, [300])
+
+        self.assertEqual([RUNS[2]], [s.id for s in resumed])
@@ -0,0 +1,127 @@
+import multiprocessing
+import pickle
+import tempfile
+import unittest
+from functools import partial
+from pathlib import Path
+
+from evotools.random_tools import close_and_join
+from simulation import metric_store, metrics_processor
+from statistic import stats
+
+
+class FakeResult:
+    def __init__(self, path):
+        self.path = path
+        self.name = path.with_suffix("").name
+        self.fitnesses = [[0.0, 1.0], [1.0, 0.0]]
+        self.non_dominated_fitnesses = self.fitnesses
+
+
+def store_value(problem_path, key, value):
+    metric_store.store_for_problem(problem_path).put(key, value)
+    return value
+
+
+class TestMetricStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.problem_path = Path(self.tmp.name, "ZDT1")
+        self.run_path = (
+            self.problem_path / "NSGAII" / "2020-01-01.000000.000000__0000001"
+        )
+        self.run_path.mkdir(parents=True)
+
+    def tearDown(self):
+        metric_store._stores.clear()
+        self.tmp.cleanup()
+
+    def test_values_survive_reopening(self):
+        key = metric_store.result_key(
+            self.run_path / "500.pickle", "spacing", metric_store.params_digest({})
+        )
+        store = metric_store.MetricStore(self.problem_path)
+        store.put(key, 0.25)
+        store.close()
+
+        reopened = metric_store.MetricStore(self.problem_path)
+        self.assertEqual(0.25, reopened.get(key))
+        with self.assertRaises(KeyError):
+            reopened.get(key[:3] + ("extent", key[4]))
+
+    def test_values_computed_in_pool_are_stored(self):
+        keys = [
+            metric_store.result_key(
+                self.run_path / f"{budget}.npres", "gd", metric_store.params_digest({})
+            )
+            for budget in [500, 1000, 1500]
+        ]
+        data_process = [
+            partial(store_value, self.problem_path, key, float(i))
+            for i, key in enumerate(keys)
+        ]
+        with close_and_join(multiprocessing.Pool(1)) as pool:
+            pool.map(stats.force_data, [(10, ("gd", "gd", data_process))])
+
+        stored = metric_store.MetricStore(self.problem_path)
+        self.assertEqual([0.0, 1.0, 2.0], [stored.get(key) for key in keys])
+        stored.close()
+
+    def test_params_digest(self):
+        digest = metric_store.params_digest
+        self.assertEqual(
+            digest({"all_solutions": {(1.0, 2.0), (3.0, 4.0), (0.0, 5.0)}}),
+            digest({"all_solutions": {(0.0, 5.0), (3.0, 4.0), (1.0, 2.0)}}),
+        )
+        self.assertNotEqual(
+            digest({"pareto": [[0.0, 1.0]]}), digest({"pareto": [[0.0, 1.5]]})
+        )
+
+    def test_delete_metric(self):
+        store = metric_store.MetricStore(self.problem_path)
+        pdi = metric_store.result_key(
+            self.run_path / "500.pickle",
+            "pareto_dominance_indicator",
+            metric_store.params_digest({}),
+        )
+        gd = metric_store.result_key(
+            self.run_path / "500.pickle", "gd", metric_store.params_digest({})
+        )
+        store.put(pdi, 0.5)
+        store.put(gd, 0.1)
+        store.delete_metric("pareto_dominance_indicator")
+        store.close()
+
+        reopened = metric_store.MetricStore(self.problem_path)
+        self.assertEqual(0.1, reopened.get(gd))
+        with self.assertRaises(KeyError):
+            reopened.get(pdi)
+
+    def test_get_metric_computes_once(self):
+        result = FakeResult(self.run_path / "500.pickle")
+        pareto = [[0.0, 1.0], [1.0, 0.0]]
+        value = metrics_processor.generational_distance(result, pareto)
+        result.fitnesses = result.non_dominated_fitnesses = None
+        self.assertEqual(value, metrics_processor.generational_distance(result, pareto))
+        self.assertEqual([], list(self.run_path.glob("*.generational_distance.pickle")))
+
+    def test_reads_legacy_pickles(self):
+        result = FakeResult(self.run_path / "500.pickle")
+        legacy = {
+            "value": 42.0,
+            "metric": {
+                "name": "spacing",
+                "module": None,
+                "params": {"pareto": [[1.0]]},
+            },
+        }
+        with (self.run_path / "500.spacing.pickle").open(mode="wb") as fh:
+            pickle.dump(legacy, fh)
+
+        self.assertEqual(42.0, metrics_processor.spacing(result, [[1.0]]))
+        # other params - computed instead of reusing the file
+        self.assertNotEqual(42.0, metrics_processor.spacing(result, [[2.0]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from simulation import results_catalog, serializer
+from simulation.model import SimulationCase
+from simulation.serialization import BudgetResultsExtractor
+
+RUNS = ["2020-01-01.000000.000000__0000001", "2020-01-02.000000.000000__0000002"]
+
+
+class TestResultsCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.results_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        results_catalog._catalogs.clear()
+        self.tmp.cleanup()
+
+    def store(self, algo, run, budget):
+        case = SimulationCase("ZDT1", algo, 1, None, self.tmp.name, run)
+        return serializer.Serializer(case).store(
+            serializer.Result([[0.5]], [[float(budget), 1.0]], cost=budget), budget
+        )
+
+    def test_store_registers_results(self):
+        self.store("NSGAII", RUNS[1], 600)
+        self.store("NSGAII", RUNS[0], 300)
+        self.store("SPEA2", RUNS[0], 300)
+
+        catalog = results_catalog.ResultsCatalog(self.results_dir)
+        self.assertEqual(["ZDT1"], catalog.problems())
+        self.assertEqual(["NSGAII", "SPEA2"], catalog.algorithms("ZDT1"))
+        self.assertEqual(RUNS, catalog.runs("ZDT1", "NSGAII"))
+        self.assertEqual(
+            [(600, "600.npres")], catalog.results("ZDT1", "NSGAII", RUNS[1])
+        )
+        self.assertEqual(
+            [
+                ("NSGAII", RUNS[0], 300, "300.npres"),
+                ("NSGAII", RUNS[1], 600, "600.npres"),
+            ],
+            catalog.problem_results("ZDT1")[:2],
+        )
+
+    def test_new_catalog_indexes_legacy_tree(self):
+        legacy_run = self.results_dir / "ZDT1" / "NSGAII" / RUNS[0]
+        legacy_run.mkdir(parents=True)
+        (legacy_run / "300.pickle").touch()
+
+        self.store("NSGAII", RUNS[1], 300)
+
+        catalog = results_catalog.catalog_for(self.results_dir)
+        self.assertEqual(RUNS, catalog.runs("ZDT1", "NSGAII"))
+        self.assertEqual(
+            [(300, "300.pickle")], catalog.results("ZDT1", "NSGAII", RUNS[0])
+        )
+
+    def test_rebuild_indexes_legacy_tree(self):
+        run_path = self.results_dir / "ZDT1" / "NSGAII" / RUNS[0]
+        run_path.mkdir(parents=True)
+        for name in ["300.pickle", "600.pickle", "600.npres", "600.spacing.pickle"]:
+            (run_path / name).touch()
+        (self.results_dir / "ZDT1" / "NSGAII" / "notes").mkdir()
+
+        catalog = results_catalog.ResultsCatalog(self.results_dir)
+        self.assertEqual(2, catalog.rebuild())
+        self.assertEqual(
+            [(300, "300.pickle"), (600, "600.npres")],
+            catalog.results("ZDT1", "NSGAII", RUNS[0]),
+        )
+        self.assertEqual([RUNS[0]], catalog.runs("ZDT1", "NSGAII"))
+
+    def test_extractor_reads_catalog(self):
+        self.store("NSGAII", RUNS[0], 300)
+        self.store("NSGAII", RUNS[1], 300)
+        self.store("NSGAII", RUNS[1], 600)
+        # not in the catalog until it is rebuilt
+        (self.results_dir / "ZDT1" / "NSGAII" / RUNS[0] / "900.npres").touch()
+
+        loaded = BudgetResultsExtractor().load("NSGAII", "ZDT1", self.tmp.name)
+        self.assertEqual([300, 600], [config["budget"] for _, config in loaded])
+        budget_300 = loaded[0][0]
+        self.assertEqual([0, 1], [result.run_no for result in budget_300])
+        self.assertEqual([[300.0, 1.0]], budget_300[1].fitnesses.tolist())
+
+    def test_timings_survive_rebuild(self):
+        self.store("NSGAII", RUNS[0], 300)
+        catalog = results_catalog.ResultsCatalog(self.results_dir)
+        catalog.add_timing("ZDT1", "NSGAII", 300, 1.5)
+        catalog.add_timing("ZDT1", "NSGAII", None, 60.0)
+
+        catalog.rebuild()
+        self.assertEqual(
+            [(("ZDT1", "NSGAII", 300), 1.5), (("ZDT1", "NSGAII", None), 60.0)],
+            catalog.timings(),
+        )
+
+    def test_missing_catalog_is_built_on_first_use(self):
+        self.store("NSGAII", RUNS[0], 300)
+        (self.results_dir / results_catalog.CATALOG_NAME).unlink()
+
+        catalog = results_catalog.catalog_for(self.results_dir)
+        self.assertEqual([RUNS[0]], catalog.runs("ZDT1", "NSGAII"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from simulation import factory, results_catalog, run_parallel
+from simulation.model import SimulationCase
+
+
+class StubWorker:
+    """Notes in running_dir how many cases run at the same time."""
+
+    def __init__(self, simulation: SimulationCase, simulation_no: int):
+        self.simulation = simulation
+        self.simulation_no = simulation_no
+
+    def run(self):
+        running_dir = Path(self.simulation.params["running_dir"])
+        marker = running_dir / str(self.simulation.run_id)
+        marker.touch()
+        running = len(os.listdir(running_dir))
+        time.sleep(0.2)
+        marker.unlink()
+
+        if self.simulation.problem_name == "raising":
+            raise ValueError("stub failure")
+        results = (self.simulation.problem_name, self.simulation.run_id, running)
+        if self.simulation.problem_name == "unpicklable":
+            results = lambda: None
+        return results, 0.1, self.simulation_no
+
+
+class TestRunParallel(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory(prefix="evogil_run_parallel_")
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(results_catalog._catalogs.clear)
+        self.results_dir = Path(temp_dir.name, "results")
+        self.running_dir = Path(temp_dir.name, "running")
+        self.running_dir.mkdir()
+
+    def run_cases(self, problems, jobs):
+        simulation_cases = [
+            SimulationCase(
+                problem,
+                "stub",
+                run_id,
+                None,
+                str(self.results_dir),
+                running_dir=str(self.running_dir),
+            )
+            for run_id, problem in enumerate(problems)
+        ]
+        args = {"--dir": str(self.results_dir), "-j": str(jobs), "-N": "1"}
+        configuration = (StubWorker, simulation_cases)
+        with mock.patch.object(
+            factory, "resolve_configuration", return_value=configuration
+        ), mock.patch.object(run_parallel, "ActorSystem"), mock.patch.object(
+            run_parallel, "log_summary", wraps=run_parallel.log_summary
+        ) as log_summary:
+            run_parallel.run_parallel(args)
+        _, results, shuffled_cases, _ = log_summary.call_args[0]
+        return results, shuffled_cases
+
+    def test_results_match_cases(self):
+        results, simulation_cases = self.run_cases(["ZDT1"] * 6, jobs=2)
+
+        self.assertEqual(6, len(results))
+        for result, simulation in zip(results, simulation_cases):
+            stored, _, _ = result
+            self.assertEqual((simulation.problem_name, simulation.run_id), stored[:2])
+
+    def test_failed_cases_are_none(self):
+        problems = ["ZDT1", "raising", "ZDT2", "unpicklable", "ZDT3"]
+        with self.assertLogs(run_parallel.logger, "ERROR"):
+            results, simulation_cases = self.run_cases(problems, jobs=2)
+
+        for result, simulation in zip(results, simulation_cases):
+            if simulation.problem_name in ("raising", "unpicklable"):
+                self.assertIsNone(result)
+            else:
+                self.assertEqual(simulation.run_id, result[0][1])
+
+    def test_at_most_jobs_cases_at_once(self):
+        results, _ = self.run_cases(["ZDT1"] * 6, jobs=2)
+
+        running = [stored[2] for stored, _, _ in results]
+        self.assertLessEqual(max(running), 2)
+        self.assertFalse(os.listdir(self.running_dir))
@@ -0,0 +1,79 @@
+import unittest
+
+from simulation import factory
+from simulation.model import SimulationCase
+from simulation.scheduler import Scheduler, cost_key
+
+
+def case(problem, algo, budgets):
+    return SimulationCase(
+        problem, algo, 0, None, "results", **{factory.BUDGETS_PARAM: budgets}
+    )
+
+
+class TestScheduler(unittest.TestCase):
+    def test_longest_expected_first(self):
+        cases = [
+            case("ZDT1", "NSGAII", [500, 1000]),
+            case("UF9", "SMSEMOA", [1000]),
+            case("ZDT1", "HGS+NSGAII", [1000]),
+        ]
+        history = [
+            (("ZDT1", "NSGAII", 1000), 1.0),
+            (("UF9", "SMSEMOA", 1000), 50.0),
+            (("UF9", "SMSEMOA", 1000), 70.0),
+            (("ZDT1", "HGS+NSGAII", 1000), 5.0),
+        ]
+        scheduler = Scheduler(cases, history)
+        self.assertEqual(60.0, scheduler.estimate(1))
+        self.assertEqual([1, 2, 0], [scheduler.next_case() for _ in cases])
+
+    def test_unknown_cases_go_first(self):
+        cases = [case("ZDT1", "NSGAII", [1000]), case("UF9", "SMSEMOA", [1000])]
+        scheduler = Scheduler(cases, [(("ZDT1", "NSGAII", 1000), 1.0)])
+        self.assertIsNone(scheduler.estimate(1))
+        self.assertEqual(1, scheduler.next_case())
+
+    def test_estimates_scale_with_budget(self):
+        cases = [case("ZDT1", "NSGAII", [3000]), case("UF9", "NSGAII", [500])]
+        history = [
+            (("ZDT1", "NSGAII", 1000), 2.0),
+            (("ZDT1", "NSGAII", 10000), 40.0),
+            (("ZDT2", "NSGAII", 1000), 4.0),
+        ]
+        scheduler = Scheduler(cases, history)
+        # nearest budget of the same problem
+        self.assertEqual(6.0, scheduler.estimate(0))
+        # the same algorithm on other problems, per unit of budget
+        self.assertAlmostEqual(500 * (0.002 + 0.004 + 0.004) / 3, scheduler.estimate(1))
+
+    def test_finished_cases_refine_estimates(self):
+        cases = [
+            case("ZDT1", "NSGAII", [1000]),
+            case("ZDT1", "NSGAII", [1000]),
+            case("ZDT1", "SPEA2", [1000]),
+            case("ZDT1", "SPEA2", [1000]),
+        ]
+        scheduler = Scheduler(cases, [(("ZDT1", "NSGAII", 1000), 1.0)])
+        self.assertEqual(2, scheduler.next_case())
+        scheduler.finished(2, 9.0)
+        self.assertEqual(9.0, scheduler.estimate(3))
+        self.assertEqual(3, scheduler.next_case())
+        self.assertAlmostEqual(9.0 / (9.0 + 9.0 + 1.0 + 1.0), scheduler.progress())
+
+    def test_progress_without_estimates(self):
+        cases = [case("ZDT1", "NSGAII", [1000]), case("ZDT1", "SPEA2", [1000])]
+        scheduler = Scheduler(cases)
+        scheduler.finished(scheduler.next_case())
+        self.assertEqual(0.5, scheduler.progress())
+
+    def test_cost_key(self):
+        self.assertEqual(
+            ("ZDT1", "NSGAII", 1000), cost_key(case("ZDT1", "NSGAII", [500, 1000]))
+        )
+        time_case = SimulationCase("ZDT1", "NSGAII", 0, None, "results", timeout=60)
+        self.assertEqual(("ZDT1", "NSGAII", None), cost_key(time_case))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+
+import numpy
+
+from simulation import results_catalog, serializer
+from simulation.model import SimulationCase
+from simulation.serialization import BudgetResultsExtractor
+
+
+class TestSerializer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.case = SimulationCase(
+            "ZDT1",
+            "NSGAII",
+            1,
+            None,
+            self.tmp.name,
+            "2020-01-01.000000.000000__0000001",
+        )
+        self.serializer = serializer.Serializer(self.case)
+
+    def tearDown(self):
+        results_catalog._catalogs.clear()
+        self.tmp.cleanup()
+
+    def test_result_is_memory_mapped(self):
+        population = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+        fitnesses = [[1.0, 2.0], [3.0, 4.0]]
+        path = self.serializer.store(
+            serializer.Result(population, fitnesses, cost=numpy.int64(42)), "500"
+        )
+        self.assertEqual(".npres", path.suffix)
+
+        result = self.serializer.load(500)
+        self.assertIsInstance(result.fitnesses, numpy.memmap)
+        self.assertEqual(population, result.population.tolist())
+        self.assertEqual(fitnesses, result.fitnesses.tolist())
+        self.assertEqual({"cost": 42}, result.additional_data)
+        self.assertEqual(0, result.offset % serializer.ARRAY_ALIGNMENT)
+
+    def test_empty_result(self):
+        self.serializer.store(serializer.Result([], [], cost=0), "500")
+        result = self.serializer.load(500)
+        self.assertEqual([], result.population.tolist())
+        self.assertEqual([], result.fitnesses.tolist())
+
+    def test_legacy_pickles_stay_readable(self):
+        self.serializer.path.mkdir(parents=True)
+        serializer.save_file(
+            self.serializer.path / "300.pickle",
+            serializer.Result([[0.5, 0.5]], [[1.0, 1.0]], cost=300),
+        )
+        serializer.save_result_file(
+            self.serializer.path / "600.npres",
+            serializer.Result([[0.1, 0.1]], [[0.5, 0.5]], cost=600),
+        )
+        results_catalog.ResultsCatalog(self.tmp.name).rebuild()
+
+        results = BudgetResultsExtractor().load_number_measured_results(self.case, 0)
+        self.assertEqual(["300", "600"], [r.name for r in results])
+        self.assertEqual([[1.0, 1.0]], results[0].fitnesses)
+        self.assertEqual([[0.5, 0.5]], results[1].fitnesses.tolist())
+        self.assertEqual([300, 600], [r.additional_data["cost"] for r in results])
+
+    def test_binary_result_shadows_legacy_pickle(self):
+        self.serializer.path.mkdir(parents=True)
+        serializer.save_file(
+            self.serializer.path / "300.pickle",
+            serializer.Result([[0.5, 0.5]], [[1.0, 1.0]], cost=300),
+        )
+        self.serializer.store(
+            serializer.Result([[0.1, 0.1]], [[0.5, 0.5]], cost=300), "300"
+        )
+
+        results = BudgetResultsExtractor().load_number_measured_results(self.case, 0)
+        self.assertEqual(1, len(results))
+        self.assertEqual(".npres", results[0].path.suffix)
+
+
+if __name__ == "__main__":
+    unittest.main()